@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# flake8: noqa
+#
+# Compares clean_pronunciation against the earlier chain of string
+# replacements (kept here as a reference), both per word token, as in
+# convert_to_nemo_g2p, and over the distinct pronunciations, as in
+# clean_pron_set; the outputs are checked to be identical first.
+
+import argparse
+import time
+
+from waxholm.utils import SILS, fix_duration_markers, PronunciationCleaner
+from synthetic import generate_pronunciations
+
+
+def legacy_replace_glottal_closures(input):
+    input = f" {input} "
+    LOCAL_SILS = {f" {x} {SILS[x]} ": f" {x} " for x in SILS}
+    for retro in ["D", "T"]:
+        LOCAL_SILS[f" 2{retro} {retro.lower()} "] = f" 2{retro} "
+        LOCAL_SILS[f" {retro} 2{retro.lower()} "] = f" 2{retro} "
+    for sil in LOCAL_SILS:
+        if sil in input:
+            input = input.replace(sil, LOCAL_SILS[sil])
+            input = f" {input.strip()} "
+    return input.strip()
+
+
+def legacy_strip_accents(text):
+    for accent in "ˈ`ˌ":
+        text = text.replace(accent, "")
+    return text
+
+
+def legacy_clean_silences_mfa(pron, non_phones=False):
+    if pron == "p:":
+        return "SIL"
+    split = pron.split(" ")
+    start = 0
+    end = len(split) - 1
+    if split[start] == "p:":
+        start += 1
+    if split[end] == "p:":
+        end -= 1
+    split = ["SIL" if x == "p:" else x for x in split]
+    NON_PHONES = ["v", "kl", "SIL", "pa", "sm", "Kl", "Pa"]
+    if non_phones:
+        split = [x for x in split if x not in NON_PHONES]
+    return " ".join(split[start:end+1])
+
+
+def legacy_clean_pronunciation(text, non_phones=False, clean_accents=True, clean_silences=True):
+    text = fix_duration_markers(text)
+    if clean_accents:
+        text = legacy_strip_accents(text)
+    if clean_silences:
+        text = legacy_clean_silences_mfa(text, non_phones)
+    text = legacy_replace_glottal_closures(text)
+    return text
+
+
+def timed(func, prons):
+    start = time.perf_counter()
+    for pron in prons:
+        func(pron)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pronunciation cleaning.')
+    parser.add_argument('--vocabulary', type=int, default=20000, help='number of distinct pronunciations')
+    parser.add_argument('--tokens', type=int, default=1000000, help='number of word tokens')
+    parser.add_argument('--non-phones', action='store_true', help='also remove non-phones')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the synthetic lexicon')
+    args = parser.parse_args()
+
+    tokens = generate_pronunciations(args.vocabulary, args.tokens, args.seed)
+    distinct = sorted(set(tokens))
+
+    def legacy(pron):
+        return legacy_clean_pronunciation(pron, args.non_phones)
+
+    for pron in distinct:
+        assert legacy(pron) == PronunciationCleaner(args.non_phones)._clean(pron), pron
+
+    print(f"tokens: {len(tokens)}, distinct: {len(distinct)}")
+    for name, prons in [("per token", tokens), ("distinct", distinct)]:
+        before = timed(legacy, prons)
+        after = timed(PronunciationCleaner(args.non_phones), prons)
+        print(f"{name:>9}: before {len(prons) / before:,.0f}/s, "
+              f"after {len(prons) / after:,.0f}/s, speedup {before / after:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
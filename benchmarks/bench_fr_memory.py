@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# flake8: noqa
+#
+# Compares the memory held by parsed FR records: the slotted FR class
+# against the earlier __dict__-based class (LegacyFR, from bench_fr_parse).
+
+import argparse
+import gc
+import tracemalloc
+
+from waxholm import FR
+from bench_fr_parse import LegacyFR
+from synthetic import generate_fr_lines
+
+
+def measure(cls, lines):
+    gc.collect()
+    tracemalloc.start()
+    records = [cls(line) for line in lines]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memory use of parsed FR records.')
+    parser.add_argument('--lines', type=int, default=500000, help='number of synthetic FR lines')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the synthetic corpus')
+    args = parser.parse_args()
+
+    lines = list(generate_fr_lines(args.lines, args.seed))
+    before = measure(LegacyFR, lines)
+    after = measure(FR, lines)
+    print(f"records: {len(lines)}")
+    print(f"before:  {before / len(lines):.0f} bytes/record")
+    print(f"after:   {after / len(lines):.0f} bytes/record")
+    print(f"ratio:   {before / after:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
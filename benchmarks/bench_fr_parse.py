@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# flake8: noqa
+#
+# Compares FR line parsing throughput (lines per second) of the
+# table-driven parser in waxholm.mix against the earlier startswith-chain
+# parser, which is kept here as a reference.
+
+import argparse
+import re
+import time
+
+from waxholm import FR
+from synthetic import generate_fr_lines
+
+
+def legacy_fix_text(text):
+    replacements = text.maketrans("{}|\\[]", "äåöÖÄÅ")
+    return text.translate(replacements)
+
+
+def legacy_kludge_broken(text):
+    if text.strip() == "FR      21506\t #ha\t>pm #ha\t>w skratt\t 1.344 sec":
+        return "FR      21506\t #ha\t>pm #ha\t>w XskrattX\t 1.344 sec"
+    elif text.strip() == "FR      16602\t #.\t>pm #.\t>w. 1.038\t 1.038 sec":
+        return "FR      16602\t #.\t>pm #.\t>w .\t 1.038 sec"
+    else:
+        return text
+
+
+class LegacyFR:
+    def __init__(self, text):
+        text = legacy_kludge_broken(text)
+        parts = [a.strip() for a in text.split("\t")]
+        if not parts[0].startswith("FR"):
+            print("Error with FR", text)
+        self.frame = parts[0][2:].strip()
+        if parts[-1].strip().endswith(" sec"):
+            self.seconds = parts[-1].strip()[0:-4]
+        def split_phone(phone):
+            if phone.startswith("$#"):
+                phtype = 'I'
+                phone_type = legacy_fix_text(phone[0:2])
+                phone_out = legacy_fix_text(phone[2:])
+            elif phone.startswith("$") or phone.startswith("#"):
+                phtype = 'I'
+                phone_type = legacy_fix_text(phone[0:1])
+                phone_out = legacy_fix_text(phone[1:])
+            else:
+                return None
+            return {
+                "type": phtype,
+                "phone_type": phone_type,
+                "phone": phone_out
+            }
+        for subpart in parts[1:-1]:
+            subpart = subpart.strip()
+            if subpart.startswith("$#") or subpart.startswith("$") or subpart.startswith("#"):
+                phparts = split_phone(subpart)
+                if phparts is not None:
+                    self.type = phparts['type']
+                    self.phone_type = phparts['phone_type']
+                    self.phone = phparts['phone']
+            elif subpart.startswith(">pm "):
+                phparts = split_phone(subpart[4:])
+                if phparts is not None:
+                    self.pm_type = phparts['phone_type']
+                    self.pm = phparts['phone']
+            elif subpart.startswith(">pm. "):
+                phparts = split_phone(subpart[5:])
+                if phparts is not None:
+                    self.pm_type = phparts['phone_type']
+                    self.pm = phparts['phone']
+            elif subpart.startswith(">w "):
+                self.type = 'B'
+                self.word = legacy_fix_text(subpart[3:])
+                self.pseudoword = False
+            elif subpart.startswith(">w. "):
+                self.type = 'B'
+                self.word = legacy_fix_text(subpart[4:])
+                self.pseudoword = False
+            elif subpart == "> XklickX" or subpart == "> XutandX":
+                self.type = 'B'
+                self.word = subpart[2:]
+                self.pseudoword = True
+            elif subpart.startswith("X"):
+                self.type = getattr(self, 'type', 'B')
+                self.word = legacy_fix_text(subpart)
+                self.pseudoword = True
+            elif subpart == "OK":
+                self.type = 'E'
+            elif subpart == "PROBLEMS":
+                self.type = 'E'
+
+
+FIELDS = ["pm", "pm_type", "type", "frame", "seconds", "phone", "phone_type", "word", "pseudoword"]
+
+
+def fields(fr):
+    return tuple(getattr(fr, f, None) for f in FIELDS)
+
+
+def throughput(cls, lines):
+    start = time.perf_counter()
+    for line in lines:
+        cls(line)
+    elapsed = time.perf_counter() - start
+    return len(lines) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark FR line parsing.')
+    parser.add_argument('--lines', type=int, default=2000000, help='number of synthetic FR lines')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the synthetic corpus')
+    args = parser.parse_args()
+
+    lines = list(generate_fr_lines(args.lines, args.seed))
+    for line in lines[:10000]:
+        assert fields(LegacyFR(line)) == fields(FR(line)), line
+
+    before = throughput(LegacyFR, lines)
+    after = throughput(FR, lines)
+    print(f"lines:  {len(lines)}")
+    print(f"before: {before:,.0f} lines/s")
+    print(f"after:  {after:,.0f} lines/s")
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
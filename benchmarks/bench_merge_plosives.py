@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# flake8: noqa
+#
+# Compares plosive merging over phone-ID arrays (phones.merge_indices,
+# through Mix.get_merged_plosive_arrays and DurationTable) against the
+# pair-by-pair walk of Mix.get_merged_plosives, checking that the
+# results are identical. Runs over the .mix files under --corpus (e.g.,
+# the whole Waxholm data), or a synthetic corpus.
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from waxholm import Mix
+from waxholm.durations import DurationTable
+from waxholm.phones import get_inventory
+from waxholm.vocab import Vocabulary
+from synthetic import generate_mix
+
+
+def labels_from_arrays(mix):
+    times, ids = mix.get_merged_plosive_arrays()
+    labels = get_inventory().decode(ids.tolist())
+    return [(start, end, label) for (start, end), label in zip(times.tolist(), labels)]
+
+
+def legacy_duration_arrays(mixes):
+    # DurationTable(merge_plosives=True), one utterance at a time
+    phones = Vocabulary()
+    chunks = []
+    for mix in mixes:
+        labels = mix.get_merged_plosives(prune_empty=False, as_frames=True)
+        pairs = np.array([(x[0], x[1]) for x in labels], dtype=np.int64).reshape(-1, 2)
+        chunks.append((pairs[:, 0], pairs[:, 1], phones.encode([x[2] for x in labels], add=True)))
+    return tuple(np.concatenate(column) for column in zip(*chunks)), phones
+
+
+def duration_arrays(mixes):
+    table = DurationTable.from_mixes(mixes, merge_plosives=True)
+    return (table.starts, table.ends, table.phone_ids), table.phones
+
+
+def reset(mixes):
+    # drop the cached frame and phone arrays, so that each timing builds them
+    for mix in mixes:
+        mix.fr = mix.fr
+
+
+def timed(func, mixes, repeat):
+    best = None
+    for _ in range(repeat):
+        reset(mixes)
+        start = time.perf_counter()
+        func(mixes)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def each(method):
+    return lambda mixes: [method(mix) for mix in mixes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark plosive merging.')
+    parser.add_argument('--corpus', type=str, help='directory of .mix files (default: a synthetic corpus)')
+    parser.add_argument('--utterances', type=int, default=5000, help='number of synthetic utterances')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timings to take the best of')
+    args = parser.parse_args()
+
+    if args.corpus:
+        mixes = [Mix(filepath=path) for path in sorted(Path(args.corpus).glob("**/*.mix"))]
+    else:
+        mixes = [Mix(filepath="", stringfile=generate_mix(f"fp2000.1.{i:02d}.smp", "fp2000", seed=i, words=8)[0])
+                 for i in range(args.utterances)]
+
+    for mix in mixes:
+        assert [tuple(x) for x in mix.get_merged_plosives()] == labels_from_arrays(mix), mix.path
+    (before, before_phones), (after, after_phones) = legacy_duration_arrays(mixes), duration_arrays(mixes)
+    assert all(np.array_equal(x, y) for x, y in zip(before, after))
+    assert before_phones.symbols == after_phones.symbols
+
+    print(f"utterances: {len(mixes)}")
+    for name, before, after in [
+        ("per utterance", each(Mix.get_merged_plosives), each(Mix.get_merged_plosive_arrays)),
+        ("whole corpus", legacy_duration_arrays, duration_arrays),
+    ]:
+        old = timed(before, mixes, args.repeat)
+        new = timed(after, mixes, args.repeat)
+        print(f"{name}: before {old * 1000:.1f} ms, after {new * 1000:.1f} ms, speedup {old / new:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
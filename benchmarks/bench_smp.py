@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# flake8: noqa
+#
+# Compares reading .smp audio through soundfile (smp_read_sf) with the
+# memory-mapped SMPFile reader, for whole files and for short segments.
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from waxholm.audio import SMPFile, smp_read_sf
+from synthetic import write_smp
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark .smp reading.')
+    parser.add_argument('--seconds', type=float, default=5.0, help='length of the synthetic file')
+    parser.add_argument('--repeat', type=int, default=200, help='number of reads to time')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        smpfile = str(Path(tmpdir) / "fp2060.1.05.smp")
+        frames = int(args.seconds * 16000)
+        write_smp(smpfile, frames)
+        assert np.array_equal(smp_read_sf(smpfile)[0], SMPFile(smpfile).read())
+
+        # a 100ms segment in the middle, as cut out by an FR pair
+        start = frames // 2
+        end = start + 1600
+
+        results = {
+            "whole file, soundfile": timed(lambda: smp_read_sf(smpfile), args.repeat),
+            "whole file, SMPFile": timed(lambda: SMPFile(smpfile).read(), args.repeat),
+            "segment, soundfile": timed(lambda: smp_read_sf(smpfile)[0][start:end], args.repeat),
+            "segment, SMPFile": timed(lambda: SMPFile(smpfile).read(start, end), args.repeat),
+        }
+        for name, seconds in results.items():
+            print(f"{name:24} {seconds * 1e6:10.1f} us")
+
+
+if __name__ == '__main__':
+    main()
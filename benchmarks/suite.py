@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# flake8: noqa
+#
+#
+# Benchmark suite for the parsing, label extraction and conversion hot
+# paths, over a deterministic synthetic corpus (see synthetic.py).
+#
+# Each run is saved as JSON under results/ (named after the current git
+# commit, by default), so that runs can be compared across commits:
+#
+#     python suite.py
+#     python suite.py --compare results/<older commit>.json
+#
+# The end-to-end benchmarks run each scripts/convert_to_*.py on the
+# synthetic corpus; scripts whose dependencies are missing are reported
+# as skipped.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import generate_fr_lines, generate_mix, generate_pronunciations, write_corpus, write_smp
+
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+SCRIPTS_DIR = REPO_DIR / "scripts"
+sys.path.insert(0, str(REPO_DIR))
+
+from waxholm import FR, Mix
+from waxholm.audio import SMPFile, smp_read_sf, smp_to_wav
+from waxholm.durations import DurationTable
+from waxholm.utils import PronunciationCleaner, clean_pronunciation
+
+
+BENCHMARKS = {}
+
+
+def benchmark(name, number=1):
+    """
+    Register a benchmark: a function that takes the setup data and
+    returns a callable to time (`number` calls per timing)
+    """
+    def register(func):
+        BENCHMARKS[name] = (func, number)
+        return func
+    return register
+
+
+class Data:
+    """Synthetic inputs, generated once per run"""
+    def __init__(self, workdir, scale=1.0):
+        self.workdir = Path(workdir)
+        self.fr_lines = list(generate_fr_lines(int(100000 * scale)))
+        self.mix_texts = [generate_mix(f"fp2000.1.{i:02d}.smp", "fp2000", seed=i, words=8)[0]
+                          for i in range(int(200 * scale))]
+        self.mixes = [Mix(filepath="", stringfile=text) for text in self.mix_texts]
+        self.prons = generate_pronunciations(5000, int(100000 * scale))
+        self.smp = self.workdir / "fp2000.1.01.smp"
+        write_smp(self.smp, 5 * 16000)
+        self.corpus = self.workdir / "corpus"
+        write_corpus(self.corpus, speakers=2, sessions=2, utterances=max(1, int(10 * scale)), audio=True)
+
+
+@benchmark("parse.fr_from_text")
+def bench_fr_from_text(data):
+    lines = data.fr_lines
+    return lambda: [FR(line) for line in lines]
+
+
+@benchmark("parse.mix_read_data")
+def bench_mix_read_data(data):
+    texts = data.mix_texts
+    return lambda: [Mix(filepath="", stringfile=text) for text in texts]
+
+
+@benchmark("parse.mix_header_only")
+def bench_mix_header_only(data):
+    texts = data.mix_texts
+    return lambda: [Mix(filepath="", stringfile=text, header_only=True) for text in texts]
+
+
+@benchmark("labels.word_label_tuples")
+def bench_word_label_tuples(data):
+    mixes = data.mixes
+    return lambda: [mix.get_word_label_tuples(verbose=False) for mix in mixes]
+
+
+@benchmark("labels.merged_plosives")
+def bench_merged_plosives(data):
+    mixes = data.mixes
+    return lambda: [mix.get_merged_plosives() for mix in mixes]
+
+
+@benchmark("labels.merged_plosive_arrays")
+def bench_merged_plosive_arrays(data):
+    mixes = data.mixes
+    return lambda: [mix.get_merged_plosive_arrays() for mix in mixes]
+
+
+@benchmark("durations.merged_table")
+def bench_merged_duration_table(data):
+    mixes = data.mixes
+    return lambda: len(DurationTable.from_mixes(mixes, merge_plosives=True))
+
+
+@benchmark("labels.dictionary_list")
+def bench_dictionary_list(data):
+    mixes = data.mixes
+    return lambda: [mix.get_dictionary_list() for mix in mixes]
+
+
+@benchmark("labels.compare_dictionary")
+def bench_compare_dictionary(data):
+    mixes = data.mixes
+    return lambda: [mix.get_compare_dictionary() for mix in mixes]
+
+
+@benchmark("utils.clean_pronunciation")
+def bench_clean_pronunciation(data):
+    prons = data.prons
+    return lambda: [clean_pronunciation(pron) for pron in prons]
+
+
+@benchmark("utils.clean_pronunciation_uncached")
+def bench_clean_pronunciation_uncached(data):
+    prons = sorted(set(data.prons))
+    cleaner = PronunciationCleaner()
+    return lambda: [cleaner._clean(pron) for pron in prons]
+
+
+@benchmark("audio.smp_read_sf", number=20)
+def bench_smp_read_sf(data):
+    smp = str(data.smp)
+    return lambda: smp_read_sf(smp)
+
+
+@benchmark("audio.smpfile_read", number=20)
+def bench_smpfile_read(data):
+    smp = str(data.smp)
+    return lambda: SMPFile(smp).read()
+
+
+@benchmark("audio.smp_to_wav", number=10)
+def bench_smp_to_wav(data):
+    smp = str(data.smp)
+    wav = str(data.workdir / "out.wav")
+    return lambda: smp_to_wav(smp, wav)
+
+
+# benchmark name: (script, arguments, with {data}, {files} and {out}
+# filled in, and whether {out} must not exist beforehand)
+SCRIPTS = {
+    "convert_to_fairseq": ("convert_to_fairseq", ["{data}", "{out}"], False),
+    "convert_to_fairseq_phonetic": ("convert_to_fairseq", ["{data}", "{out}", "--phonetic"], False),
+    "convert_to_fairseq_audio": ("convert_to_fairseq", ["{data}", "{out}", "--audio"], False),
+    "convert_to_mfa": ("convert_to_mfa", ["{data}", "--outpath", "{out}"], True),
+    "convert_to_mfa_g2p": ("convert_to_mfa_g2p", ["{data}", "{out}/lexicon.txt"], False),
+    "convert_to_nemo_g2p": ("convert_to_nemo_g2p", ["{data}", "{out}/lexicon.json"], False),
+    "convert_to_textgrid": ("convert_to_textgrid", ["{files}", "--outpath", "{out}"], True),
+}
+
+
+def script_benchmark(script, args, fresh_out):
+    script = SCRIPTS_DIR / f"{script}.py"
+
+    def setup(data):
+        def run():
+            with tempfile.TemporaryDirectory(dir=data.workdir) as tmpdir:
+                out = Path(tmpdir) / "out"
+                if not fresh_out:
+                    out.mkdir()
+                cmd = [sys.executable, str(script)]
+                for arg in args:
+                    if arg == "{files}":
+                        cmd += [str(x) for x in sorted(data.corpus.glob("**/*.mix"))]
+                    else:
+                        cmd.append(arg.format(data=data.corpus, out=out))
+                env = dict(os.environ, PYTHONPATH=str(REPO_DIR))
+                result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+                if result.returncode != 0:
+                    raise RuntimeError(result.stderr.strip().split("\n")[-1])
+        return run
+    return setup
+
+
+for _name, (_script, _args, _fresh) in SCRIPTS.items():
+    BENCHMARKS[f"scripts.{_name}"] = (script_benchmark(_script, _args, _fresh), 1)
+
+
+def run_benchmark(func, number, data, repeat):
+    target = func(data)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            target()
+        timings.append((time.perf_counter() - start) / number)
+    return {"min": min(timings), "median": statistics.median(timings), "repeat": repeat}
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, previous):
+    print(f"\n{'benchmark':40} {'before':>12} {'after':>12} {'ratio':>8}")
+    for name, result in current["results"].items():
+        old = previous["results"].get(name)
+        if old is None or "min" not in old or "min" not in result:
+            continue
+        ratio = result["min"] / old["min"]
+        flag = "  slower" if ratio > 1.1 else ""
+        print(f"{name:40} {old['min'] * 1e3:10.2f}ms {result['min'] * 1e3:10.2f}ms {ratio:7.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the waxholm benchmark suite.')
+    parser.add_argument('--filter', type=str, help='only run benchmarks whose names contain this')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timings per benchmark')
+    parser.add_argument('--scale', type=float, default=1.0, help='size of the synthetic inputs')
+    parser.add_argument('--output', type=str, help='file to save the results to (default: results/<commit>.json)')
+    parser.add_argument('--compare', type=str, help='earlier results file to compare against')
+    args = parser.parse_args()
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else BENCH_DIR / "results" / f"{commit}.json"
+    run = {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scale": args.scale,
+        "results": {}
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        data = Data(workdir, args.scale)
+        for name, (func, number) in BENCHMARKS.items():
+            if args.filter and args.filter not in name:
+                continue
+            try:
+                result = run_benchmark(func, number, data, args.repeat)
+                print(f"{name:40} {result['min'] * 1e3:10.2f}ms (median {result['median'] * 1e3:.2f}ms)")
+            except Exception as e:
+                result = {"skipped": str(e)}
+                print(f"{name:40} skipped: {e}")
+            run["results"][name] = result
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as outf:
+        json.dump(run, outf, indent=2)
+    print(f"\nSaved to {output}")
+    if args.compare:
+        with open(args.compare) as inpf:
+            compare(run, json.load(inpf))
+
+
+if __name__ == '__main__':
+    main()
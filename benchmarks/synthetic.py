@@ -0,0 +1,215 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Deterministic synthetic Waxholm data for the benchmarks."""
+import random
+
+
+# (phone field, pm field, word field) templates, in the shapes that
+# occur in the .mix files
+WORD_STARTS = [
+    ("#J", ">pm #J", ">w jag"),
+    ("#V", ">pm #V", ">w vill"),
+    ('#"]:', '>pm #"]:', ">w }ka"),
+    ("#SJ", ">pm #SJ", ">w 17"),
+    ("#']", ">pm #']", ">w och"),
+    ("#F", ">pm #F", ">w 45"),
+    ("#I", ">pm #I", ">w ikv{ll"),
+    ("#sm", ">pm #sm", ">w XsmackX"),
+    ("#.", ">pm #.", ">w ."),
+]
+
+INNER = [
+    ("$'A:", ">pm $'A:"),
+    ("$G", ">pm $G"),
+    ("$g", ">pm $g"),
+    ("$'I", ">pm $'I"),
+    ("$L", ">pm $L+"),
+    ("$K", ">pm $K"),
+    ("$k", ">pm $k"),
+    ("$A", ">pm $A"),
+    ('$"U', '>pm $"U'),
+    ("$T", ">pm $T"),
+    ("$t", ">pm $t"),
+    ("$]", ">pm $]"),
+    ("$N", ">pm $N"),
+    ("$\\4", ">pm $\\4"),
+    ("$2T", ">pm $2T"),
+    ("$2t", ">pm $2t"),
+    ("$'[", ">pm $'["),
+    ("$v", None),
+]
+
+
+def fr_line(frame: int, fields) -> str:
+    seconds = frame / 16000.0
+    cols = [f"FR {frame:>10}"] + [f" {x}" if x[0] in "$#" else x for x in fields if x is not None]
+    return "\t".join(cols) + f"\t {seconds:.3f} sec"
+
+
+def generate_fr_lines(count: int, seed: int = 0):
+    """Yield `count` FR lines, with a final 'OK' line every 30 or so"""
+    rng = random.Random(seed)
+    frame = 4000
+    produced = 0
+    since_start = 0
+    while produced < count:
+        if since_start == 0:
+            yield fr_line(frame, rng.choice(WORD_STARTS))
+        elif since_start > 28:
+            yield f"FR {frame:>10}\t OK\t {frame / 16000.0:.3f} sec"
+            since_start = -1
+            frame = 4000
+        elif rng.random() < 0.25:
+            yield fr_line(frame, rng.choice(WORD_STARTS))
+        else:
+            yield fr_line(frame, rng.choice(INNER))
+        produced += 1
+        since_start += 1
+        frame += rng.randint(0, 2000)
+
+
+MIX_HEADER = """\
+CORRECTED: OK jesper    Jesper Hogberg Thu Jun 22 16:32:23 EET 1995
+AUTOLABEL: jesper    Jesper H|gberg Tue May 31 20:22:51 EET 1994
+DATA BANK MATERIAL:  file:/u/wax/data/scenes/{speaker}/{name}.mix
+Digital recording in quiet room, No preemph, 16000 kHz, December 1992
+
+Waxholm dialog. /u/wax/data/scenes/{speaker}/{name}
+WIZARD:  jesper    Jesper H|gberg Fri Mar 25 12:22:42 MET 1994
+TEXT:
+{text}
+PHONEME:   {phoneme}
+
+
+CT 1
+Labels:  {labels}
+ .
+"""
+
+
+def generate_mix(name: str, speaker: str, seed: int = 0, words: int = 6):
+    """
+    The text of a .mix file in the layout of the SAMPLE1 test fixture,
+    with `words` words (and a final "."); returns the text and the
+    last frame
+    """
+    rng = random.Random(seed)
+    frame = 4000 + rng.randint(0, 1000)
+    fr_lines = []
+    text = []
+    phones = []
+    spoken = [w for w in WORD_STARTS if w[2] != ">w ."]
+    for _ in range(words):
+        start = rng.choice(spoken)
+        text.append(start[2][3:])
+        phones.append(start[0][1:])
+        fr_lines.append(fr_line(frame, start))
+        for _ in range(rng.randint(1, 5)):
+            inner = rng.choice(INNER)
+            phones.append(inner[0][1:])
+            # closures are sometimes annotated with no duration
+            frame += 0 if rng.random() < 0.05 else rng.randint(200, 2000)
+            fr_lines.append(fr_line(frame, inner))
+        frame += rng.randint(200, 2000)
+    fr_lines.append(fr_line(frame, WORD_STARTS[-1]))
+    frame += rng.randint(200, 2000)
+    fr_lines.append(f"FR {frame:>10}\t OK\t {frame / 16000.0:.3f} sec")
+    header = MIX_HEADER.format(speaker=speaker, name=name, text=" ".join(text) + " .",
+                               phoneme=" ".join(phones) + ".", labels="".join(phones))
+    return header + "\n".join(fr_lines) + "\n", frame
+
+
+def write_corpus(root, speakers: int = 4, sessions: int = 2, utterances: int = 10,
+                 audio: bool = False, seed: int = 0):
+    """
+    Write a synthetic corpus of `speakers` x `sessions` x `utterances`
+    .mix files (and, with `audio`, their .smp files) under `root`, in
+    per-speaker directories; returns the .mix paths
+    """
+    from pathlib import Path
+    root = Path(root)
+    paths = []
+    count = 0
+    for spk in range(speakers):
+        speaker = f"fp{2000 + spk}"
+        (root / speaker).mkdir(parents=True, exist_ok=True)
+        for session in range(1, sessions + 1):
+            for utt in range(1, utterances + 1):
+                name = f"{speaker}.{session}.{utt:02d}.smp"
+                text, last_frame = generate_mix(name, speaker, seed=seed * 100003 + count)
+                mixpath = root / speaker / f"{name}.mix"
+                mixpath.write_text(text)
+                if audio:
+                    write_smp(root / speaker / name, last_frame + 1600, seed=seed + count)
+                paths.append(mixpath)
+                count += 1
+    return paths
+
+
+def smp_header(msb: str = "last", nchans: int = 1) -> bytes:
+    """A 1024-byte .smp header, in the layout `waxholm.audio` expects"""
+    text = f"file=samp\r\nmsb={msb}\r\nnchans={nchans}\r\nsftot=16000\r\n=\r\n"
+    return text.encode("ascii").ljust(1024, b"\x00")
+
+
+def write_smp(path, frames: int, msb: str = "last", nchans: int = 1, seed: int = 0):
+    """Write a .smp file of `frames` frames of noise; returns the samples"""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    samples = rng.integers(-2000, 2000, size=frames * nchans, dtype=np.int16)
+    dtype = "<i2" if msb == "last" else ">i2"
+    with open(path, "wb") as outf:
+        outf.write(smp_header(msb, nchans))
+        outf.write(samples.astype(dtype).tobytes())
+    return samples
+
+
+# phones as they appear in the pronunciations collected from the .mix
+# files: accents, duration markers, closures and silences
+PRON_PHONES = ["'A:", "ˈA:", "A", "a", "E", "'E:", "I", "ˈI", "O:", "U", "\"U", "Y", "]",
+               "[", "{", "ö", "N", "L+", "R", "S", "SJ", "TJ", "V", "F", "J", "M", "H",
+               "2N", "2L", "A:+", "E:+", ":+", "v", "kl", "pa", "sm"]
+PRON_CLOSURES = [("K", "k"), ("G", "g"), ("T", "t"), ("D", "d"), ("P", "p"),
+                 ("B", "b"), ("2T", "2t"), ("2D", "2d"), ("2T", "t"), ("T", "2t")]
+
+
+def generate_pronunciation(rng) -> str:
+    phones = []
+    if rng.random() < 0.1:
+        phones.append("p:")
+    for _ in range(rng.randint(1, 9)):
+        if rng.random() < 0.2:
+            closure, burst = rng.choice(PRON_CLOSURES)
+            phones.append(closure)
+            if rng.random() < 0.9:
+                phones.append(burst)
+        elif rng.random() < 0.03:
+            phones.append("p:")
+        else:
+            phones.append(rng.choice(PRON_PHONES))
+    if rng.random() < 0.1:
+        phones.append("p:")
+    return " ".join(phones)
+
+
+def generate_pronunciations(vocabulary: int, occurrences: int, seed: int = 0):
+    """
+    Returns `occurrences` pronunciations, drawn with a Zipf-like
+    distribution from `vocabulary` distinct ones, as when each word
+    token of the corpus is looked at in turn
+    """
+    rng = random.Random(seed)
+    prons = [generate_pronunciation(rng) for _ in range(vocabulary)]
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    return rng.choices(prons, weights=weights, k=occurrences)
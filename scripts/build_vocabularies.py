@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# flake8: noqa
+
+#
+# Builds the phone and word vocabularies of the corpus, for use with
+# Mix.encode_phone_labels and Mix.encode_words.
+
+from waxholm import Corpus
+from waxholm.corpus import add_index_arguments
+from waxholm.cache import MixCache
+import argparse
+from pathlib import Path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build phone and word vocabularies from the Waxholm data.')
+    parser.add_argument('data_location', type=str, help='path to the Waxholm data')
+    parser.add_argument('outpath', type=str, help='directory in which to write phones.json and words.json')
+    parser.add_argument('--no-merge-plosives', help='keep closures and bursts as separate phones', action='store_true')
+    add_index_arguments(parser)
+    parser.add_argument('--cache', type=str, help='directory in which to cache parsed .mix files')
+    args = parser.parse_args()
+
+    outpath = Path(args.outpath)
+    if outpath.exists() and not outpath.is_dir():
+        print(f"File exists with output path name ({outpath}); cowardly refusing to continue")
+        exit()
+    for name in ["phones.json", "words.json"]:
+        if (outpath / name).exists():
+            print(f"File exists with output path name ({outpath / name}); cowardly refusing to continue")
+            exit()
+
+    data_location = Path(args.data_location)
+    if not data_location.exists():
+        print(f"Path to data ({data_location}) does not exist")
+        exit()
+    elif not data_location.is_dir():
+        print(f"Path to data ({data_location}) exists, but is not a directory")
+        exit()
+
+    outpath.mkdir(parents=True, exist_ok=True)
+    cache = MixCache(args.cache) if args.cache else None
+    corpus = Corpus(data_location, index_path=args.index, refresh=args.refresh_index, cache=cache)
+    phones, words = corpus.build_vocabularies(merge_plosives=not args.no_merge_plosives)
+    phones.save(outpath / "phones.json")
+    words.save(outpath / "words.json")
+    print(f"{len(phones)} phones, {len(words)} words")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,7 +14,9 @@
 # limitations under the License.
 # flake8: noqa
 
-from waxholm import Mix
+from waxholm import Corpus
+from waxholm.corpus import add_index_arguments
+from waxholm.cache import MixCache
 import argparse
 from pathlib import Path
 
@@ -38,6 +40,8 @@ def check_candidates(word, pron):
 def main():
     parser = argparse.ArgumentParser(description='Convert .mix to input to the Montreal Forced Aligner.')
     parser.add_argument('data_location', type=str, help='path to the Waxholm data')
+    add_index_arguments(parser)
+    parser.add_argument('--cache', type=str, help='directory in which to cache parsed .mix files')
     args = parser.parse_args()
 
     data_location = Path(args.data_location)
@@ -48,8 +52,10 @@ def main():
         print(f"Path to data ({data_location}) exists, but is not a directory")
         exit()
 
-    for mixfile in data_location.glob("**/*.mix"):
-        mix = Mix(filepath=mixfile)
+    cache = MixCache(args.cache) if args.cache else None
+    corpus = Corpus(data_location, index_path=args.index, refresh=args.refresh_index, cache=cache)
+    for entry, mix in corpus.mixes():
+        mixfile = corpus.get_path(entry)
 
         for word_pair in mix.get_dictionary_list():
             word = word_pair[0]
@@ -13,10 +13,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from waxholm import FR, Mix
+from waxholm import Corpus
+from waxholm.corpus import add_index_arguments
+from waxholm.cache import MixCache
+from waxholm.convert import add_arguments, map_corpus
 from waxholm.audio import smp_to_wav
+from waxholm.instrument import count, stage, start_run
 from waxholm.utils import clean_x_words
 import argparse
+from functools import partial
 from pathlib import Path
 import soundfile as sf
 
@@ -40,13 +45,45 @@ def clean_phones(phones):
     return [_clean_phone(x) for x in phones if x not in DISCARD_PHONES]
 
 
+def convert_mix(mix, outpath, phonetic=False, audio=False):
+    """
+    Converts one utterance; returns its manifest and transcript lines
+    """
+    file = Path(mix.path)
+    stem = file.stem.replace(".smp", "")
+    frames = 0
+
+    if audio:
+        smpfile = str(file).replace(".mix", "")
+        wavfile = str(outpath / f"{stem}.wav")
+        smp_to_wav(smpfile, wavfile)
+        frames = sf.info(wavfile).frames
+
+    mix.prune_empty_silences(verbose=False)
+    if phonetic:
+        labels = [x.label for x in mix.get_merged_plosives()]
+        labels = clean_phones(labels)
+        label_text = " ".join(labels)
+    else:
+        labels = [x[2] for x in mix.get_word_label_tuples() if x is not None]
+        labels = clean_x_words(labels)
+        label_text = " ".join(labels)
+        label_text = label_text.lower()
+
+    return f"{stem}.wav\t{frames}\n", f"{label_text}\n"
+
+
 def main():
     parser = argparse.ArgumentParser(description='Make fairseq input tsv from waxholm data.')
     parser.add_argument('inpath', type=str, help='path to input')
     parser.add_argument('outpath', type=str, help='path to place converted files')
     parser.add_argument('--phonetic', help='use phonetic transcriptions', action='store_true')
     parser.add_argument('--audio', help='also convert audio', action='store_true')
+    add_index_arguments(parser)
+    add_arguments(parser)
     args = parser.parse_args()
+    start_run("convert_to_fairseq", profile=args.profile, report=args.report, log_limit=args.log_limit,
+              log_level=args.log_level)
 
     inpath = Path(args.inpath)
     outpath = Path(args.outpath)
@@ -60,32 +97,17 @@ def main():
     manifest = str(outpath / "train.tsv")
     transcript = str(outpath / "train.ltr")
 
+    cache = MixCache(args.cache) if args.cache else None
+    corpus = Corpus(inpath, index_path=args.index, refresh=args.refresh_index, cache=cache)
+    worker = partial(convert_mix, outpath=outpath, phonetic=args.phonetic, audio=args.audio)
     with open(manifest, "w") as m_out, open(transcript, "w") as t_out:
         m_out.write(str(outpath.resolve()) + "\n")
-        for file in inpath.glob("**/*.mix"):
-            stem = file.stem.replace(".smp", "")
-            frames = 0
-
-            if args.audio:
-                smpfile = str(file).replace(".mix", "")
-                wavfile = str(outpath / f"{stem}.wav")
-                smp_to_wav(smpfile, wavfile)
-                frames, _ = sf.read(wavfile)
-
-            mix = Mix(file)
-            mix.prune_empty_silences(verbose=False)
-            if args.phonetic:
-                labels = mix.get_merged_plosives()
-                labels = clean_phones(labels)
-                label_text = " ".join(labels)
-            else:
-                labels = mix.get_word_label_tuples()
-                labels = clean_x_words(labels)
-                label_text = " ".join(labels)
-                label_text = label_text.lower()
-
-            m_out.write(f"{stem}.wav\t{len(frames)}\n")
-            t_out.write(f"{label_text}\n")
+        for manifest_line, transcript_line in map_corpus(worker, corpus, jobs=args.jobs, io_concurrency=args.io_concurrency):
+            with stage("write"):
+                m_out.write(manifest_line)
+                t_out.write(transcript_line)
+        count("bytes_written", m_out.tell() + t_out.tell())
+
 
 if __name__ == '__main__':
     main()
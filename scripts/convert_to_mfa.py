@@ -19,12 +19,18 @@
 # for a script to create a lexicon suitable for use with mfa's g2p trainer
 # use `convert_to_mfa_g2p.py`
 
-from waxholm import Mix
+from waxholm import Corpus
+from waxholm.cache import MixCache
+from waxholm.convert import add_arguments, map_mixes
+from waxholm.lexicon import LexiconBuilder
 import argparse
+from functools import partial
 from pathlib import Path
 
 from waxholm.audio import smp_to_wav
-from waxholm.utils import cond_lc, clean_pron_set
+from waxholm.instrument import count, stage, start_run
+from waxholm.corpus import add_index_arguments, split_stem
+from waxholm.utils import cond_lc
 
 
 JUNK = [
@@ -33,12 +39,53 @@ JUNK = [
 ]
 
 
+def output_files(mixfile, outpath):
+    mixfile = Path(mixfile)
+    stem = mixfile.stem
+    speaker, _, _ = split_stem(mixfile)
+    spk_path = outpath / f"{speaker}"
+    return f"{spk_path}/{stem}.txt", f"{spk_path}/{stem}.wav"
+
+
+def is_converted(mixfile, outpath, audio=False):
+    txtfile, wavfile = output_files(mixfile, outpath)
+    return Path(txtfile).exists() and (not audio or Path(wavfile).exists())
+
+
+def convert_mix(mix, outpath, audio=False):
+    """
+    Writes the text (and audio) for one utterance; returns its
+    dictionary entries for the lexicon
+    """
+    mixfile = Path(mix.path)
+    txtfile, wavfile = output_files(mixfile, outpath)
+    Path(txtfile).parent.mkdir(exist_ok=True)
+    with stage("write"), open(txtfile, "w") as textoutput:
+        text = mix.text.strip()
+        text = " ".join([cond_lc(x) for x in text.split(" ")])
+        if text.endswith("."):
+            text = text[:-1].strip()
+        textoutput.write(text + "\n")
+        count("bytes_written", textoutput.tell())
+
+    if audio:
+        smpfile = str(mixfile).replace(".mix", "")
+        smp_to_wav(smpfile, wavfile)
+
+    return mix.get_dictionary_list()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Convert a directory containing the Waxholm data for use with the Montreal Forced Aligner.')
     parser.add_argument('data_location', type=str, help='path to the directory containing the Waxholm data')
     parser.add_argument('--outpath', type=str, help='path to place converted files (directory will be created if it does not exist)')
     parser.add_argument('--audio', help='also convert audio', action='store_true')
+    add_index_arguments(parser)
+    parser.add_argument('--lexicon-state', type=str, help='file in which to keep the lexicon between runs, so that only changed files are reprocessed')
+    add_arguments(parser)
     args = parser.parse_args()
+    start_run("convert_to_mfa", profile=args.profile, report=args.report, log_limit=args.log_limit,
+              log_level=args.log_level)
 
     if args.outpath:
         outpath = Path(args.outpath)
@@ -58,46 +105,21 @@ def main():
         print(f"Path to data ({data_location}) exists, but is not a directory")
         exit()
 
-    lexicon = {}
-
-    for mixfile in data_location.glob("**/*.mix"):
-        stem = mixfile.stem
-        stem_parts = stem.split(".")
-        speaker = stem_parts[0]
-        mix = Mix(filepath=mixfile)
-
-        spk_path = outpath / f"{speaker}"
-
-        if not spk_path.is_dir():
-            spk_path.mkdir()
-        txtfile = f"{spk_path}/{stem}.txt"
-        with open(txtfile, "w") as textoutput:
-            text = mix.text.strip()
-            text = " ".join([cond_lc(x) for x in text.split(" ")])
-            if text.endswith("."):
-                text = text[:-1].strip()
-            textoutput.write(text + "\n")
-
-        if args.audio:
-            smpfile = str(mixfile).replace(".mix", "")
-            wavfile = f"{spk_path}/{stem}.wav"
-            smp_to_wav(smpfile, wavfile)
-
-        for word_pair in mix.get_dictionary_list():
-            word = cond_lc(word_pair[0])
-            pron = word_pair[1]
-
-            if not word in lexicon:
-                lexicon[word] = set()
-            lexicon[word].add(pron)
-
-        with open(str(outpath / "lexicon.dict"), "w") as lexf:
-            for word in lexicon:
-                prons = clean_pron_set(lexicon[word])
-                for pron in prons:
-                    cand = f"{word}\t{pron}\n"
-                    if not cand in JUNK:
-                        lexf.write(cand)
+    cache = MixCache(args.cache) if args.cache else None
+    corpus = Corpus(data_location, index_path=args.index, refresh=args.refresh_index, cache=cache)
+    lexicon = LexiconBuilder(args.lexicon_state)
+    paths = [corpus.get_path(entry) for entry in corpus]
+    lexicon.retain(paths)
+    with corpus.reading():
+        todo = [path for path in paths
+                if not (lexicon.is_current(path) and is_converted(path, outpath, args.audio))]
+        worker = partial(convert_mix, outpath=outpath, audio=args.audio)
+        results = map_mixes(worker, todo, jobs=args.jobs, cache=cache, io_concurrency=args.io_concurrency)
+        for path, word_pairs in zip(todo, results):
+            lexicon.update(path, [(cond_lc(word), pron) for word, pron in word_pairs])
+
+    lexicon.save()
+    lexicon.write(str(outpath / "lexicon.dict"), junk=JUNK)
 
 
 if __name__ == '__main__':
@@ -18,12 +18,17 @@
 # G2P trainer (i.e., skipping non-speech "phones").
 # Note that the result should still be sorted using the standard Unix sort tool.
 
-from waxholm import Mix
+from waxholm import Corpus, Mix
+from waxholm.corpus import add_index_arguments
+from waxholm.aio import iter_mixes
+from waxholm.cache import MixCache
+from waxholm.instrument import add_arguments, stage, start_run
+from waxholm.lexicon import LexiconBuilder
 import argparse
 from pathlib import Path
 import re
 
-from waxholm.utils import cond_lc, clean_pron_set, is_x_word
+from waxholm.utils import cond_lc, is_x_word
 
 
 JUNK = [
@@ -57,7 +62,14 @@ def main():
     parser.add_argument('data_location', type=str, help='path to the Waxholm data')
     parser.add_argument('lexicon', type=str, help='path to place the gathered lexicon')
     parser.add_argument('--include_numbers', help='include numbers in the output', action='store_true')
+    add_index_arguments(parser)
+    parser.add_argument('--cache', type=str, help='directory in which to cache parsed .mix files')
+    parser.add_argument('--io-concurrency', type=int, default=0, help='number of files to read at once, for slow (e.g., network) storage (default: 0, read one at a time)')
+    parser.add_argument('--lexicon-state', type=str, help='file in which to keep the lexicon between runs, so that only changed files are reprocessed')
+    add_arguments(parser)
     args = parser.parse_args()
+    start_run("convert_to_mfa_g2p", profile=args.profile, report=args.report, log_limit=args.log_limit,
+              log_level=args.log_level)
 
     if args.lexicon:
         outpath = Path(args.lexicon)
@@ -74,31 +86,32 @@ def main():
         print(f"Path to data ({data_location}) exists, but is not a directory")
         exit()
 
-    lexicon = {}
-
-    for mixfile in data_location.glob("**/*.mix"):
-        mix = Mix(filepath=mixfile)
-
-        for word_pair in mix.get_dictionary_list():
-            if is_x_word(word_pair[0]):
-                continue
-            elif not args.include_numbers and re.match(".*[0-9].*", word_pair[0]):
-                continue
-            word = cond_lc(word_pair[0])
-            pron = final_pass(word_pair[1])
-
-            if not word in lexicon:
-                lexicon[word] = set()
-            lexicon[word].add(pron)
-
-    lexicon = dict(sorted(lexicon.items()))
-    with open(str(outpath), "w") as lexf:
-        for word in lexicon:
-            prons = clean_pron_set(lexicon[word], True)
-            for pron in prons:
-                cand = f"{word}\t{pron}\n"
-                if not cand in JUNK and not cand.endswith("\t\n"):
-                    lexf.write(cand)
+    cache = MixCache(args.cache) if args.cache else None
+    corpus = Corpus(data_location, index_path=args.index, refresh=args.refresh_index, cache=cache)
+    lexicon = LexiconBuilder(args.lexicon_state, options={"include_numbers": args.include_numbers})
+    paths = [corpus.get_path(entry) for entry in corpus]
+    lexicon.retain(paths)
+    with corpus.reading():
+        todo = [path for path in paths if not lexicon.is_current(path)]
+        if args.io_concurrency:
+            mixes = iter_mixes(todo, concurrency=args.io_concurrency, cache=cache)
+        else:
+            mixes = (cache.load(path) if cache else Mix(filepath=path) for path in todo)
+        for path, mix in zip(todo, mixes):
+            entries = []
+            with stage("process"):
+                for word_pair in mix.get_dictionary_list():
+                    if is_x_word(word_pair[0]):
+                        continue
+                    elif not args.include_numbers and re.match(".*[0-9].*", word_pair[0]):
+                        continue
+                    word = cond_lc(word_pair[0])
+                    pron = final_pass(word_pair[1])
+                    entries.append((word, pron))
+            lexicon.update(path, entries)
+
+    lexicon.save()
+    lexicon.write(str(outpath), non_phones=True, junk=JUNK, skip_empty=True)
 
 
 if __name__ == '__main__':
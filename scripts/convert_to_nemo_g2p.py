@@ -19,12 +19,16 @@
 # FIXME: pronunciations coming out in wrong order
 # FIXME: join IPA characters
 
-from waxholm import Mix
+from waxholm import Corpus
+from waxholm.corpus import add_index_arguments
+from waxholm.cache import MixCache
 import argparse
 from pathlib import Path
 import json
 
-from waxholm.utils import is_x_word, clean_pronunciation, map_to_ipa
+from waxholm.utils import is_x_word, clean_pronunciation
+from waxholm.phones import get_mapper
+from waxholm.instrument import add_arguments, count, stage, start_run
 
 
 def final_pass(pron):
@@ -44,7 +48,13 @@ def main():
     parser.add_argument('data_location', type=str, help='path to the Waxholm data')
     parser.add_argument('lexicon', type=str, help='path to place the gathered lexicon')
     parser.add_argument('--accented', help='include accent markers in the output', action='store_true')
+    add_index_arguments(parser)
+    parser.add_argument('--cache', type=str, help='directory in which to cache parsed .mix files')
+    parser.add_argument('--io-concurrency', type=int, default=0, help='number of files to read at once, for slow (e.g., network) storage (default: 0, read one at a time)')
+    add_arguments(parser)
     args = parser.parse_args()
+    start_run("convert_to_nemo_g2p", profile=args.profile, report=args.report, log_limit=args.log_limit,
+              log_level=args.log_level)
 
     if args.lexicon:
         outpath = Path(args.lexicon)
@@ -66,30 +76,33 @@ def main():
         exit()
 
     pairs = []
+    mapper = get_mapper()
 
-    for mixfile in data_location.glob("**/*.mix"):
-        mix = Mix(filepath=mixfile)
-
+    cache = MixCache(args.cache) if args.cache else None
+    corpus = Corpus(data_location, index_path=args.index, refresh=args.refresh_index, cache=cache)
+    for _, mix in corpus.mixes(io_concurrency=args.io_concurrency):
         words = []
         prons = []
-        for word_pair in mix.get_dictionary_list():
-            if is_x_word(word_pair[0]):
-                continue
-            pron = clean_pronunciation(word_pair[1], clean_accents=clean_accents)
-            pron = final_pass(pron)
-            pron = "".join(map_to_ipa(pron.split(" ")))
-            words.append(word_pair[0])
-            prons.append(pron)
-        graphemes = " ".join(words).replace(" .", ".").replace(" ,", ",")
-        text = " ".join(prons).replace(" .", ".").replace(" ,", ",")
-        # FIXME: check what to do here
-        text = text.replace("`", "ˈ")
-        pairs.append({"text_graphemes": graphemes, "text": text})
-
-    with open(str(outpath), "w", encoding='utf8') as lexf:
+        with stage("process"):
+            for word_pair in mix.get_dictionary_list():
+                if is_x_word(word_pair[0]):
+                    continue
+                pron = clean_pronunciation(word_pair[1], clean_accents=clean_accents)
+                pron = final_pass(pron)
+                pron = "".join(mapper.map_pronunciation(pron))
+                words.append(word_pair[0])
+                prons.append(pron)
+            graphemes = " ".join(words).replace(" .", ".").replace(" ,", ",")
+            text = " ".join(prons).replace(" .", ".").replace(" ,", ",")
+            # FIXME: check what to do here
+            text = text.replace("`", "ˈ")
+            pairs.append({"text_graphemes": graphemes, "text": text})
+
+    with stage("write"), open(str(outpath), "w", encoding='utf8') as lexf:
         for pair in pairs:
             jsonout = json.dumps(pair)
             lexf.write(jsonout + "\n")
+        count("bytes_written", lexf.tell())
 
 
 if __name__ == '__main__':
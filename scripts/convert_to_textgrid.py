@@ -14,13 +14,49 @@
 # limitations under the License.
 # flake8: noqa
 
-from waxholm import FR, Mix
+from waxholm.cache import MixCache
+from waxholm.convert import add_arguments, map_mixes
 from praatio import textgrid
 from praatio.utilities.constants import Interval
 import argparse
+from functools import partial
 from pathlib import Path
 
 from waxholm.audio import smp_to_wav
+from waxholm.instrument import count, stage, start_run
+
+
+def convert_mix(mix, outpath=None, audio=False):
+    file = str(mix.path)
+    path = Path(file)
+    stem = path.stem
+    if stem.endswith(".mix"):
+        stem = stem[:-4]
+    if stem.endswith(".smp"):
+        stem = stem[:-4]
+    if outpath:
+        parent = outpath
+    else:
+        parent = path.parents[0]
+    outfile = f"{parent}/{stem}.textgrid"
+
+    if audio:
+        smpfile = file.replace(".mix", "")
+        wavfile = f"{parent}/{stem}.wav"
+        smp_to_wav(smpfile, wavfile)
+
+    mix.prune_empty_silences(verbose=True)
+    tg = textgrid.Textgrid()
+
+    word_tier = textgrid.IntervalTier("words", mix.get_word_label_tuples())
+    phone_tier = textgrid.IntervalTier("phones", mix.get_merged_plosives())
+
+    tg.addTier(word_tier, reportingMode="error")
+    tg.addTier(phone_tier, reportingMode="error")
+
+    with stage("write"):
+        tg.save(str(outfile), format="long_textgrid", includeBlankSpaces=True, reportingMode="warning")
+    count("bytes_written", Path(outfile).stat().st_size)
 
 
 def main():
@@ -28,7 +64,10 @@ def main():
     parser.add_argument('files', type=str, nargs='+', help='files to process')
     parser.add_argument('--outpath', type=str, help='path to place converted files')
     parser.add_argument('--audio', help='also convert audio', action='store_true')
+    add_arguments(parser)
     args = parser.parse_args()
+    start_run("convert_to_textgrid", profile=args.profile, report=args.report, log_limit=args.log_limit,
+              log_level=args.log_level)
 
     if args.outpath:
         outpath = Path(args.outpath)
@@ -40,35 +79,11 @@ def main():
         if not outpath.exists() and not outpath.is_dir():
             outpath.mkdir()
 
-    for file in args.files:
-        path = Path(file)
-        stem = path.stem
-        if stem.endswith(".mix"):
-            stem = stem[:-4]
-        if stem.endswith(".smp"):
-            stem = stem[:-4]
-        if args.outpath:
-            parent = args.outpath
-        else:
-            parent = path.parents[0]
-        outfile = f"{parent}/{stem}.textgrid"
-
-        if args.audio:
-            smpfile = file.replace(".mix", "")
-            wavfile = f"{parent}/{stem}.wav"
-            smp_to_wav(smpfile, wavfile)
-
-        mix = Mix(file)
-        mix.prune_empty_silences(verbose=True)
-        tg = textgrid.Textgrid()
-
-        word_tier = textgrid.IntervalTier("words", mix.get_word_label_tuples())
-        phone_tier = textgrid.IntervalTier("phones", mix.get_merged_plosives())
-
-        tg.addTier(word_tier, reportingMode="error")
-        tg.addTier(phone_tier, reportingMode="error")
-
-        tg.save(str(outfile), format="long_textgrid", includeBlankSpaces=True, reportingMode="warning")
+    cache = MixCache(args.cache) if args.cache else None
+    worker = partial(convert_mix, outpath=args.outpath, audio=args.audio)
+    for _ in map_mixes(worker, args.files, jobs=args.jobs, cache=cache,
+                   io_concurrency=args.io_concurrency):
+        pass
 
 
 if __name__ == '__main__':
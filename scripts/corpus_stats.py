@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# flake8: noqa
+
+#
+# Collects pronunciation, phone and duration statistics over the
+# Waxholm data (see waxholm.stats), and saves them as JSON.
+
+from waxholm import Corpus
+from waxholm.corpus import add_index_arguments
+from waxholm.cache import MixCache
+from waxholm.convert import add_arguments
+from waxholm.instrument import stage, start_run
+from waxholm.stats import collect_stats
+import argparse
+from pathlib import Path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Collect corpus statistics from the Waxholm data.')
+    parser.add_argument('data_location', type=str, help='path to the Waxholm data')
+    parser.add_argument('output', type=str, help='JSON file to write the statistics to')
+    parser.add_argument('--no-merge-plosives', help='keep closures and bursts as separate phones', action='store_true')
+    add_index_arguments(parser)
+    add_arguments(parser)
+    args = parser.parse_args()
+    start_run("corpus_stats", profile=args.profile, report=args.report, log_limit=args.log_limit,
+              log_level=args.log_level)
+
+    outpath = Path(args.output)
+    if outpath.exists():
+        print(f"File exists with output path name ({outpath}); cowardly refusing to continue")
+        exit()
+
+    data_location = Path(args.data_location)
+    if not data_location.exists():
+        print(f"Path to data ({data_location}) does not exist")
+        exit()
+    elif not data_location.is_dir():
+        print(f"Path to data ({data_location}) exists, but is not a directory")
+        exit()
+
+    cache = MixCache(args.cache) if args.cache else None
+    corpus = Corpus(data_location, index_path=args.index, refresh=args.refresh_index, cache=cache)
+    paths = [corpus.get_path(entry) for entry in corpus]
+    with corpus.reading():
+        stats = collect_stats(paths, jobs=args.jobs, cache=cache,
+                              merge_plosives=not args.no_merge_plosives,
+                              io_concurrency=args.io_concurrency)
+    with stage("write"):
+        stats.save(outpath)
+    print(f"{stats.files} files, {len(stats.pronunciations)} words, "
+          f"{len(stats.phones)} phones, {len(stats.speakers)} speakers")
+
+
+if __name__ == '__main__':
+    main()
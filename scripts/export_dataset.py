@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# flake8: noqa
+
+#
+# Exports the corpus as a sharded dataset (see waxholm.export), which
+# can be memory-mapped and read with waxholm.export.ShardedDataset.
+
+from waxholm import Corpus
+from waxholm.corpus import add_index_arguments
+from waxholm.cache import MixCache
+from waxholm.export import export_dataset
+from waxholm.vocab import Vocabulary
+import argparse
+from pathlib import Path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the Waxholm data as a sharded dataset.')
+    parser.add_argument('data_location', type=str, help='path to the Waxholm data')
+    parser.add_argument('outpath', type=str, help='directory in which to write the dataset')
+    parser.add_argument('--shard-size', type=int, default=1000, help='number of utterances per shard')
+    parser.add_argument('--audio', help='include the audio samples', action='store_true')
+    parser.add_argument('--no-merge-plosives', help='keep closures and bursts as separate phones', action='store_true')
+    parser.add_argument('--vocab', type=str, help='directory containing phones.json and words.json to use')
+    add_index_arguments(parser)
+    parser.add_argument('--cache', type=str, help='directory in which to cache parsed .mix files')
+    args = parser.parse_args()
+
+    outpath = Path(args.outpath)
+    if outpath.exists():
+        print(f"File exists with output path name ({outpath}); cowardly refusing to continue")
+        exit()
+
+    data_location = Path(args.data_location)
+    if not data_location.exists():
+        print(f"Path to data ({data_location}) does not exist")
+        exit()
+    elif not data_location.is_dir():
+        print(f"Path to data ({data_location}) exists, but is not a directory")
+        exit()
+
+    phones = None
+    words = None
+    if args.vocab:
+        phones = Vocabulary.load(Path(args.vocab) / "phones.json")
+        words = Vocabulary.load(Path(args.vocab) / "words.json")
+
+    cache = MixCache(args.cache) if args.cache else None
+    corpus = Corpus(data_location, index_path=args.index, refresh=args.refresh_index, cache=cache)
+    mixes = (mix for _, mix in corpus.mixes())
+    manifest = export_dataset(mixes, outpath, shard_size=args.shard_size, audio=args.audio,
+                              merge_plosives=not args.no_merge_plosives,
+                              phones=phones, words=words)
+    print(f"{sum(x['count'] for x in manifest['shards'])} utterances in {len(manifest['shards'])} shards")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# flake8: noqa
+
+#
+# Writes the transcripts of the Waxholm data, either one per line (e.g.,
+# for language model training), or as a manifest of utterance ID, speaker
+# and text. Only the header of each .mix file is read.
+
+from waxholm import Corpus
+from waxholm.corpus import add_index_arguments
+import argparse
+from pathlib import Path
+
+from waxholm.utils import cond_lc
+
+
+def clean_text(text, lowercase=True):
+    text = text.strip()
+    if lowercase:
+        text = " ".join([cond_lc(x) for x in text.split(" ")])
+    if text.endswith("."):
+        text = text[:-1].strip()
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write the transcripts of the Waxholm data.')
+    parser.add_argument('data_location', type=str, help='path to the Waxholm data')
+    parser.add_argument('output', type=str, help='file to write')
+    parser.add_argument('--manifest', help='write utterance ID, speaker and text, tab-separated', action='store_true')
+    parser.add_argument('--cased', help='keep the case of the original text', action='store_true')
+    add_index_arguments(parser)
+    args = parser.parse_args()
+
+    outpath = Path(args.output)
+    if outpath.exists():
+        print(f"File exists with output path name ({outpath}); cowardly refusing to continue")
+        exit()
+
+    data_location = Path(args.data_location)
+    if not data_location.exists():
+        print(f"Path to data ({data_location}) does not exist")
+        exit()
+    elif not data_location.is_dir():
+        print(f"Path to data ({data_location}) exists, but is not a directory")
+        exit()
+
+    corpus = Corpus(data_location, index_path=args.index, refresh=args.refresh_index)
+    with open(outpath, "w") as outf:
+        for entry, mix in corpus.mixes(header_only=True):
+            text = clean_text(getattr(mix, "text", ""), lowercase=not args.cased)
+            if args.manifest:
+                utt = f"{entry.speaker}.{entry.session}.{entry.utterance}"
+                outf.write(f"{utt}\t{entry.speaker}\t{text}\n")
+            else:
+                outf.write(text + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -52,7 +52,7 @@ long_description = (
     read_content("README.md") +
     read_content(os.path.join("docs/source", "CHANGELOG.rst")))
 
-requires = ['setuptools', 'soundfile']
+requires = ['setuptools', 'soundfile', 'numpy']
 
 extras_require = {
     'reST': ['Sphinx'],
@@ -12,9 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from .mix import FR, Mix
+from .corpus import Corpus
 
 
 __all__ = [
+    "Corpus",
     "FR",
     "Mix"
 ]
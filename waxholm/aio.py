@@ -0,0 +1,130 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+import asyncio
+from .convert import _MixTask
+from .instrument import count, get_instrument
+from .mix import Mix
+
+
+DEFAULT_CONCURRENCY = 16
+
+
+def _read(path, cache=None):
+    """
+    Read `path` in a worker thread: returns (mix, None, 0) if the
+    cache has the parsed file, otherwise (None, text, bytes read)
+    """
+    if cache is not None:
+        mix = cache.get(path)
+        if mix is not None:
+            return mix, None, 0
+    with open(path) as inpf:
+        text = inpf.read()
+        size = inpf.buffer.tell()
+    return None, text, size
+
+
+class _PrefetchedTask(_MixTask):
+    """
+    As `_MixTask`, for a file that has already been read: called
+    with (path, mix, text, size), as from `_read`
+    """
+    def load(self, item):
+        path, mix, text, size = item
+        if mix is None:
+            mix = Mix(filepath=path, stringfile=text)
+            count("bytes_read", size)
+            if self.cache is not None:
+                self.cache.put(path, mix)
+        return mix
+
+
+async def amap_mixes(func, paths, concurrency=DEFAULT_CONCURRENCY, jobs=1, cache=None):
+    """
+    Asynchronous version of `waxholm.convert.map_mixes`, for storage
+    where opening a file is slow: up to `concurrency` files are read at
+    once, in threads, while those already read are parsed and passed
+    to `func`, in this process or, if `jobs` is more than 1, in that
+    many worker processes.
+
+    Results are yielded in the order of `paths`. With `jobs` of 1,
+    `func` is also called in that order, however the reads finish, so
+    any files it writes itself are written in order; worker processes
+    call it in whatever order they run, as with `map_mixes`.
+    """
+    loop = asyncio.get_running_loop()
+    workers = ProcessPoolExecutor(max_workers=jobs) if jobs is not None and jobs > 1 else nullcontext()
+    with ThreadPoolExecutor(max_workers=concurrency) as threads, workers as pool:
+        task = _PrefetchedTask(func, cache, collect=pool is not None)
+
+        async def read(path):
+            return (path,) + await loop.run_in_executor(threads, _read, path, cache)
+
+        async def run(path):
+            result, recorded = await loop.run_in_executor(pool, task, await read(path))
+            get_instrument().merge(recorded)
+            return result
+
+        async def finish(future):
+            # only reads are in flight in this process, so that `func`
+            # is called here in path order
+            if pool is None:
+                return task(await future)
+            return await future
+
+        start = read if pool is None else run
+        window = deque()
+        try:
+            for path in paths:
+                window.append(asyncio.ensure_future(start(path)))
+                if len(window) >= concurrency:
+                    yield await finish(window.popleft())
+            while window:
+                yield await finish(window.popleft())
+        finally:
+            for pending in window:
+                pending.cancel()
+
+
+def map_mixes_async(func, paths, concurrency=DEFAULT_CONCURRENCY, jobs=1, cache=None):
+    """
+    Runs `amap_mixes` in its own event loop, yielding its results,
+    so it can be used in place of `map_mixes` from synchronous code
+    """
+    loop = asyncio.new_event_loop()
+    results = amap_mixes(func, paths, concurrency=concurrency, jobs=jobs, cache=cache)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(results.aclose())
+        loop.close()
+
+
+def _identity(mix):
+    return mix
+
+
+def iter_mixes(paths, concurrency=DEFAULT_CONCURRENCY, cache=None):
+    """
+    Yield a Mix for each of `paths`, in order, reading up to
+    `concurrency` files at once
+    """
+    return map_mixes_async(_identity, paths, concurrency=concurrency, cache=cache)
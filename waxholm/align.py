@@ -0,0 +1,107 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import Counter
+from typing import Dict, List, Tuple
+
+
+def _edit_alignment(a, b) -> List[Tuple[int, int]]:
+    """
+    Index pairs of the equal items of a minimum edit distance alignment
+    of `a` and `b`
+    """
+    if len(a) == 0 or len(b) == 0:
+        return []
+    cols = len(b) + 1
+    dist = [list(range(cols))]
+    for i in range(1, len(a) + 1):
+        prev = dist[-1]
+        row = [i] + [0] * len(b)
+        for j in range(1, cols):
+            cost = prev[j - 1] + (0 if a[i - 1] == b[j - 1] else 1)
+            row[j] = min(cost, prev[j] + 1, row[j - 1] + 1)
+        dist.append(row)
+    pairs = []
+    i = len(a)
+    j = len(b)
+    while i > 0 and j > 0:
+        if a[i - 1] == b[j - 1] and dist[i][j] == dist[i - 1][j - 1]:
+            pairs.append((i - 1, j - 1))
+            i -= 1
+            j -= 1
+        elif dist[i][j] == dist[i - 1][j] + 1:
+            i -= 1
+        elif dist[i][j] == dist[i][j - 1] + 1:
+            j -= 1
+        else:
+            i -= 1
+            j -= 1
+    pairs.reverse()
+    return pairs
+
+
+def align_sequences(a, b) -> List[Tuple[int, int]]:
+    """
+    Index pairs (i, j) of the items with `a[i] == b[j]` in an alignment
+    of `a` and `b`. Identical sequences are aligned in linear time, as
+    are any common prefix and suffix; only the part in between goes
+    through the edit distance alignment.
+    """
+    if a == b:
+        return [(i, i) for i in range(len(a))]
+    shortest = min(len(a), len(b))
+    prefix = 0
+    while prefix < shortest and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < shortest - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    pairs = [(i, i) for i in range(prefix)]
+    middle = _edit_alignment(a[prefix:len(a) - suffix], b[prefix:len(b) - suffix])
+    pairs += [(prefix + i, prefix + j) for i, j in middle]
+    pairs += [(len(a) - suffix + k, len(b) - suffix + k) for k in range(suffix)]
+    return pairs
+
+
+def compare_pronunciations(orig, new, only_changed=True) -> List[Tuple[str, str, str]]:
+    """
+    Align two lists of (word, pronunciation) pairs (e.g., canonical and
+    realised) by word, and return (word, orig pronunciation, new
+    pronunciation) for each aligned word; with `only_changed`, only
+    for those where the pronunciations differ
+    """
+    pairs = align_sequences([x[0] for x in orig], [x[0] for x in new])
+    out = []
+    for i, j in pairs:
+        if only_changed and orig[i][1] == new[j][1]:
+            continue
+        out.append((orig[i][0], orig[i][1], new[j][1]))
+    return out
+
+
+def pronunciation_variants(mixes, fix_accents=True, merge_plosives=True,
+                           only_changed=True) -> Dict[str, Counter]:
+    """
+    Count, for each word, the (canonical, spoken) pronunciation pairs
+    from `Mix.get_compare_dictionary` over all of `mixes`, in one pass
+    """
+    variants = {}
+    for mix in mixes:
+        entries = mix.get_compare_dictionary(fix_accents=fix_accents,
+                                             merge_plosives=merge_plosives,
+                                             only_changed=only_changed)
+        for word, canonical, spoken in entries:
+            if word not in variants:
+                variants[word] = Counter()
+            variants[word][(canonical, spoken)] += 1
+    return variants
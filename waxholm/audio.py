@@ -11,25 +11,99 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
+import numpy as np
 import soundfile as sf
 from pathlib import Path
+from .instrument import count, stage
+
+
+SMP_HEADER_SIZE = 1024
+SAMPLE_RATE = 16000
+
+
+def _parse_smp_headers(raw_headers: bytes):
+    raw_headers = raw_headers.rstrip(b'\x00')
+    asc_headers = raw_headers.decode("ascii")
+    tmp = [a for a in asc_headers.split("\r\n")]
+    back = -1
+    while abs(back) > len(tmp) + 1:
+        if tmp[back] == '=':
+            break
+        back -= 1
+    tmp = tmp[0:back-1]
+    return dict(a.split("=") for a in tmp)
 
 
 def smp_headers(filename: str):
     with open(filename, "rb") as f:
         f.seek(0)
-        raw_headers = f.read(1024)
-        raw_headers = raw_headers.rstrip(b'\x00')
-        asc_headers = raw_headers.decode("ascii")
-        asc_headers.rstrip('\x00')
-        tmp = [a for a in asc_headers.split("\r\n")]
-        back = -1
-        while abs(back) > len(tmp) + 1:
-            if tmp[back] == '=':
-                break
-            back -= 1
-        tmp = tmp[0:back-1]
-        return dict(a.split("=") for a in tmp)
+        return _parse_smp_headers(f.read(SMP_HEADER_SIZE))
+
+
+class SMPFile:
+    """
+    Reader for .smp files that parses the header once, and exposes the
+    samples as a read-only memory map, so that a range of frames (such
+    as the boundaries of an FR segment) can be read without reading the
+    rest of the file.
+    If `fileobj` (the file, opened in binary mode) is given, the header
+    is read from it, leaving it positioned at the start of the samples.
+    """
+    def __init__(self, filename, fileobj=None):
+        self.filename = str(filename)
+        if fileobj is None:
+            with open(self.filename, "rb") as f:
+                self.headers = _parse_smp_headers(f.read(SMP_HEADER_SIZE))
+                size = os.fstat(f.fileno()).st_size
+        else:
+            fileobj.seek(0)
+            self.headers = _parse_smp_headers(fileobj.read(SMP_HEADER_SIZE))
+            size = os.fstat(fileobj.fileno()).st_size
+        self.nchans = int(self.headers["nchans"])
+        self.samplerate = SAMPLE_RATE
+        if self.headers["msb"] == "last":
+            self.dtype = np.dtype("<i2")
+        else:
+            self.dtype = np.dtype(">i2")
+        self.data_offset = SMP_HEADER_SIZE
+        self.frames = max(0, size - self.data_offset) // (self.dtype.itemsize * self.nchans)
+        self._samples = None
+
+    def __len__(self):
+        return self.frames
+
+    @property
+    def samples(self) -> np.ndarray:
+        """
+        The samples, in the byte order of the file: a memory-mapped
+        array of shape (frames,) for mono files, (frames, nchans) otherwise
+        """
+        if self._samples is None:
+            if self.nchans == 1:
+                shape = (self.frames,)
+            else:
+                shape = (self.frames, self.nchans)
+            if self.frames == 0:
+                self._samples = np.empty(shape, dtype=self.dtype)
+            else:
+                self._samples = np.memmap(self.filename, dtype=self.dtype, mode="r",
+                                          offset=self.data_offset, shape=shape)
+        return self._samples
+
+    def read(self, start=0, end=None) -> np.ndarray:
+        """
+        Read frames `start` to `end` as native int16, like `smp_read_sf`
+        """
+        return self.samples[start:end].astype(np.int16)
+
+
+def smp_read(filename: str):
+    """
+    As `smp_read_sf`, without going through soundfile
+    """
+    smp = SMPFile(filename)
+    return (smp.read(), smp.samplerate)
 
 
 def smp_read_sf(filename: str):
@@ -45,20 +119,59 @@ def smp_read_sf(filename: str):
     return (data, sr)
 
 
-def write_wav(filename, arr):
+def write_wav(filename, arr, nchans=1, samplerate=SAMPLE_RATE):
     import wave
 
     with wave.open(filename, "w") as f:
-        f.setnchannels(1)
+        f.setnchannels(nchans)
         f.setsampwidth(2)
-        f.setframerate(16000)
+        f.setframerate(samplerate)
         f.writeframes(arr)
 
 
-def smp_to_wav(infile, outfile):
+BLOCK_SIZE = 64 * 1024
+
+
+def smp_to_wav(infile, outfile, block_size=BLOCK_SIZE, buffer=None):
+    """
+    Convert an .smp file to .wav, copying the samples across in blocks
+    of `block_size` bytes (or the size of `buffer`, a bytearray to reuse),
+    so memory use does not depend on the length of the file.
+    """
+    import wave
+
     if type(infile) == Path:
         infile = str(infile)
     if type(outfile) == Path:
         outfile = str(outfile)
-    data, sr = smp_read_sf(infile)
-    write_wav(outfile, data)
+    if buffer is None:
+        buffer = bytearray(block_size)
+    with stage("audio"), open(infile, "rb") as inf, wave.open(outfile, "wb") as wav:
+        smp = SMPFile(infile, fileobj=inf)
+        wav.setnchannels(smp.nchans)
+        wav.setsampwidth(2)
+        wav.setframerate(smp.samplerate)
+        # wave expects samples in native byte order
+        swap = not smp.dtype.isnative
+        frame_size = smp.dtype.itemsize * smp.nchans
+        view = memoryview(buffer)[:len(buffer) - len(buffer) % frame_size]
+        remaining = smp.frames * frame_size
+        while remaining > 0:
+            read = inf.readinto(view[:remaining])
+            if not read:
+                break
+            if swap:
+                np.frombuffer(view, dtype=np.int16, count=read // 2).byteswap(inplace=True)
+            wav.writeframesraw(view[:read])
+            remaining -= read
+        count("bytes_read", inf.tell())
+    count("bytes_written", os.path.getsize(outfile))
+
+
+def smp_to_wav_batch(files, block_size=BLOCK_SIZE):
+    """
+    Convert a list of (smp, wav) filename pairs, reusing one buffer
+    """
+    buffer = bytearray(block_size)
+    for infile, outfile in files:
+        smp_to_wav(infile, outfile, buffer=buffer)
@@ -0,0 +1,144 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from hashlib import sha1
+from pathlib import Path
+import os
+import pickle
+from .instrument import count
+from .mix import Mix
+
+
+# Bump this whenever the pickled form of Mix or FR changes
+CACHE_VERSION = 3
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+# Eviction removes entries until the cache is this fraction of max_size,
+# so that the directory is not rescanned on every put once it is full
+DEFAULT_LOW_WATER = 0.9
+
+
+class MixCache:
+    """
+    On-disk cache of parsed .mix files.
+
+    Each entry is a versioned pickle, stored with the path, size and
+    modification time of the .mix file it was parsed from; an entry is
+    only used if all of these still match. When the cache grows past
+    `max_size` bytes, the least recently used entries are removed,
+    down to `low_water` times `max_size`.
+    """
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE, low_water=DEFAULT_LOW_WATER):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.low_water = low_water
+        self._total_size = None
+
+    def _entry_path(self, abspath: str) -> Path:
+        key = sha1(abspath.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.pickle"
+
+    @staticmethod
+    def _signature(abspath: str):
+        stat = os.stat(abspath)
+        return (abspath, stat.st_size, stat.st_mtime_ns)
+
+    def get(self, path):
+        """
+        Returns the cached Mix for `path`, or None if there is no
+        entry or it is out of date; `mix.path` is set to `path`, as
+        the entry may have been stored under another (e.g., relative)
+        path to the same file. A hit counts the file and its FR lines,
+        as parsing it would (but not `bytes_read`), and a `cache_hits`.
+        """
+        abspath = os.path.abspath(path)
+        entry_path = self._entry_path(abspath)
+        try:
+            with open(entry_path, "rb") as inpf:
+                version, signature, mix = pickle.load(inpf)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError, TypeError, ValueError):
+            # unreadable, or pickled from classes that have since moved
+            return None
+        if version != CACHE_VERSION or signature != self._signature(abspath):
+            return None
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        mix.path = path
+        count("files")
+        count("fr_lines", len(mix.view.base))
+        count("cache_hits")
+        return mix
+
+    def put(self, path, mix: Mix):
+        abspath = os.path.abspath(path)
+        entry_path = self._entry_path(abspath)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as outf:
+            pickle.dump((CACHE_VERSION, self._signature(abspath), mix), outf,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry_path)
+        if self._total_size is not None:
+            self._total_size += entry_path.stat().st_size
+        self.evict()
+
+    def load(self, path) -> Mix:
+        """
+        Returns the Mix for `path`, from the cache if possible,
+        otherwise parsing it and adding it to the cache
+        """
+        mix = self.get(path)
+        if mix is None:
+            mix = Mix(filepath=path)
+            self.put(path, mix)
+        return mix
+
+    def _entries(self):
+        entries = []
+        for entry_path in self.directory.glob("*.pickle"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+        return entries
+
+    def evict(self):
+        """
+        If the cache is larger than `max_size`, remove least recently
+        used entries until it fits in `low_water` times `max_size`
+        """
+        if self._total_size is not None and self._total_size <= self.max_size:
+            return
+        entries = self._entries()
+        total = sum(entry[1] for entry in entries)
+        if total <= self.max_size:
+            self._total_size = total
+            return
+        target = self.max_size * self.low_water
+        for _, size, entry_path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                entry_path.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._total_size = total
+
+    def clear(self):
+        for _, _, entry_path in self._entries():
+            entry_path.unlink()
+        self._total_size = 0
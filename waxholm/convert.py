@@ -0,0 +1,101 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from concurrent.futures import ProcessPoolExecutor
+from .mix import Mix
+from . import instrument
+
+
+def add_arguments(parser):
+    """
+    Add the options shared by the conversion scripts to an
+    `argparse.ArgumentParser`
+    """
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='number of worker processes (default: 1)')
+    parser.add_argument('--cache', type=str, help='directory in which to cache parsed .mix files')
+    parser.add_argument('--io-concurrency', type=int, default=0,
+                        help='number of files to read at once, for slow (e.g., network) storage (default: 0, read one at a time)')
+    instrument.add_arguments(parser)
+
+
+class _MixTask:
+    """
+    Picklable callable that reads a .mix file (through the cache, if
+    there is one) and passes the Mix to `func`.
+    With `collect`, returns the result along with an `Instrument` of
+    what was recorded while running, for merging in the parent process.
+    """
+    def __init__(self, func, cache=None, collect=False):
+        self.func = func
+        self.cache = cache
+        self.collect = collect
+
+    def load(self, path) -> Mix:
+        if self.cache is not None:
+            return self.cache.load(path)
+        return Mix(filepath=path)
+
+    def run(self, path):
+        with instrument.stage("load"):
+            mix = self.load(path)
+        with instrument.stage("process"):
+            return self.func(mix)
+
+    def __call__(self, path):
+        if not self.collect:
+            return self.run(path)
+        with instrument.collect() as recorded:
+            result = self.run(path)
+        return result, recorded
+
+
+def map_mixes(func, paths, jobs=1, cache=None, chunksize=8, io_concurrency=0):
+    """
+    Read each of `paths` as a Mix and call `func` on it, using `jobs`
+    worker processes. `func` must be picklable (i.e., a module-level
+    function, or a `functools.partial` of one), and gets the file path
+    as `mix.path`.
+
+    Results are yielded in the order of `paths`, whatever order the
+    workers finish in, so merging them in the caller is deterministic.
+    Timings and counters recorded in the workers are merged into the
+    parent's instrument (see `waxholm.instrument`).
+
+    If `io_concurrency` is set, files are read that many at a time,
+    with `waxholm.aio.map_mixes_async`.
+    """
+    if io_concurrency:
+        from .aio import map_mixes_async
+        yield from map_mixes_async(func, paths, concurrency=io_concurrency, jobs=jobs, cache=cache)
+        return
+    if jobs is None or jobs <= 1:
+        task = _MixTask(func, cache)
+        for path in paths:
+            yield task(path)
+    else:
+        task = _MixTask(func, cache, collect=True)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for result, recorded in pool.map(task, paths, chunksize=chunksize):
+                instrument.get_instrument().merge(recorded)
+                yield result
+
+
+def map_corpus(func, corpus, jobs=1, chunksize=8, io_concurrency=0):
+    """
+    As `map_mixes`, over all of the files in a `Corpus`
+    """
+    paths = [corpus.get_path(entry) for entry in corpus]
+    with corpus.reading():
+        yield from map_mixes(func, paths, jobs=jobs, cache=corpus.cache, chunksize=chunksize,
+                             io_concurrency=io_concurrency)
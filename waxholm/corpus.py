@@ -0,0 +1,222 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import os
+from .instrument import diagnose
+from .mix import Mix, iter_records
+from .vocab import Vocabulary
+
+
+INDEX_NAME = "waxholm-index.json"
+INDEX_VERSION = 1
+
+
+IndexEntry = namedtuple('IndexEntry', ['path', 'speaker', 'session', 'utterance',
+                                       'size', 'mtime', 'fr_count', 'text'])
+
+
+def split_stem(path):
+    """
+    Split a .mix file name (e.g., `fp2060.1.05.smp.mix`) into its
+    speaker, session and utterance parts.
+    """
+    parts = Path(path).name.split(".")
+    parts += [""] * (3 - len(parts))
+    return parts[0], parts[1], parts[2]
+
+
+def add_index_arguments(parser):
+    """
+    Add the options for the corpus index to an `argparse.ArgumentParser`
+    """
+    parser.add_argument('--index', type=str, help='path to the corpus index file (default: inside the data directory)')
+    parser.add_argument('--refresh-index', action='store_true',
+                        help='reindex files that were added, removed or changed since the index was written')
+
+
+def index_entry(root, path) -> IndexEntry:
+    """
+    Build the index entry for a single .mix file
+    """
+    path = Path(path)
+    stat = path.stat()
+    with open(path) as inpf:
+        lines = inpf.readlines()
+    header = dict(iter_records(lines, header_only=True))
+    fr_count = sum(1 for line in lines if line.startswith("FR "))
+    speaker, session, utterance = split_stem(path)
+    return IndexEntry(path=path.relative_to(root).as_posix(),
+                      speaker=speaker, session=session, utterance=utterance,
+                      size=stat.st_size, mtime=stat.st_mtime,
+                      fr_count=fr_count, text=header.get("text", ""))
+
+
+class Corpus:
+    """
+    Index of the .mix files under `root`.
+
+    The index is kept in a single file (by default, `waxholm-index.json`
+    in `root`), so that opening the corpus again does not walk the
+    directory tree; use `refresh()` (or `refresh=True`) to pick up
+    added, removed or changed files. Filtering
+    only looks at the index, and a `Mix` is only read when it is loaded.
+    If `cache` (a `MixCache`) is given, loading goes through it.
+    """
+    def __init__(self, root, index_path=None, rebuild=False, entries=None, cache=None, refresh=False):
+        self.root = Path(root)
+        self.cache = cache
+        if index_path is None:
+            self.index_path = self.root / INDEX_NAME
+        else:
+            self.index_path = Path(index_path)
+        if entries is not None:
+            self.entries = list(entries)
+            return
+        self.entries = []
+        if not rebuild and self.index_path.exists():
+            self.entries = self._read_index()
+        if rebuild or refresh or self.entries == []:
+            self.refresh()
+
+    def _read_index(self):
+        with open(self.index_path) as inpf:
+            data = json.load(inpf)
+        if data.get("version") != INDEX_VERSION:
+            return []
+        return [IndexEntry(**entry) for entry in data["entries"]]
+
+    def save(self):
+        data = {
+            "version": INDEX_VERSION,
+            "entries": [entry._asdict() for entry in self.entries]
+        }
+        try:
+            with open(self.index_path, "w") as outf:
+                json.dump(data, outf)
+        except OSError as e:
+            diagnose("index-write", self.index_path, "Could not write corpus index %s: %s", self.index_path, e)
+
+    def refresh(self, save=True):
+        """
+        Walk `root`, reindexing only the files that are new or whose
+        size or modification time have changed.
+        """
+        known = {entry.path: entry for entry in self.entries}
+        entries = []
+        for path in sorted(self.root.glob("**/*.mix")):
+            relpath = path.relative_to(self.root).as_posix()
+            entry = known.get(relpath)
+            if entry is not None:
+                stat = path.stat()
+                if entry.size == stat.st_size and entry.mtime == stat.st_mtime:
+                    entries.append(entry)
+                    continue
+            entries.append(index_entry(self.root, path))
+        self.entries = entries
+        if save:
+            self.save()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def filter(self, speaker=None, session=None):
+        """
+        Returns a Corpus with only the entries matching `speaker` and
+        `session`, each of which can be a single value or a collection.
+        """
+        def as_set(value):
+            if value is None:
+                return None
+            elif isinstance(value, str):
+                return {value}
+            else:
+                return set(value)
+        speakers = as_set(speaker)
+        sessions = as_set(session)
+        entries = [entry for entry in self.entries
+                   if (speakers is None or entry.speaker in speakers)
+                   and (sessions is None or entry.session in sessions)]
+        return Corpus(self.root, index_path=self.index_path, entries=entries, cache=self.cache)
+
+    def speakers(self):
+        return sorted({entry.speaker for entry in self.entries})
+
+    def sessions(self):
+        return sorted({(entry.speaker, entry.session) for entry in self.entries})
+
+    def get_path(self, entry: IndexEntry) -> Path:
+        return self.root / entry.path
+
+    @contextmanager
+    def reading(self):
+        """
+        Report a file of the corpus that is missing while reading in the
+        block as an out of date index, saying how to refresh it
+        """
+        try:
+            yield
+        except FileNotFoundError as e:
+            indexed = {os.path.abspath(self.get_path(entry)) for entry in self.entries}
+            if e.filename is None or os.path.abspath(e.filename) not in indexed:
+                raise
+            raise FileNotFoundError(
+                e.errno, f"No such file, but listed in the corpus index {self.index_path}; "
+                "the index is out of date: rerun with --refresh-index (or call Corpus.refresh())",
+                e.filename) from e
+
+    def load(self, entry: IndexEntry, header_only=False) -> Mix:
+        """
+        Read the Mix for `entry`; with `header_only`, only the header
+        is read (see `Mix`), bypassing the cache
+        """
+        with self.reading():
+            if header_only:
+                return Mix(filepath=self.get_path(entry), header_only=True)
+            if self.cache is not None:
+                return self.cache.load(self.get_path(entry))
+            return Mix(filepath=self.get_path(entry))
+
+    def mixes(self, header_only=False, io_concurrency=0):
+        """
+        Yields (entry, Mix) pairs, reading each file as it is reached,
+        or, with `io_concurrency`, reading that many files at once
+        (see `waxholm.aio.iter_mixes`)
+        """
+        if io_concurrency and not header_only:
+            from .aio import iter_mixes
+            paths = [self.get_path(entry) for entry in self.entries]
+            with self.reading():
+                yield from zip(self.entries, iter_mixes(paths, concurrency=io_concurrency, cache=self.cache))
+            return
+        for entry in self.entries:
+            yield entry, self.load(entry, header_only)
+
+    def build_vocabularies(self, merge_plosives=True):
+        """
+        Returns the phone and word `Vocabulary` of all the files, with
+        phones as from `Mix.encode_phone_labels` and words as from
+        `Mix.encode_words`; symbols are numbered in order of appearance
+        """
+        phones = Vocabulary()
+        words = Vocabulary()
+        for _, mix in self.mixes():
+            mix.encode_phone_labels(phones, merge_plosives=merge_plosives, add=True)
+            mix.encode_words(words, add=True)
+        return phones, words
@@ -0,0 +1,112 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import os
+import sys
+
+
+logger = logging.getLogger("waxholm")
+
+LIMIT_ENV = "WAXHOLM_LOG_LIMIT"
+DEFAULT_LIMIT = 10
+LEVEL_ENV = "WAXHOLM_LOG_LEVEL"
+DEFAULT_LEVEL = "INFO"
+DEFAULT_SAMPLES = 5
+
+
+def default_limit():
+    return int(os.environ.get(LIMIT_ENV, DEFAULT_LIMIT))
+
+
+def configure_logging(level=None):
+    """
+    Log messages to the `waxholm` logger at `level` (a name, such as
+    "INFO"; by default, from `WAXHOLM_LOG_LEVEL`, or INFO) and above
+    to stderr. Without a handler, only Python's last-resort handler
+    runs, which drops INFO messages, such as those of `verbose` options.
+    Calling this again only changes the level.
+    """
+    level = level or os.environ.get(LEVEL_ENV, DEFAULT_LEVEL)
+    logger.setLevel(level.upper())
+    if not any(getattr(handler, "waxholm", False) for handler in logger.handlers):
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        handler.waxholm = True
+        logger.addHandler(handler)
+
+
+class Diagnostics:
+    """
+    Collects problems found in the data, by issue type (e.g.,
+    `missing-seconds`) and file.
+
+    Every occurrence is counted, and the first `samples` messages of
+    each issue are kept; only the first `limit` of each issue (no limit
+    if negative) are logged, to the `waxholm` logger. Messages are
+    %-formatted from their arguments only if they are kept or logged,
+    so occurrences past the limit cost no more than the count.
+    `emitted` (the number logged per issue) can be shared between
+    collectors, so that the limit holds across them.
+    """
+    def __init__(self, limit=None, samples=DEFAULT_SAMPLES, emitted=None):
+        self.limit = limit if limit is not None else default_limit()
+        self.max_samples = samples
+        self.counts = {}
+        self.samples = {}
+        self.emitted = emitted if emitted is not None else {}
+
+    def report(self, issue, path, message, args=(), level=logging.WARNING):
+        files = self.counts.get(issue)
+        if files is None:
+            files = self.counts[issue] = {}
+        key = "" if path is None else str(path)
+        files[key] = files.get(key, 0) + 1
+        samples = self.samples.setdefault(issue, [])
+        keep = len(samples) < self.max_samples
+        emitted = self.emitted.get(issue, 0)
+        emit = (self.limit < 0 or emitted < self.limit) and logger.isEnabledFor(level)
+        if not (keep or emit):
+            return
+        text = message % args if args else message
+        if keep:
+            samples.append(text)
+        if emit:
+            self.emitted[issue] = emitted + 1
+            logger.log(level, text)
+            if emitted + 1 == self.limit:
+                logger.log(level, "(further %s messages suppressed)", issue)
+
+    def total(self, issue=None) -> int:
+        if issue is not None:
+            return sum(self.counts.get(issue, {}).values())
+        return sum(sum(files.values()) for files in self.counts.values())
+
+    def merge(self, other: "Diagnostics"):
+        """
+        Add the counts and samples of `other` (e.g., from a worker process)
+        """
+        for issue, files in other.counts.items():
+            mine = self.counts.setdefault(issue, {})
+            for path, n in files.items():
+                mine[path] = mine.get(path, 0) + n
+        for issue, samples in other.samples.items():
+            mine = self.samples.setdefault(issue, [])
+            mine.extend(samples[:max(0, self.max_samples - len(mine))])
+        return self
+
+    def to_dict(self) -> dict:
+        return {issue: {"count": sum(files.values()),
+                        "files": len([path for path in files if path != ""]),
+                        "samples": self.samples.get(issue, [])}
+                for issue, files in sorted(self.counts.items())}
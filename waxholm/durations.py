@@ -0,0 +1,186 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import namedtuple
+import numpy as np
+from .phones import get_inventory, merge_indices
+from .vocab import Vocabulary
+
+
+Segment = namedtuple('Segment', ['utterance', 'start', 'end', 'phone'])
+
+
+class DurationTable:
+    """
+    The phone segments of many utterances, as arrays: `starts` and
+    `ends` (in frames), `phone_ids` (from `phones`, a `Vocabulary`) and
+    `utterance_ids` (indices into `utterances`, the paths of the .mix
+    files), for corpus-wide duration statistics and alignment QA.
+
+    By default, segments are taken from the FR boundaries as they are,
+    so that zero-length segments can be found; with `merge_plosives`,
+    as from `Mix.get_merged_plosives`, with the closures and bursts of
+    all of the utterances merged at once when the arrays are next used
+    (and only then are the phones added to `phones`).
+    """
+    def __init__(self, phones=None, merge_plosives=False):
+        self._phones = phones if phones is not None else Vocabulary()
+        self.merge_plosives = merge_plosives
+        self.utterances = []
+        self._chunks = []
+        self._arrays = None
+
+    @classmethod
+    def from_mixes(cls, mixes, phones=None, merge_plosives=False):
+        table = cls(phones, merge_plosives)
+        for mix in mixes:
+            table.add_mix(mix)
+        return table
+
+    @property
+    def phones(self) -> Vocabulary:
+        self._concatenate()
+        return self._phones
+
+    def add_mix(self, mix):
+        pairs = mix.get_time_array(as_frames=True).astype(np.int64)
+        if self.merge_plosives:
+            # IDs from the shared `PhoneInventory`, until merged
+            ids = mix.get_phone_ids() if len(pairs) else np.empty(0, dtype=np.int32)
+        else:
+            names = [fr.get_phone() for fr in mix.fr[0:-1]] if len(pairs) else []
+            ids = self._phones.encode(names, add=True)
+        utt = np.full(len(ids), len(self.utterances), dtype=np.int32)
+        self.utterances.append(str(mix.path))
+        self._chunks.append((pairs[:, 0], pairs[:, 1], ids, utt))
+        self._arrays = None
+
+    def _concatenate(self):
+        if self._arrays is None:
+            if self._chunks == []:
+                empty = np.empty(0, dtype=np.int64)
+                self._arrays = (empty, empty, np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32))
+            else:
+                segments = tuple(np.concatenate(column) for column in zip(*self._chunks))
+                self._chunks = [segments]
+                if self.merge_plosives:
+                    segments = self._merge(segments)
+                self._arrays = segments
+        return self._arrays
+
+    def _merge(self, segments):
+        starts, ends, ids, utt = segments
+        inventory = get_inventory()
+        offsets = np.searchsorted(utt, np.arange(len(self.utterances) + 1))
+        first, last = merge_indices(ids, inventory.bursts(), offsets)
+        ids = ids[last]
+        # add the phones to the vocabulary in order of appearance, as
+        # adding each segment's phone in turn would
+        found, positions = np.unique(ids, return_index=True)
+        found = found[np.argsort(positions)]
+        lookup = np.zeros(len(inventory), dtype=np.int32)
+        lookup[found] = self._phones.encode(inventory.decode(found.tolist()), add=True)
+        return starts[first], ends[last], lookup[ids], utt[last]
+
+    def __len__(self):
+        return len(self._concatenate()[0])
+
+    @property
+    def starts(self):
+        return self._concatenate()[0]
+
+    @property
+    def ends(self):
+        return self._concatenate()[1]
+
+    @property
+    def phone_ids(self):
+        return self._concatenate()[2]
+
+    @property
+    def utterance_ids(self):
+        return self._concatenate()[3]
+
+    @property
+    def durations(self):
+        return self.ends - self.starts
+
+    def counts(self) -> np.ndarray:
+        """
+        The number of segments of each phone, indexed by phone ID
+        """
+        return np.bincount(self.phone_ids, minlength=len(self.phones))
+
+    def histograms(self, bins=50, max_duration=None):
+        """
+        Per-phone duration histograms over common bins: returns an array
+        of counts, of shape (number of phones, bins), and the bin edges.
+        Durations past the last edge are counted in the last bin.
+        """
+        durations = self.durations
+        if max_duration is None:
+            max_duration = max(int(durations.max()) if len(durations) else 0, 1)
+        edges = np.linspace(0, max_duration, bins + 1)
+        bin_ids = np.clip(np.searchsorted(edges, durations, side="right") - 1, 0, bins - 1)
+        hist = np.zeros((len(self.phones), bins), dtype=np.int64)
+        np.add.at(hist, (self.phone_ids, bin_ids), 1)
+        return hist, edges
+
+    def percentiles(self, q=(5, 25, 50, 75, 95)) -> np.ndarray:
+        """
+        Per-phone duration percentiles (with linear interpolation), as an
+        array of shape (number of phones, len(q)); NaN for phones with no
+        segments
+        """
+        q = np.asarray(q, dtype=np.float64) / 100.0
+        durations = self.durations
+        order = np.lexsort((durations, self.phone_ids))
+        ordered = durations[order].astype(np.float64)
+        counts = self.counts()
+        firsts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        pos = (counts[:, None] - 1).clip(min=0) * q[None, :]
+        lower = np.floor(pos).astype(np.int64)
+        upper = np.ceil(pos).astype(np.int64)
+        frac = pos - lower
+        if len(ordered) == 0:
+            return np.full((len(self.phones), len(q)), np.nan)
+        last = len(ordered) - 1
+        low_values = ordered[np.minimum(firsts[:, None] + lower, last)]
+        high_values = ordered[np.minimum(firsts[:, None] + upper, last)]
+        result = low_values + (high_values - low_values) * frac
+        result[counts == 0] = np.nan
+        return result
+
+    def zero_length(self) -> np.ndarray:
+        """
+        Indices of segments with no duration (or a negative one)
+        """
+        return np.flatnonzero(self.durations <= 0)
+
+    def outliers(self, k=3.0) -> np.ndarray:
+        """
+        Indices of segments whose duration is more than `k` interquartile
+        ranges outside the quartiles of their phone, or not positive
+        """
+        durations = self.durations
+        quartiles = self.percentiles((25, 75))
+        q1 = quartiles[self.phone_ids, 0]
+        q3 = quartiles[self.phone_ids, 1]
+        iqr = q3 - q1
+        extreme = (durations < q1 - k * iqr) | (durations > q3 + k * iqr)
+        return np.flatnonzero(extreme | (durations <= 0))
+
+    def segment(self, index) -> Segment:
+        return Segment(utterance=self.utterances[self.utterance_ids[index]],
+                       start=int(self.starts[index]), end=int(self.ends[index]),
+                       phone=self.phones.symbols[self.phone_ids[index]])
@@ -0,0 +1,237 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import namedtuple
+from pathlib import Path
+import json
+import os
+import numpy as np
+from .audio import SMPFile
+from .corpus import split_stem
+from .segments import smp_path, _utterance_id
+from .vocab import Vocabulary
+
+
+DATASET_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+STRING_COLUMNS = ["utterance", "speaker", "session", "text", "phonemes"]
+LABEL_COLUMNS = ["phone", "word"]
+
+
+Utterance = namedtuple('Utterance', ['utterance', 'speaker', 'session', 'text', 'phonemes',
+                                     'phone_times', 'phone_ids', 'word_times', 'word_ids',
+                                     'samples'])
+
+
+def _pack_strings(strings):
+    encoded = [x.encode("utf-8") for x in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(x) for x in encoded])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return data, offsets
+
+
+def _offsets(arrays):
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(x) for x in arrays])
+    return offsets
+
+
+class _ShardWriter:
+    def __init__(self, directory, audio=False):
+        self.directory = Path(directory)
+        self.audio = audio
+        self.strings = {column: [] for column in STRING_COLUMNS}
+        self.times = {column: [] for column in LABEL_COLUMNS}
+        self.ids = {column: [] for column in LABEL_COLUMNS}
+        self.samples = []
+
+    def __len__(self):
+        return len(self.strings["utterance"])
+
+    def add(self, strings, phone_times, phone_ids, word_times, word_ids, samples=None):
+        for column in STRING_COLUMNS:
+            self.strings[column].append(strings[column])
+        self.times["phone"].append(phone_times)
+        self.ids["phone"].append(phone_ids)
+        self.times["word"].append(word_times)
+        self.ids["word"].append(word_ids)
+        if self.audio:
+            self.samples.append(samples)
+
+    def write(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        def save(name, array):
+            np.save(self.directory / f"{name}.npy", array)
+
+        for column in STRING_COLUMNS:
+            data, offsets = _pack_strings(self.strings[column])
+            save(column, data)
+            save(f"{column}_offsets", offsets)
+        for column in LABEL_COLUMNS:
+            save(f"{column}_offsets", _offsets(self.ids[column]))
+            save(f"{column}_times", np.concatenate(self.times[column]).astype(np.int32))
+            save(f"{column}_ids", np.concatenate(self.ids[column]).astype(np.int32))
+        if self.audio:
+            save("audio_offsets", _offsets(self.samples))
+            save("audio", np.concatenate(self.samples))
+
+
+def export_dataset(mixes, outdir, shard_size=1000, audio=False, merge_plosives=True,
+                   phones=None, words=None):
+    """
+    Write `mixes` to `outdir` as a few large shards, which can be
+    read with `ShardedDataset`.
+
+    Each shard is a directory of .npy files, one per column: the
+    utterance ID, speaker, session, text and phoneme string of each
+    utterance (as UTF-8 bytes, with offsets), the phone and word
+    alignments (as (start, end) frames and IDs from the `phones` and
+    `words` vocabularies, with offsets) and, if `audio` is set, the
+    samples from the .smp file next to each .mix file. Vocabularies
+    are built as the files are read if they are not given, and are
+    stored in the manifest.
+    """
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    phones = phones if phones is not None else Vocabulary()
+    words = words if words is not None else Vocabulary()
+    shards = []
+    channels = None
+
+    def new_shard():
+        return _ShardWriter(outdir / f"shard-{len(shards):05d}", audio=audio)
+
+    def finish(writer):
+        writer.write()
+        shards.append({"name": writer.directory.name, "count": len(writer)})
+
+    writer = new_shard()
+    for mix in mixes:
+        speaker, session, _ = split_stem(str(mix.path))
+        strings = {
+            "utterance": _utterance_id(mix),
+            "speaker": speaker,
+            "session": session,
+            "text": getattr(mix, "text", ""),
+            "phonemes": mix.get_phoneme_string()
+        }
+        phone_times, phone_ids = mix.encode_phone_labels(phones, merge_plosives=merge_plosives,
+                                                         as_frames=True, add=True)
+        word_labels = [x for x in mix.get_word_label_tuples(verbose=False, as_frames=True) if x is not None]
+        word_times = np.array([(x[0], x[1]) for x in word_labels], dtype=np.int32).reshape(-1, 2)
+        word_ids = words.encode([x[2] for x in word_labels], add=True)
+        samples = None
+        if audio:
+            smp = SMPFile(smp_path(mix.path))
+            samples = smp.read(0, len(smp)).reshape(-1, smp.nchans)
+            if channels is None:
+                channels = samples.shape[1]
+            elif channels != samples.shape[1]:
+                raise ValueError(f"{mix.path}: expected {channels} channels, got {samples.shape[1]}")
+        writer.add(strings, phone_times, phone_ids, word_times, word_ids, samples)
+        if len(writer) >= shard_size:
+            finish(writer)
+            writer = new_shard()
+    if len(writer) > 0:
+        finish(writer)
+
+    manifest = {
+        "version": DATASET_VERSION,
+        "audio": audio,
+        "channels": channels,
+        "shards": shards,
+        "phones": phones.to_dict(),
+        "words": words.to_dict()
+    }
+    tmp_path = outdir / f"{MANIFEST_NAME}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as outf:
+        json.dump(manifest, outf, ensure_ascii=False)
+    os.replace(tmp_path, outdir / MANIFEST_NAME)
+    return manifest
+
+
+class _Shard:
+    def __init__(self, directory, audio=False):
+        def load(name):
+            return np.load(directory / f"{name}.npy", mmap_mode="r")
+
+        self.strings = {column: (load(column), load(f"{column}_offsets")) for column in STRING_COLUMNS}
+        self.labels = {column: (load(f"{column}_times"), load(f"{column}_ids"), load(f"{column}_offsets"))
+                       for column in LABEL_COLUMNS}
+        self.audio = (load("audio"), load("audio_offsets")) if audio else None
+
+    def string(self, column, i):
+        data, offsets = self.strings[column]
+        return bytes(data[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+    def label_arrays(self, column, i):
+        times, ids, offsets = self.labels[column]
+        start, end = offsets[i], offsets[i + 1]
+        return times[start:end], ids[start:end]
+
+    def samples(self, i):
+        if self.audio is None:
+            return None
+        data, offsets = self.audio
+        return data[offsets[i]:offsets[i + 1]]
+
+
+class ShardedDataset:
+    """
+    Reader for the output of `export_dataset`. Shards are memory-mapped
+    as they are first used, and each utterance is found with a lookup
+    in the shard offsets, without reading any other utterance; the
+    arrays returned are views into the memory maps.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / MANIFEST_NAME, encoding="utf-8") as inpf:
+            manifest = json.load(inpf)
+        if manifest.get("version") != DATASET_VERSION:
+            raise ValueError(f"Unsupported dataset version: {manifest.get('version')}")
+        self.audio = manifest["audio"]
+        self.shard_names = [shard["name"] for shard in manifest["shards"]]
+        self.starts = np.zeros(len(self.shard_names) + 1, dtype=np.int64)
+        self.starts[1:] = np.cumsum([shard["count"] for shard in manifest["shards"]])
+        self.phones = Vocabulary.from_dict(manifest["phones"])
+        self.words = Vocabulary.from_dict(manifest["words"])
+        self._shards = {}
+
+    def __len__(self):
+        return int(self.starts[-1])
+
+    def _shard(self, num) -> _Shard:
+        if num not in self._shards:
+            self._shards[num] = _Shard(self.path / self.shard_names[num], self.audio)
+        return self._shards[num]
+
+    def __getitem__(self, index) -> Utterance:
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError(index)
+        num = int(np.searchsorted(self.starts, index, side="right")) - 1
+        shard = self._shard(num)
+        i = index - int(self.starts[num])
+        phone_times, phone_ids = shard.label_arrays("phone", i)
+        word_times, word_ids = shard.label_arrays("word", i)
+        strings = {column: shard.string(column, i) for column in STRING_COLUMNS}
+        return Utterance(phone_times=phone_times, phone_ids=phone_ids,
+                         word_times=word_times, word_ids=word_ids,
+                         samples=shard.samples(i), **strings)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
@@ -0,0 +1,66 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+
+
+class FrameTable:
+    """
+    The boundaries of a list of FR records, as arrays: `frames` (int32)
+    and `seconds` (float64, so that values compare equal to the text in
+    the .mix file). Segment `i` runs from boundary `i` to `i + 1`.
+    """
+    def __init__(self, frs):
+        count = len(frs)
+        self.frames = np.fromiter((int(fr.frame) for fr in frs),
+                                  dtype=np.int32, count=count)
+        self.seconds = np.fromiter((float(fr.get_seconds()) for fr in frs),
+                                   dtype=np.float64, count=count)
+
+    @classmethod
+    def from_arrays(cls, frames, seconds):
+        table = cls.__new__(cls)
+        table.frames = frames
+        table.seconds = seconds
+        return table
+
+    def take(self, indices):
+        """
+        The table of the boundaries at `indices`
+        """
+        return FrameTable.from_arrays(self.frames[indices], self.seconds[indices])
+
+    def __len__(self):
+        return len(self.frames)
+
+    def times(self, as_frames=False):
+        if as_frames:
+            return self.frames
+        else:
+            return self.seconds
+
+    def pairs(self, as_frames=False):
+        """
+        (start, end) of each segment, as an array of shape (n - 1, 2)
+        """
+        times = self.times(as_frames)
+        return np.stack((times[:-1], times[1:]), axis=1)
+
+    def durations(self, as_frames=False):
+        return np.diff(self.times(as_frames))
+
+    def empty_segments(self):
+        """
+        Boolean mask of the segments with no distinct duration
+        """
+        return self.frames[:-1] == self.frames[1:]
@@ -0,0 +1,229 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from contextlib import contextmanager
+from time import perf_counter
+import atexit
+import json
+import logging
+import os
+import sys
+from .diagnostics import DEFAULT_LEVEL, LEVEL_ENV, LIMIT_ENV, Diagnostics, configure_logging
+
+
+# Counters that are always reported, even if nothing was counted
+COUNTERS = ["files", "fr_lines", "bytes_read", "bytes_written", "warnings"]
+PROFILE_ENV = "WAXHOLM_PROFILE"
+REPORT_ENV = "WAXHOLM_REPORT"
+
+
+class Instrument:
+    """
+    Per-stage timers, named counters, and `Diagnostics`.
+
+    `stage(name)` is a context manager that adds the time spent inside
+    it (and one call) to `name`; `count(name, n)` adds `n` to a counter.
+    Instruments from worker processes can be combined with `merge`.
+    """
+    def __init__(self, diagnostics=None):
+        self.stages = {}
+        self.counters = {}
+        self.diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+
+    @contextmanager
+    def stage(self, name):
+        start = perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = perf_counter() - start
+            timing = self.stages.get(name)
+            if timing is None:
+                self.stages[name] = [1, elapsed]
+            else:
+                timing[0] += 1
+                timing[1] += elapsed
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other: "Instrument"):
+        for name, (calls, seconds) in other.stages.items():
+            timing = self.stages.setdefault(name, [0, 0.0])
+            timing[0] += calls
+            timing[1] += seconds
+        for name, n in other.counters.items():
+            self.count(name, n)
+        self.diagnostics.merge(other.diagnostics)
+        return self
+
+    def report(self) -> dict:
+        counters = {name: 0 for name in COUNTERS}
+        counters.update(self.counters)
+        stages = {name: {"calls": calls, "seconds": round(seconds, 6)}
+                  for name, (calls, seconds) in self.stages.items()}
+        return {"stages": stages, "counters": counters,
+                "issues": self.diagnostics.to_dict()}
+
+    def save(self, path, **extra):
+        """
+        Write the report, with any `extra` fields, to `path` as JSON
+        """
+        data = dict(extra)
+        data.update(self.report())
+        with open(path, "w") as outf:
+            json.dump(data, outf, indent=2)
+
+
+_CURRENT = Instrument()
+
+
+def get_instrument() -> Instrument:
+    return _CURRENT
+
+
+def reset() -> Instrument:
+    """
+    Replace the current instrument with an empty one, and return the old one
+    """
+    global _CURRENT
+    old = _CURRENT
+    _CURRENT = Instrument()
+    return old
+
+
+def stage(name):
+    return _CURRENT.stage(name)
+
+
+def count(name, n=1):
+    _CURRENT.count(name, n)
+
+
+def diagnose(issue, path, message, *args, level=logging.WARNING):
+    """
+    Record a problem with the data (see `Diagnostics.report`); warnings
+    are also counted in the report
+    """
+    if level >= logging.WARNING:
+        _CURRENT.count("warnings")
+    _CURRENT.diagnostics.report(issue, path, message, args, level)
+
+
+@contextmanager
+def collect():
+    """
+    Record into a fresh `Instrument` (which is yielded) for the
+    duration of the block, e.g., for one task in a worker process.
+    The logging limit of the current diagnostics still applies, and in
+    a worker process of a run, messages are logged as set by `start_run`.
+    """
+    global _CURRENT
+    if LEVEL_ENV in os.environ:
+        configure_logging()
+    old = _CURRENT
+    diagnostics = Diagnostics(limit=old.diagnostics.limit, emitted=old.diagnostics.emitted)
+    _CURRENT = Instrument(diagnostics)
+    try:
+        yield _CURRENT
+    finally:
+        _CURRENT = old
+
+
+class Profiler:
+    """
+    Wraps cProfile, or pyinstrument if the output path ends in `.html`
+    and it is installed, writing the profile to `path` on `stop()`
+    """
+    def __init__(self, path):
+        self.path = str(path)
+        self._profiler = None
+        if self.path.endswith(".html"):
+            try:
+                from pyinstrument import Profiler as PyinstrumentProfiler
+                self._profiler = PyinstrumentProfiler()
+                self.kind = "pyinstrument"
+            except ImportError:
+                print("pyinstrument is not installed; using cProfile", file=sys.stderr)
+        if self._profiler is None:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self.kind = "cprofile"
+
+    def start(self):
+        if self.kind == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self):
+        if self.kind == "pyinstrument":
+            self._profiler.stop()
+            with open(self.path, "w") as outf:
+                outf.write(self._profiler.output_html())
+        else:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.path)
+
+
+def add_arguments(parser):
+    """
+    Add the `--profile`, `--report`, `--log-limit` and `--log-level`
+    options to an `argparse.ArgumentParser`
+    """
+    parser.add_argument('--profile', type=str,
+                        help=f'write a profile of the run to this file (cProfile, or pyinstrument for .html; default: ${PROFILE_ENV})')
+    parser.add_argument('--report', type=str,
+                        help=f'write a JSON summary of stage timings, counters and data issues to this file (default: ${REPORT_ENV})')
+    parser.add_argument('--log-limit', type=int,
+                        help=f'number of messages to log for each kind of data issue; -1 for no limit (default: ${LIMIT_ENV}, or 10)')
+    parser.add_argument('--log-level', type=str.upper, choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help=f'lowest level of messages to log to stderr; INFO includes those of verbose options (default: ${LEVEL_ENV}, or INFO)')
+
+
+def start_run(name, profile=None, report=None, log_limit=None, log_level=None):
+    """
+    Start instrumenting a script run: profile it if `profile` (or the
+    `WAXHOLM_PROFILE` environment variable) is set, and when the
+    script exits, print a one-line JSON summary to stderr, and write
+    the full report to `report` (or `WAXHOLM_REPORT`), if set.
+    Data issues are logged to stderr from `log_level` up (see
+    `configure_logging`). `log_limit` and `log_level` are passed on
+    to worker processes through `WAXHOLM_LOG_LIMIT` and `WAXHOLM_LOG_LEVEL`.
+    """
+    if log_limit is not None:
+        os.environ[LIMIT_ENV] = str(log_limit)
+        get_instrument().diagnostics.limit = log_limit
+    os.environ[LEVEL_ENV] = log_level or os.environ.get(LEVEL_ENV, DEFAULT_LEVEL)
+    configure_logging()
+    profile = profile or os.environ.get(PROFILE_ENV)
+    report = report or os.environ.get(REPORT_ENV)
+    profiler = None
+    if profile:
+        profiler = Profiler(profile)
+        profiler.start()
+    start = perf_counter()
+
+    def finish():
+        if profiler is not None:
+            profiler.stop()
+        instrument = get_instrument()
+        elapsed = round(perf_counter() - start, 6)
+        summary = {"script": name, "seconds": elapsed}
+        summary.update(instrument.report()["counters"])
+        print(json.dumps(summary), file=sys.stderr)
+        if report:
+            instrument.save(report, script=name, seconds=elapsed)
+
+    atexit.register(finish)
+    return finish
@@ -0,0 +1,131 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import Counter
+from pathlib import Path
+import json
+import os
+from .instrument import count, stage
+from .utils import clean_pron_set
+
+
+STATE_VERSION = 1
+
+
+class LexiconBuilder:
+    """
+    Accumulates word -> pronunciation counts over the corpus.
+
+    The entries contributed by each .mix file are kept along with the
+    file's size and modification time, and can be saved to `state_path`,
+    so that a later run only needs to reprocess the files that have
+    changed (see `is_current`). `options` describes how the entries were
+    produced (e.g., script flags); saved state with different options is
+    discarded.
+    """
+    def __init__(self, state_path=None, options=None):
+        self.state_path = state_path
+        self.options = options if options is not None else {}
+        self.files = {}
+        self.counts = {}
+        if state_path is not None and Path(state_path).exists():
+            self._load()
+
+    def _load(self):
+        with open(self.state_path) as inpf:
+            state = json.load(inpf)
+        if state.get("version") != STATE_VERSION or state.get("options") != self.options:
+            return
+        for path, info in state["files"].items():
+            self.files[path] = info
+            self._add_counts(info["entries"], 1)
+
+    def save(self):
+        if self.state_path is None:
+            return
+        state = {
+            "version": STATE_VERSION,
+            "options": self.options,
+            "files": self.files
+        }
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as outf:
+            json.dump(state, outf)
+        os.replace(tmp_path, self.state_path)
+
+    def _add_counts(self, entries, sign):
+        for word, pron in entries:
+            if word not in self.counts:
+                self.counts[word] = Counter()
+            self.counts[word][pron] += sign
+            if self.counts[word][pron] <= 0:
+                del self.counts[word][pron]
+                if not self.counts[word]:
+                    del self.counts[word]
+
+    def is_current(self, path) -> bool:
+        """
+        True if the entries for `path` were collected from the file as it is now
+        """
+        info = self.files.get(str(path))
+        if info is None:
+            return False
+        stat = os.stat(path)
+        return info["size"] == stat.st_size and info["mtime"] == stat.st_mtime_ns
+
+    def update(self, path, entries):
+        """
+        Replace the entries from `path` with `entries`, a list of
+        (word, pronunciation) pairs
+        """
+        self.remove(path)
+        entries = [[word, pron] for word, pron in entries]
+        stat = os.stat(path)
+        self.files[str(path)] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "entries": entries
+        }
+        self._add_counts(entries, 1)
+
+    def remove(self, path):
+        info = self.files.pop(str(path), None)
+        if info is not None:
+            self._add_counts(info["entries"], -1)
+
+    def retain(self, paths):
+        """
+        Drop the entries of files that are not in `paths` (e.g., deleted files)
+        """
+        keep = {str(path) for path in paths}
+        for path in [x for x in self.files if x not in keep]:
+            self.remove(path)
+
+    def pronunciations(self, word) -> Counter:
+        return self.counts.get(word, Counter())
+
+    def write(self, filename, non_phones=False, junk=None, skip_empty=False):
+        """
+        Write the lexicon, with each word's pronunciations cleaned with
+        `clean_pron_set`, skipping lines in `junk`
+        """
+        junk = junk if junk is not None else []
+        with stage("lexicon"), open(filename, "w") as lexf:
+            for word in sorted(self.counts):
+                prons = clean_pron_set(self.counts[word], non_phones)
+                for pron in sorted(prons):
+                    cand = f"{word}\t{pron}\n"
+                    if cand in junk or (skip_empty and cand.endswith("\t\n")):
+                        continue
+                    lexf.write(cand)
+            count("bytes_written", lexf.tell())
@@ -12,11 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from collections import namedtuple
-from copy import deepcopy
+from .align import compare_pronunciations
 from .exceptions import FRExpected
+from .frames import FrameTable
+from .instrument import count, diagnose, stage
+from .phones import get_inventory, merge_indices
 from .utils import fix_duration_markers, is_glottal_closure, replace_glottal_closures
-from difflib import SequenceMatcher
+from .views import FRView
+from .vocab import Vocabulary, encode_labels
+from io import StringIO
+import os
 import re
+from sys import intern
+import numpy as np
 
 
 def split_multiwords(pair):
@@ -26,113 +34,104 @@ def split_multiwords(pair):
     return retval
 
 
+_FIX_TEXT_TABLE = str.maketrans("{}|\\[]", "äåöÖÄÅ")
+_WHITESPACE = re.compile(r"\s+")
+
+
 def fix_text(text: str, extended: bool = False) -> str:
-    replacements = text.maketrans("{}|\\[]", "äåöÖÄÅ")
     if not extended:
-        return text.translate(replacements)
+        return text.translate(_FIX_TEXT_TABLE)
     else:
-        tr = text.translate(replacements)
-        spaced = re.sub("\s+", " ", tr)
+        tr = text.translate(_FIX_TEXT_TABLE)
+        spaced = _WHITESPACE.sub(" ", tr)
         if spaced[-1] == ".":
             spaced = spaced[:-1]
         return spaced.strip()
 
 
+_KLUDGES = {
+    "FR      21506\t #ha\t>pm #ha\t>w skratt\t 1.344 sec":
+        "FR      21506\t #ha\t>pm #ha\t>w XskrattX\t 1.344 sec",
+    "FR      16602\t #.\t>pm #.\t>w. 1.038\t 1.038 sec":
+        "FR      16602\t #.\t>pm #.\t>w .\t 1.038 sec",
+}
+
+
 def _kludge_broken(text):
-    if text.strip() == "FR      21506\t #ha\t>pm #ha\t>w skratt\t 1.344 sec":
-        return "FR      21506\t #ha\t>pm #ha\t>w XskrattX\t 1.344 sec"
-    elif text.strip() == "FR      16602\t #.\t>pm #.\t>w. 1.038\t 1.038 sec":
-        return "FR      16602\t #.\t>pm #.\t>w .\t 1.038 sec"
-    else:
-        return text
+    return _KLUDGES.get(text.strip(), text)
+
+
+# One alternative per kind of tab-separated field in an FR line;
+# the name of the last group that matched says which kind it was.
+_FR_FIELD = re.compile(r"""
+    (?P<phone_type>\$\#|[$#])(?P<phone>.*)
+    |>pm\.?\ (?P<pm_type>\$\#|[$#])(?P<pm>.*)
+    |>w\.?\ (?P<word>.*)
+    |>\ (?P<xword>XklickX|XutandX)
+    |(?P<pseudoword>X.*)
+    |(?P<end>OK|PROBLEMS)
+""", re.VERBOSE)
 
 
 Label = namedtuple('Label', ['start', 'end', 'label'])
 
 
 class FR:
+    # Fields are optional: an unset slot means the field was absent
+    # from the FR line, which is what the has_*/is_* methods check.
+    __slots__ = ("pm", "pm_type", "type", "frame",
+                 "seconds", "phone", "phone_type",
+                 "word", "pseudoword")
+
     def __init__(self, text="", **kwargs):  # C901
         if text and text != "":
             self.from_text(text)
         else:
             for arg in kwargs:
-                prms = ["pm", "pm_type", "type", "frame",
-                        "seconds", "phone", "phone_type",
-                        "word", "pseudoword"]
-                if arg in prms:
-                    self.__dict__[arg] = kwargs[arg]
+                if arg in FR.__slots__:
+                    setattr(self, arg, kwargs[arg])
                 else:
-                    print(f"Unrecognised argument: {arg}")
+                    diagnose("unrecognised-argument", None, "Unrecognised argument: %s", arg)
 
     def from_text(self, text: str):
         text = _kludge_broken(text)
         if not text.startswith("FR"):
             raise FRExpected(text)
         parts = [a.strip() for a in text.split("\t")]
-        if not parts[0].startswith("FR"):
-            print("Error with FR", text)
         self.frame = parts[0][2:].strip()
-        if parts[-1].strip().endswith(" sec"):
-            self.seconds = parts[-1].strip()[0:-4]
-        def split_phone(phone):
-            if phone.startswith("$#"):
-                phtype = 'I'
-                phone_type = fix_text(phone[0:2])
-                phone_out = fix_text(phone[2:])
-            elif phone.startswith("$") or phone.startswith("#"):
-                phtype = 'I'
-                phone_type = fix_text(phone[0:1])
-                phone_out = fix_text(phone[1:])
-            else:
-                return None
-            return {
-                "type": phtype,
-                "phone_type": phone_type,
-                "phone": phone_out
-            }
+        if parts[-1].endswith(" sec"):
+            self.seconds = parts[-1][0:-4]
         for subpart in parts[1:-1]:
-            subpart = subpart.strip()
-            if subpart.startswith("$#") or subpart.startswith("$") or subpart.startswith("#"):
-                phparts = split_phone(subpart)
-                if phparts is not None:
-                    self.type = phparts['type']
-                    self.phone_type = phparts['phone_type']
-                    self.phone = phparts['phone']
-            elif subpart.startswith(">pm "):
-                phparts = split_phone(subpart[4:])
-                if phparts is not None:
-                    self.pm_type = phparts['phone_type']
-                    self.pm = phparts['phone']
-            elif subpart.startswith(">pm. "):
-                phparts = split_phone(subpart[5:])
-                if phparts is not None:
-                    self.pm_type = phparts['phone_type']
-                    self.pm = phparts['phone']
-            elif subpart.startswith(">w "):
-                self.type = 'B'
-                self.word = fix_text(subpart[3:])
-                self.pseudoword = False
-            elif subpart.startswith(">w. "):
+            match = _FR_FIELD.fullmatch(subpart)
+            if match is None:
+                continue
+            kind = match.lastgroup
+            if kind == "phone":
+                self.type = 'I'
+                self.phone_type = intern(match.group("phone_type"))
+                self.phone = intern(match.group("phone").translate(_FIX_TEXT_TABLE))
+            elif kind == "pm":
+                self.pm_type = intern(match.group("pm_type"))
+                self.pm = intern(match.group("pm").translate(_FIX_TEXT_TABLE))
+            elif kind == "word":
                 self.type = 'B'
-                self.word = fix_text(subpart[4:])
+                self.word = intern(match.group("word").translate(_FIX_TEXT_TABLE))
                 self.pseudoword = False
-            elif subpart == "> XklickX" or subpart == "> XutandX":
+            elif kind == "xword":
                 self.type = 'B'
-                self.word = subpart[2:]
+                self.word = intern(match.group("xword"))
                 self.pseudoword = True
-            elif subpart.startswith("X"):
+            elif kind == "pseudoword":
                 if hasattr(self, 'type'):
-                    print(self.type, self.type == 'B')
+                    diagnose("pseudoword-type", None, "Pseudoword in a line of type %s: %s", self.type, text)
                 self.type = getattr(self, 'type', 'B')
-                self.word = fix_text(subpart)
+                self.word = intern(match.group("pseudoword").translate(_FIX_TEXT_TABLE))
                 self.pseudoword = True
-            elif subpart == "OK":
-                self.type = 'E'
-            elif subpart == "PROBLEMS":
+            else:
                 self.type = 'E'
 
     def get_type(self):
-        if "type" in self.__dict__:
+        if hasattr(self, 'type'):
             return self.type
         else:
             return ""
@@ -143,19 +142,19 @@ class FR:
         parts.append(f"frame: {self.frame}")
         if self.get_type() != 'E':
             parts.append(f"phone: {self.get_phone()}")
-        if 'word' in self.__dict__:
+        if hasattr(self, 'word'):
             parts.append(f"word: {self.word}")
-        if 'pm_type' in self.__dict__:
+        if hasattr(self, 'pm_type'):
             parts.append(f"pm_type: {self.pm_type}")
-        if 'pm' in self.__dict__:
+        if hasattr(self, 'pm'):
             parts.append(f"pm: {self.pm}")
-        if 'seconds' in self.__dict__:
+        if hasattr(self, 'seconds'):
             parts.append(f"sec: {self.seconds}")
         return "FR(" + ", ".join(parts) + ")"
 
     def fix_type(self):
-        if not "type" in self.__dict__:
-            if "pm_type" in self.__dict__ and self.pm_type == "$":
+        if not hasattr(self, 'type'):
+            if hasattr(self, 'pm_type') and self.pm_type == "$":
                 self.type = "I"
         if self.is_type("B") and self.get_word() == "":
             self.pm_type = "$"
@@ -167,15 +166,15 @@ class FR:
             if not fix_accents:
                 return phone
             return phone.replace("'", "ˈ").replace('"', "ˌ")
-        if 'pm' in self.__dict__:
+        if hasattr(self, 'pm'):
             return fix_accents(self.pm, fix_accents)
-        elif 'phone' in self.__dict__:
+        elif hasattr(self, 'phone'):
             return fix_accents(self.phone, fix_accents)
         else:
             return None
 
     def is_silence_word(self, noise=False):
-        if 'word' in self.__dict__:
+        if hasattr(self, 'word'):
             if not noise:
                 return self.word == "XX"
             else:
@@ -184,16 +183,16 @@ class FR:
             return False
     
     def is_type(self, type):
-        if "type" in self.__dict__:
+        if hasattr(self, 'type'):
             return type == self.type
         else:
             return False
 
     def has_seconds(self):
-        return "seconds" in self.__dict__
+        return hasattr(self, 'seconds')
 
     def get_seconds(self):
-        if not self.has_seconds() and "frame" in self.__dict__:
+        if not self.has_seconds() and hasattr(self, 'frame'):
             return int(self.frame) / 16000.0
         else:
             return self.seconds
@@ -205,10 +204,10 @@ class FR:
             return ""
 
     def has_word(self):
-        return "word" in self.__dict__
+        return hasattr(self, 'word')
 
     def has_pseudoword(self):
-        return "pseudoword" in self.__dict__
+        return hasattr(self, 'pseudoword')
 
 
 def merge_frs(fr1, fr2, check_time=False):
@@ -237,52 +236,234 @@ def merge_frs(fr1, fr2, check_time=False):
                       phone_type=fr2.phone_type, word=word, pseudoword=pword)
 
 
-class Mix():
-    def __init__(self, filepath: str, stringfile=None, fix_type=True):
-        self.fr = []
-        self.path = filepath
-        if stringfile is None:
-            with open(filepath) as inpf:
-                self.read_data(inpf.readlines())
+def _phone_ids(frs):
+    """
+    IDs from the shared `PhoneInventory` of the phones of `frs`
+    """
+    return get_inventory().encode([fr.get_phone() for fr in frs])
+
+
+def iter_records(lines, header_only=False):
+    """
+    Parse the lines of a .mix file (any iterable of lines, such as an
+    open file) incrementally, yielding (kind, value) pairs as they are
+    read: ("filepath", str), ("text", str), ("phoneme", str), and
+    ("labels", str) for the header fields, and ("fr", FR) for each FR
+    record. A field that continues over several lines is yielded again
+    with its updated value; the last value is the one `Mix` keeps.
+    If `header_only` is set, parsing stops at the first FR line.
+    """
+    saw_text = False
+    saw_phoneme = False
+    saw_labels = False
+    labels = ""
+    for line in lines:
+        if line.startswith("Waxholm dialog."):
+            yield "filepath", line[15:].strip()
+        if line.startswith("TEXT:"):
+            saw_text = True
+            continue
+        if saw_text:
+            yield "text", fix_text(line.strip())
+            saw_text = False
+        if line.startswith("PHONEME:"):
+            saw_phoneme = True
+            yield "phoneme", fix_text(line[8:].strip())
+            if line[8:].strip().endswith("."):
+                saw_phoneme = False
+            continue
+        if saw_phoneme:
+            yield "phoneme", fix_text(line.strip())
+            if line[8:].strip().endswith("."):
+                saw_phoneme = False
+        if line.startswith("FR "):
+            if header_only:
+                return
+            if saw_labels:
+                saw_labels = False
+            yield "fr", FR(text=line)
+        if line.startswith("Labels: "):
+            labels = line[8:].strip()
+            saw_labels = True
+            yield "labels", labels
+        if saw_labels and line.startswith(" "):
+            labels += line.strip()
+            yield "labels", labels
+
+
+def _iter_lines(source):
+    """
+    Lines of `source`: a path (the file is closed when the generator
+    is), or an iterable of lines, such as an open file
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as inpf:
+            yield from inpf
+    else:
+        yield from source
+
+
+def iter_frs(source, fix_type=True):
+    """
+    Yield the FR records of a .mix file (a path, an open file, or any
+    iterable of lines) one at a time, without reading the rest of the
+    file once the caller stops
+    """
+    for kind, value in iter_records(_iter_lines(source)):
+        if kind == "fr":
+            if fix_type:
+                value.fix_type()
+            yield value
+
+
+def iter_mix(paths, fix_type=True):
+    """
+    Yield a Mix for each of `paths`, reading each file only when it is reached
+    """
+    for path in paths:
+        yield Mix(filepath=path, fix_type=fix_type)
+
+
+def dictionary_list(frs, fix_accents=True, split_mws=True):
+    """
+    (word, phones) dictionary entries, in order, from a list of FR
+    records (see `Mix.get_dictionary_list`)
+    """
+    output = []
+    current_phones = []
+    prev_word = ''
+
+    for fr in frs:
+        def add_pron(prev_word, current_phones, split_mws=True):
+            pron_joined = " ".join(current_phones)
+            if split_mws and "~" in pron_joined and "_" in prev_word:
+                return split_multiwords((prev_word, pron_joined))
+            else:
+                if "~" in pron_joined:
+                    pron_joined = pron_joined.replace("~", "")
+                return [(prev_word, pron_joined)]
+
+        if fr.has_word():
+            phone = fr.get_phone(fix_accents)
+            if prev_word != "":
+                output += add_pron(prev_word, current_phones, split_mws)
+                current_phones.clear()
+            prev_word = fr.word
+            current_phones.append(phone)
+        elif fr.is_type("I"):
+            phone = fr.get_phone(fix_accents)
+            current_phones.append(phone)
         else:
-            self.read_data(stringfile.split("\n"))
-        if fix_type:
-            for fr in self.fr:
-                fr.fix_type()
+            output += add_pron(prev_word, current_phones, split_mws)
+            return output
 
-    def read_data(self, inpf):  # C901
+
+class Mix():
+    def __init__(self, filepath: str, stringfile=None, fix_type=True, header_only=False):
+        """
+        If `header_only` is set, reading stops at the first FR line, so
+        only the header fields (`filepath`, `text`, `phoneme`, `labels`)
+        are set, and `fr` is empty.
+        """
+        self.path = filepath
+        self.header_only = header_only
+        self.fr = []
+        with stage("parse"):
+            if stringfile is None:
+                with open(filepath) as inpf:
+                    self.read_data(inpf, header_only)
+                    count("bytes_read", inpf.buffer.tell())
+            else:
+                self.read_data(StringIO(stringfile), header_only)
+            if fix_type:
+                for fr in self.fr:
+                    fr.fix_type()
+        count("files")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_fr"] = None
+        state["_frame_table"] = None
+        state["_frame_table_view"] = None
+        state["_base_table"] = None
+        state["_base_arrays"] = {}
+        return state
+
+    @property
+    def fr(self):
+        """
+        The FR records, with any pending transformations applied
+        """
+        if self._pending:
+            self._apply_pending()
+        if self._fr is None:
+            self._fr = self._view.tolist()
+        return self._fr
+
+    @fr.setter
+    def fr(self, frs):
+        self._view = FRView(frs)
+        self._fr = frs
+        self._pending = []
+        self._base_table = None
+        self._base_arrays = {}
+        self._invalidate_frames()
+
+    @property
+    def view(self) -> FRView:
+        """
+        The FR records as an `FRView` over the records as read, with
+        any pending transformations applied
+        """
+        if self._pending:
+            self._apply_pending()
+        return self._view
+
+    def _apply_pending(self):
+        pending = self._pending
+        self._pending = []
+        with stage("transform"):
+            for name, kwargs in pending:
+                self._view = getattr(self, f"_{name}")(self._view, **kwargs)
+        self._fr = None
+        self._invalidate_frames()
+
+    def _transform(self, name, reset_orig=False, **kwargs):
+        """
+        Queue the transformation `_<name>`, which takes an `FRView` and
+        returns a new one, to be applied when the records are next used.
+        Before the first transformation (or with `reset_orig`), the
+        current view is kept as `orig_view`, and its records as `orig_fr`;
+        neither is copied, as transformations do not change them.
+        """
+        if reset_orig or "orig_fr" not in self.__dict__:
+            self.orig_view = self.view
+            self.orig_fr = self.orig_view.tolist()
+        self._pending.append((name, kwargs))
+        self._fr = None
+        self._invalidate_frames()
+
+    def read_data(self, inpf, header_only=False):
         """read data from text of a .mix file"""
-        saw_text = False
-        saw_phoneme = False
-        saw_labels = False
-        for line in inpf:
-            if line.startswith("Waxholm dialog."):
-                self.filepath = line[15:].strip()
-            if line.startswith("TEXT:"):
-                saw_text = True
-                continue
-            if saw_text:
-                self.text = fix_text(line.strip())
-                saw_text = False
-            if line.startswith("PHONEME:"):
-                saw_phoneme = True
-                self.phoneme = fix_text(line[8:].strip())
-                if line[8:].strip().endswith("."):
-                    saw_phoneme = False
-                continue
-            if saw_phoneme:
-                self.phoneme = fix_text(line.strip())
-                if line[8:].strip().endswith("."):
-                    saw_phoneme = False
-            if line.startswith("FR "):
-                if saw_labels:
-                    saw_labels = False
-                self.fr.append(FR(text=line))
-            if line.startswith("Labels: "):
-                self.labels = line[8:].strip()
-                saw_labels = True
-            if saw_labels and line.startswith(" "):
-                self.labels += line.strip()
+        frs = []
+        for kind, value in iter_records(inpf, header_only):
+            if kind == "fr":
+                frs.append(value)
+            else:
+                setattr(self, kind, value)
+        count("fr_lines", len(frs))
+        self.fr = self.fr + frs
+
+    def _check_frs(self, frs, verbose=False) -> bool:
+        if len(frs) == 0:
+            return False
+        start_end = frs[0].is_type("B") and frs[-1].is_type("E")
+        if verbose and not start_end:
+            if not frs[0].is_type("B"):
+                diagnose("missing-start-type", self.path, "%s: missing start type", self.path)
+            if not frs[-1].is_type("E"):
+                diagnose("missing-end-type", self.path, "%s: missing end type", self.path)
+        return start_end
 
     def check_fr(self, verbose=False) -> bool:
         """
@@ -290,29 +471,65 @@ class Mix():
         and that the first was a start type, and
         last was an end type.
         """
-        if 'fr' not in self.__dict__:
-            return False
-        if len(self.fr) == 0:
-            return False
-        start_end = self.fr[0].is_type("B") and self.fr[-1].is_type("E")
-        if verbose and not start_end:
-            if not self.fr[0].is_type("B"):
-                print(f"{self.path}: missing start type")
-            if not self.fr[-1].is_type("E"):
-                print(f"{self.path}: missing end type")
-        return start_end
+        return self._check_frs(self.fr, verbose)
+
+    def _invalidate_frames(self):
+        self._frame_table = None
+        self._frame_table_view = None
+
+    def _table_for(self, view: FRView) -> FrameTable:
+        """
+        The frame table of `view`, taken from a table built once over
+        the records as read
+        """
+        if self._base_table is None:
+            self._base_table = FrameTable(view.base)
+        if view.is_base:
+            return self._base_table
+        return self._base_table.take(view.source)
+
+    def _view_values(self, view: FRView, values):
+        """
+        The array `values(records)` (e.g., `_phone_ids`) for the records
+        of `view`, taken from an array built once over the records as
+        read; only records created by merging are looked at again
+        """
+        array = self._base_arrays.get(values)
+        if array is None:
+            array = self._base_arrays[values] = values(view.base)
+        if view.is_base:
+            return array
+        index = view.index
+        extra = index >= len(view.base)
+        if not extra.any():
+            return array[index]
+        out = array[np.where(extra, 0, index)]
+        positions = np.flatnonzero(extra)
+        out[positions] = values([view[pos] for pos in positions.tolist()])
+        return out
+
+    def _get_frame_table(self):
+        """
+        The frame table for the current records, or None if they fail
+        `check_fr`. It is built once and reused until they change.
+        """
+        view = self.view
+        if self._frame_table_view is not view:
+            self._frame_table_view = view
+            if self.check_fr(verbose=True):
+                self._frame_table = self._table_for(view)
+            else:
+                self._frame_table = None
+        return self._frame_table
 
     def get_times(self, as_frames=False):
         """
         get the times of each phoneme
         """
-        if not self.check_fr(verbose=True):
+        table = self._get_frame_table()
+        if table is None:
             return []
-        if as_frames:
-            times = [int(x.frame) for x in self.fr]
-        else:
-            times = [float(x.seconds) for x in self.fr]
-        return times
+        return table.times(as_frames).tolist()
 
     def get_time_pairs(self, as_frames=False):
         """
@@ -321,85 +538,96 @@ class Mix():
         is set, the number of frames are returned instead.
         """
         times = self.get_times(as_frames=as_frames)
-        starts = times[0:-1]
-        ends = times[1:]
-        return [x for x in zip(starts, ends)]
+        return list(zip(times[0:-1], times[1:]))
+
+    def get_time_array(self, as_frames=False):
+        """
+        As `get_time_pairs`, but as an array of shape (n, 2)
+        """
+        table = self._get_frame_table()
+        if table is None:
+            return np.empty((0, 2), dtype=np.int32 if as_frames else np.float64)
+        return table.pairs(as_frames)
+
+    def get_durations(self, as_frames=False):
+        """
+        get the duration of each segment, as an array
+        """
+        table = self._get_frame_table()
+        if table is None:
+            return np.empty(0, dtype=np.int32 if as_frames else np.float64)
+        return table.durations(as_frames)
 
     def prune_empty_presilences(self, verbose=False, include_noises=False):
         """
         Remove empty silence markers (i.e., those with no distinct duration)
         """
-        self.orig_fr = deepcopy(self.fr)
+        self._transform("prune_empty_presilences", reset_orig=True, verbose=verbose)
+
+    def _prune_empty_presilences(self, view, verbose=False):
+        frs = view.tolist()
         i = 0
-        warned = False
         def check_cur(cur, next):
             if verbose and not cur.has_seconds():
-                print(f"Missing seconds: {self.path}\nLine: {cur}")
+                diagnose("missing-seconds", self.path, "Missing seconds: %s\nLine: %s", self.path, cur)
             if verbose and not next.has_seconds():
-                print(f"Missing seconds: {self.path}\nLine: {next}")
+                diagnose("missing-seconds", self.path, "Missing seconds: %s\nLine: %s", self.path, next)
             return cur.get_seconds() == next.get_seconds() and cur.is_silence_word()
         todel = []
-        while i < len(self.fr) - 1:
-            if check_cur(self.fr[i], self.fr[i + 1]):
+        while i < len(frs) - 1:
+            if check_cur(frs[i], frs[i + 1]):
                 if verbose:
-                    if not warned:
-                        warned = True
-                        print(f"Empty silence in {self.path}:")
-                    print(self.fr[i])
+                    diagnose("empty-silence", self.path, "Empty silence in %s: %s", self.path, frs[i])
                 todel.append(i)
             i += 1
-        if todel is not None and todel != []:
-            for chaff in todel.reverse():
-                del(self.fr[chaff])
+        if todel != []:
+            return view.drop(todel)
+        return view
 
     def prune_empty_postsilences(self, verbose=False, include_noises=False):
         """
         Remove empty silence markers (i.e., those with no distinct duration)
         """
-        if not "orig_fr" in self.__dict__:
-            self.orig_fr = deepcopy(self.fr)
+        self._transform("prune_empty_postsilences", verbose=verbose)
+
+    def _prune_empty_postsilences(self, view, verbose=False):
+        frs = view.tolist()
         i = 1
-        warned = False
         def check_cur(cur, prev):
             if verbose and not cur.has_seconds():
-                print(f"Missing seconds: {self.path}\nLine: {cur}")
+                diagnose("missing-seconds", self.path, "Missing seconds: %s\nLine: %s", self.path, cur)
             if verbose and not prev.has_seconds():
-                print(f"Missing seconds: {self.path}\nLine: {prev}")
+                diagnose("missing-seconds", self.path, "Missing seconds: %s\nLine: %s", self.path, prev)
             return cur.get_seconds() == prev.get_seconds() and cur.is_silence_word()
         todel = []
-        while i < len(self.fr):
-            if check_cur(self.fr[i], self.fr[i - 1]):
+        while i < len(frs):
+            if check_cur(frs[i], frs[i - 1]):
                 if verbose:
-                    if not warned:
-                        warned = True
-                        print(f"Empty silence in {self.path}:")
-                    print(self.fr[i])
+                    diagnose("empty-silence", self.path, "Empty silence in %s: %s", self.path, frs[i])
                 todel.append(i)
             i += 1
-        if todel is not None and todel != []:
-            for chaff in todel.reverse():
-                del(self.fr[chaff])
+        if todel != []:
+            return view.drop(todel)
+        return view
 
     def prune_empty_segments(self, verbose=False):
         """
         Remove empty segments (i.e., those with no distinct duration)
         """
-        if not "orig_fr" in self.__dict__:
-            self.orig_fr = deepcopy(self.fr)
-        times = self.get_time_pairs(as_frames=True)
-        if len(times) != (len(self.fr) - 1):
-            print("Uh oh: time pairs and items don't match")
-        else:
-            keep = []
-            for fr in zip(self.fr[:-1], times):
-                cur_time = fr[1]
-                if cur_time[0] == cur_time[1]:
-                    if verbose:
-                        print(f"Empty segment {fr[0].get_phone()} ({cur_time[0]} --> {cur_time[1]})")
-                else:
-                    keep.append(fr[0])
-            keep.append(self.fr[-1])
-            self.fr = keep
+        self._transform("prune_empty_segments", verbose=verbose)
+
+    def _prune_empty_segments(self, view, verbose=False):
+        frs = view.tolist()
+        if not self._check_frs(frs, verbose=True):
+            diagnose("time-mismatch", self.path, "%s: time pairs and items don't match", self.path)
+            return view
+        table = self._table_for(view)
+        empty = table.empty_segments()
+        if verbose:
+            for i in np.flatnonzero(empty):
+                diagnose("empty-segment", self.path, "Empty segment %s (%s --> %s) in %s",
+                         frs[i].get_phone(), table.frames[i], table.frames[i + 1], self.path)
+        return view.select(np.append(~empty, True))
 
     def prune_empty_silences(self, verbose = False):
         self.prune_empty_presilences(verbose)
@@ -411,38 +639,31 @@ class Mix():
         (in Waxholm, as in TIMIT, the silence before the burst and the burst
         are annotated separately).
         """
-        if not "orig_fr" in self.__dict__:
-            self.orig_fr = deepcopy(self.fr)
-        tmp = []
-        i = 0
-        while i < len(self.fr)-1:
-            merged = merge_frs(self.fr[i], self.fr[i+1])
-            if merged is not None:
-                if verbose:
-                    print(f"Merging {self.fr[i]} and {self.fr[i+1]}")
-                i += 1
-                tmp.append(merged)
-            else:
-                tmp.append(self.fr[i])
-            i += 1
-        tmp.append(self.fr[-1])
-        self.fr = tmp
+        self._transform("merge_plosives", verbose=verbose)
+
+    def _merge_plosives(self, view, verbose=False):
+        return view.merge(merge_frs, verbose=verbose, path=self.path)
 
     def get_phone_label_tuples(self, as_frames=False, fix_accents=True):
-        times = self.get_time_pairs(as_frames=as_frames)
-        if self.check_fr():
-            labels = [fr.get_phone(fix_accents) for fr in self.fr[0:-1]]
-        else:
-            labels = []
-        if len(times) == len(labels):
-            out = []
-            for z in zip(times, labels):
-                out.append((z[0][0], z[0][1], z[1]))
-            return out
-        else:
+        table = self._get_frame_table()
+        if table is None:
             return []
+        times = table.times(as_frames).tolist()
+        labels = [fr.get_phone(fix_accents) for fr in self.fr[0:-1]]
+        return list(zip(times[0:-1], times[1:], labels))
 
-    def get_merged_plosives(self, noop=False, prune_empty=True):
+    def prune_empty_labels(self, as_frames=False, fix_accents=True):
+        """
+        As `get_phone_label_tuples`, skipping segments with no distinct
+        duration
+        """
+        labels = self.get_phone_label_tuples(as_frames, fix_accents)
+        if labels == []:
+            return labels
+        empty = self._get_frame_table().empty_segments().tolist()
+        return [label for label, is_empty in zip(labels, empty) if not is_empty]
+
+    def get_merged_plosives(self, noop=False, prune_empty=True, as_frames=False):
         """
         Returns a list of phones with plosives merged
         (in Waxholm, as in TIMIT, the silence before the burst and the burst
@@ -451,15 +672,14 @@ class Mix():
         """
         if noop:
             if not prune_empty:
-                print("Warning: not valid to set noop to True and prune_empty to false")
-                print("Ignoring prune_empty")
-            return self.prune_empty_labels()
+                diagnose("invalid-options", self.path, "Warning: not valid to set noop to True and prune_empty to false\nIgnoring prune_empty")
+            return self.prune_empty_labels(as_frames=as_frames)
         i = 0
         out = []
         if prune_empty:
-            labels = self.prune_empty_labels()
+            labels = self.prune_empty_labels(as_frames=as_frames)
         else:
-            labels = self.get_phone_label_tuples()
+            labels = self.get_phone_label_tuples(as_frames=as_frames)
         while i < len(labels)-1:
             cur = labels[i]
             next = labels[i+1]
@@ -473,8 +693,34 @@ class Mix():
                 i += 1
         return out
 
-    def get_word_label_tuples(self, verbose=True):
-        times = self.get_time_pairs()
+    def get_phone_ids(self) -> np.ndarray:
+        """
+        The phone of each segment (as in `get_phone_label_tuples`), as
+        IDs from the shared `PhoneInventory`
+        """
+        return self._view_values(self.view, _phone_ids)[:-1]
+
+    def get_merged_plosive_arrays(self, prune_empty=True, as_frames=False):
+        """
+        As `get_merged_plosives`, as an array of (start, end) times, of
+        shape (n, 2), and an array of phone IDs from the shared
+        `PhoneInventory` (see `waxholm.phones.get_inventory`)
+        """
+        table = self._get_frame_table()
+        if table is None:
+            return (np.empty((0, 2), dtype=np.int32 if as_frames else np.float64),
+                    np.empty(0, dtype=np.int32))
+        times = table.pairs(as_frames)
+        ids = self.get_phone_ids()
+        if prune_empty:
+            keep = ~table.empty_segments()
+            times = times[keep]
+            ids = ids[keep]
+        first, last = merge_indices(ids, get_inventory().bursts())
+        return np.stack((times[first, 0], times[last, 1]), axis=1), ids[last]
+
+    def get_word_label_tuples(self, verbose=True, as_frames=False):
+        times = self.get_time_pairs(as_frames=as_frames)
         if len(times) == len(self.fr[0:-1]):
             out = []
             labels_raw = [x for x in zip(times, self.fr[0:-1])]
@@ -486,14 +732,14 @@ class Mix():
                         out.append(cur)
                     if labels_raw[i+1][1].is_type("B"):
                         if verbose and labels_raw[i][1].get_word() == "":
-                            print("Expected word", labels_raw[i][1])
+                            diagnose("expected-word", self.path, "Expected word in %s: %s", self.path, labels_raw[i][1])
                         out.append((labels_raw[i][0][0], labels_raw[i][0][1], labels_raw[i][1].get_word()))
                         cur = None
                         i += 1
                         continue
                     else:
                         if verbose and labels_raw[i][1].get_word() == "":
-                            print("Expected word", labels_raw[i][1])
+                            diagnose("expected-word", self.path, "Expected word in %s: %s", self.path, labels_raw[i][1])
                         cur = (labels_raw[i][0][0], labels_raw[i][0][1], labels_raw[i][1].get_word())
                 if labels_raw[i+1][1].is_type("B"):
                     if cur is not None:
@@ -515,7 +761,7 @@ class Mix():
         prev_word = ''
 
         for fr in self.fr:
-            if 'word' in fr.__dict__:
+            if fr.has_word():
                 phone = fr.get_phone(fix_accents)
                 if prev_word != "":
                     if prev_word not in output:
@@ -541,33 +787,7 @@ class Mix():
         This version creates a list of tuples (word, phones) that
         preserves the order of the entries.
         """
-        output = []
-        current_phones = []
-        prev_word = ''
-
-        for fr in self.fr:
-            def add_pron(prev_word, current_phones, split_mws=True):
-                pron_joined = " ".join(current_phones)
-                if split_mws and "~" in pron_joined and "_" in prev_word:
-                    return split_multiwords((prev_word, pron_joined))
-                else:
-                    if "~" in pron_joined:
-                        pron_joined = pron_joined.replace("~", "")
-                    return [(prev_word, pron_joined)]
-
-            if 'word' in fr.__dict__:
-                phone = fr.get_phone(fix_accents)
-                if prev_word != "":
-                    output += add_pron(prev_word, current_phones, split_mws)
-                    current_phones.clear()
-                prev_word = fr.word
-                current_phones.append(phone)
-            elif fr.is_type("I"):
-                phone = fr.get_phone(fix_accents)
-                current_phones.append(phone)
-            else:
-                output += add_pron(prev_word, current_phones, split_mws)
-                return output
+        return dictionary_list(self.fr, fix_accents, split_mws)
 
     def get_phoneme_string(self, insert_pauses=True, fix_accents=True):
         """
@@ -592,33 +812,41 @@ class Mix():
     def get_phoneme_list(self, insert_pauses=True, fix_accents=True):
         return self.get_phoneme_string(insert_pauses, fix_accents).split(' ')
 
+    def encode_phone_labels(self, vocab: Vocabulary, merge_plosives=True, as_frames=False, add=False):
+        """
+        The phone labels, as from `get_merged_plosives` (or, if
+        `merge_plosives` is False, `prune_empty_labels`), as an array
+        of (start, end) times and an array of IDs from `vocab`.
+        If `add` is set, unknown phones are added to `vocab`.
+        """
+        if merge_plosives:
+            times, ids = self.get_merged_plosive_arrays(as_frames=as_frames)
+            return times, vocab.encode(get_inventory().decode(ids.tolist()), add=add)
+        labels = self.prune_empty_labels(as_frames=as_frames)
+        return encode_labels(labels, vocab, add=add, as_frames=as_frames)
+
+    def encode_words(self, vocab: Vocabulary, add=False, split_mws=True):
+        """
+        The words of `get_dictionary_list`, as an array of IDs from `vocab`
+        """
+        entries = self.get_dictionary_list(split_mws=split_mws) or []
+        return vocab.encode([entry[0] for entry in entries], add=add)
+
+    def encode_phonemes(self, vocab: Vocabulary, insert_pauses=True, fix_accents=True, add=False):
+        """
+        The output of `get_phoneme_list`, as an array of IDs from `vocab`
+        """
+        return vocab.encode(self.get_phoneme_list(insert_pauses, fix_accents), add=add)
+
     def get_compare_dictionary(self, fix_accents=True, merge_plosives=True, only_changed=True):
         """
         Get pronunciation dictionary for comparision: i.e., where there is a difference
-        between the canonical pronunciation and what was spoken
+        between the canonical pronunciation and what was spoken.
+        Returns (word, canonical, spoken) tuples; the Mix is not changed.
         """
+        view = self.view
         if merge_plosives:
-            self.merge_plosives()
-        orig = self.get_dictionary_list(fix_accents)
-        self.prune_empty_segments()
-        new = self.get_dictionary_list(fix_accents)
-        if len(orig) != len(new):
-            words_orig = [w[0] for w in orig]
-            words_new = [w[0] for w in new]
-            skippables = []
-            for tag, i, j, _, _ in SequenceMatcher(None, words_orig, words_new).get_opcodes():
-                if tag in ('delete', 'replace'):
-                    skippables += [a for a in range(i, j)]
-            for c in skippables.reverse():
-                del(orig[c])
-        out = []
-        i = 0
-        while i < len(orig):
-            if orig[i][0] == new[i][0]:
-                if orig[i][1] == new[i][1]:
-                    if not only_changed:
-                        out.append(orig)
-                else:
-                    out.append((orig[i][0], orig[i][1], new[i][1]))
-            i += 1
-        return out
+            view = self._merge_plosives(view)
+        orig = dictionary_list(view.tolist(), fix_accents) or []
+        new = dictionary_list(self._prune_empty_segments(view).tolist(), fix_accents) or []
+        return compare_pronunciations(orig, new, only_changed)
@@ -0,0 +1,276 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from functools import lru_cache
+from typing import List, Optional
+import numpy as np
+
+
+ACCENTS = "ˈ`ˌ"
+PUNCTUATION = [".", ","]
+
+# Plosive closure -> burst; in Waxholm, as in TIMIT, the two are
+# annotated as separate segments
+SILS = {
+    "K": "k",
+    "G": "g",
+    "T": "t",
+    "D": "d",
+    "2T": "2t",
+    "2D": "2d",
+    "P": "p",
+    "B": "b"
+}
+
+
+IPA_MAPPING = {
+    "2D": "ɖ",
+    "2L": "ɭ",
+    "2N": "ɳ",
+    "2S": "ʂ",
+    "2T": "ʈ",
+    "A": "a",
+    "A:": "ɑː",
+    "B": "b",
+    "D": "d",
+    "E": "e",
+    "E0": "ə",
+    "E:": "eː",
+    "F": "f",
+    "G": "ɡ",
+    "H": "h",
+    "I": "ɪ",
+    "I:": "iː",
+    "J": "j",
+    "K": "k",
+    "L": "l",
+    "M": "m",
+    "N": "n",
+    "NG": "ŋ",
+    "O": "ʊ",
+    "O:": "uː",
+    "P": "p",
+    "R": "r",
+    "S": "s",
+    "SJ": "ɧ",
+    "T": "t",
+    "TJ": "ɕ",
+    "U": "ɵ",
+    "U:": "ʉː",
+    "V": "v",
+    "Y": "ʏ",
+    "Y:": "yː",
+    "Ä": "ɛ",
+    "Ä3": "æː",
+    "Ä4": "æ",
+    "Ä:": "ɛː",
+    "Ö": "œ",
+    "Ö3": "œ̞ː",
+    "Ö4": "œ̞",
+    "Ö:": "øː",
+    "Å": "ɔ",
+    "Å:": "oː"
+}
+
+
+class PhoneInventory:
+    """
+    Interns phone strings (as they appear in pronunciations, accents
+    included) to integer IDs, so that pronunciations can be handled as
+    arrays. IDs are assigned in the order phones are first seen.
+    """
+    def __init__(self, phones=None):
+        self.phones = []
+        self.ids = {}
+        self._bursts = np.empty(0, dtype=np.int64)
+        if phones is not None:
+            for phone in phones:
+                self.intern(phone)
+
+    def __len__(self):
+        return len(self.phones)
+
+    def __contains__(self, phone):
+        return phone in self.ids
+
+    def intern(self, phone: str) -> int:
+        phone_id = self.ids.get(phone)
+        if phone_id is None:
+            phone_id = len(self.phones)
+            self.ids[phone] = phone_id
+            self.phones.append(phone)
+        return phone_id
+
+    def encode(self, phone_list: List[str]) -> np.ndarray:
+        try:
+            return np.fromiter(map(self.ids.__getitem__, phone_list),
+                               dtype=np.int32, count=len(phone_list))
+        except KeyError:
+            return np.fromiter((self.intern(phone) for phone in phone_list),
+                               dtype=np.int32, count=len(phone_list))
+
+    def decode(self, ids) -> List[str]:
+        return [self.phones[phone_id] for phone_id in ids]
+
+    def bursts(self) -> np.ndarray:
+        """
+        `burst_lookup` for the phones of the inventory
+        """
+        if len(self._bursts) != len(self.phones):
+            self._bursts = burst_lookup(self.ids, len(self.phones))
+        return self._bursts
+
+
+def burst_lookup(symbol_ids, size) -> np.ndarray:
+    """
+    For each of `size` IDs, the ID of the burst that merges with it,
+    if it is a plosive closure (see `SILS`), otherwise -1; `symbol_ids`
+    maps symbols to IDs (as `PhoneInventory.ids` or `Vocabulary.ids`)
+    """
+    bursts = np.full(size, -1, dtype=np.int64)
+    for closure, burst in SILS.items():
+        if closure in symbol_ids:
+            bursts[symbol_ids[closure]] = symbol_ids.get(burst, -1)
+    return bursts
+
+
+def merge_indices(ids, bursts, offsets=None):
+    """
+    Merge each closure in `ids` with the burst after it, as
+    `Mix.get_merged_plosives` does, given `bursts` from `burst_lookup`.
+    Returns the positions of the `first` and `last` segment of each
+    merged segment (the same, if it is not a pair), which runs from the
+    start of `first` to the end of `last`, with the phone of `last`.
+
+    `offsets` (by default, `[0, len(ids)]`) splits `ids` into
+    utterances, each merged separately; as in `get_merged_plosives`,
+    the last segment of each is only kept as part of a pair.
+    Closures and bursts are distinct phones, so pairs never overlap.
+    """
+    ids = np.asarray(ids)
+    count = len(ids)
+    offsets = np.asarray(offsets if offsets is not None else [0, count], dtype=np.int64)
+    # the last segment of each (non-empty) utterance
+    ends = offsets[1:][offsets[1:] > offsets[:-1]] - 1
+    pairs = np.zeros(count, dtype=bool)
+    if count > 1:
+        pairs[:-1] = bursts[ids[:-1]] == ids[1:]
+    pairs[ends] = False
+    keep = np.ones(count, dtype=bool)
+    keep[1:] = ~pairs[:-1]
+    keep[ends] = False
+    first = np.flatnonzero(keep)
+    return first, first + pairs[first]
+
+
+class PhoneMapper:
+    """
+    Maps phones to a target alphabet (by default, IPA) as `map_to_ipa`
+    does: an accent marker is kept in front of the mapped phone, "." and
+    "," are kept as-is, empty phones are dropped, and other phones are
+    dropped or, if `non_speech` is set, output as `<phone>`.
+
+    Each phone of the inventory is mapped once, into a lookup table
+    indexed by phone ID; mapped pronunciation strings are memoized.
+    """
+    def __init__(self, inventory=None, mapping=None, non_speech=False, cache_size=65536):
+        self.inventory = inventory if inventory is not None else PhoneInventory()
+        self.mapping = mapping if mapping is not None else IPA_MAPPING
+        self.non_speech = non_speech
+        self._targets = np.empty(0, dtype=object)
+        self._keep = np.empty(0, dtype=bool)
+        self.map_pronunciation = lru_cache(maxsize=cache_size)(self._map_pronunciation)
+
+    def target(self, phone: str) -> Optional[str]:
+        """
+        The output for a single phone, or None if it is dropped
+        """
+        if len(phone) < 1:
+            return None
+        accent = ""
+        if phone[0] in ACCENTS:
+            accent = phone[0]
+            phone = phone[1:]
+        if phone in self.mapping:
+            return accent + self.mapping[phone]
+        elif phone in PUNCTUATION:
+            return phone
+        elif self.non_speech:
+            return f"<{phone}>"
+        return None
+
+    def _update_table(self):
+        known = len(self._targets)
+        if known == len(self.inventory):
+            return
+        new = [self.target(phone) for phone in self.inventory.phones[known:]]
+        added = np.empty(len(new), dtype=object)
+        added[:] = new
+        self._targets = np.concatenate((self._targets, added))
+        self._keep = np.concatenate((self._keep, np.array([x is not None for x in new], dtype=bool)))
+
+    def map_ids(self, ids) -> List[str]:
+        """
+        Map an array of phone IDs from `inventory`
+        """
+        self._update_table()
+        ids = np.asarray(ids, dtype=np.int32)
+        return self._targets[ids[self._keep[ids]]].tolist()
+
+    def map(self, phone_list: List[str]) -> List[str]:
+        return self.map_ids(self.inventory.encode(phone_list))
+
+    def _map_pronunciation(self, pron: str) -> tuple:
+        return tuple(self.map(pron.split(" ")))
+
+    def map_many(self, phone_lists) -> List[List[str]]:
+        """
+        Map a whole utterance or lexicon (a list of phone lists) at once,
+        with a single lookup over the concatenated IDs
+        """
+        phone_lists = list(phone_lists)
+        lengths = np.fromiter((len(phones) for phones in phone_lists),
+                              dtype=np.int64, count=len(phone_lists))
+        intern = self.inventory.intern
+        ids = np.fromiter((intern(phone) for phones in phone_lists for phone in phones),
+                          dtype=np.int32, count=int(lengths.sum()))
+        self._update_table()
+        keep = self._keep[ids]
+        targets = self._targets[ids[keep]].tolist()
+        # number of phones kept from each list, from the running count
+        kept = np.concatenate(([0], np.cumsum(keep)))
+        ends = kept[np.cumsum(lengths)].tolist()
+        starts = [0] + ends[:-1]
+        return [targets[start:end] for start, end in zip(starts, ends)]
+
+
+_INVENTORY = PhoneInventory()
+
+
+def get_inventory() -> PhoneInventory:
+    """
+    The shared `PhoneInventory`
+    """
+    return _INVENTORY
+
+
+_MAPPERS = {}
+
+
+def get_mapper(non_speech=False) -> PhoneMapper:
+    """
+    The shared IPA `PhoneMapper` for `non_speech`
+    """
+    if non_speech not in _MAPPERS:
+        _MAPPERS[non_speech] = PhoneMapper(non_speech=non_speech)
+    return _MAPPERS[non_speech]
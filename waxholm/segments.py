@@ -0,0 +1,122 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import namedtuple
+from pathlib import Path
+import numpy as np
+from .audio import SMPFile, write_wav
+from .mix import Mix
+
+
+Segment = namedtuple('Segment', ['label', 'start', 'end', 'samples'])
+
+
+def smp_path(mixpath) -> str:
+    """
+    The .smp file that a .mix file annotates
+    """
+    mixpath = str(mixpath)
+    if mixpath.endswith(".mix"):
+        return mixpath[:-4]
+    return mixpath
+
+
+def get_frame_labels(mix: Mix, level="word", merge_plosives=True):
+    """
+    (start, end, label) tuples for `level` ("word" or "phone"),
+    with start and end in frames (i.e., sample offsets)
+    """
+    if level == "word":
+        labels = [x for x in mix.get_word_label_tuples(verbose=False, as_frames=True) if x is not None]
+    elif level == "phone":
+        if merge_plosives:
+            labels = mix.get_merged_plosives(as_frames=True)
+        else:
+            labels = mix.prune_empty_labels(as_frames=True)
+    else:
+        raise ValueError(f"Unknown segment level: {level}")
+    return labels
+
+
+def iter_segments(mix: Mix, smp=None, level="word", merge_plosives=True):
+    """
+    Yield a `Segment` (label, start, end, samples) for each word or
+    phone of `mix`. Only the samples within each segment are read from
+    the audio, which is `smp` (an `SMPFile` or a path), or, by default,
+    the .smp file next to the .mix file.
+    """
+    if smp is None:
+        smp = smp_path(mix.path)
+    if not isinstance(smp, SMPFile):
+        smp = SMPFile(smp)
+    for start, end, label in get_frame_labels(mix, level, merge_plosives):
+        end = min(end, len(smp))
+        if end <= start:
+            continue
+        yield Segment(label, start, end, smp.read(start, end))
+
+
+def _utterance_id(mix: Mix) -> str:
+    name = Path(str(mix.path)).name
+    for suffix in [".mix", ".smp"]:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name
+
+
+def export_segments(mixes, outdir, level="word", fmt="wav", shard_size=10000, merge_plosives=True):
+    """
+    Write the segments of each of `mixes` to `outdir`, along with an
+    index (`segments.tsv`) of utterance, label, start and end frames.
+
+    With `fmt="wav"`, each segment is written to its own file.
+    With `fmt="npy"`, the samples of up to `shard_size` segments are
+    concatenated into each `shard-NNNNN.npy` file, and the index also
+    gives the shard, offset and length of each segment.
+    """
+    if fmt not in ["wav", "npy"]:
+        raise ValueError(f"Unknown segment format: {fmt}")
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    shard = []
+    shard_num = 0
+    offset = 0
+
+    def write_shard():
+        np.save(outdir / f"shard-{shard_num:05d}.npy", np.concatenate(shard))
+
+    with open(outdir / "segments.tsv", "w") as index:
+        if fmt == "wav":
+            index.write("file\tutterance\tlabel\tstart\tend\n")
+        else:
+            index.write("shard\toffset\tlength\tutterance\tlabel\tstart\tend\n")
+        for mix in mixes:
+            utt = _utterance_id(mix)
+            for i, segment in enumerate(iter_segments(mix, level=level, merge_plosives=merge_plosives)):
+                fields = f"{utt}\t{segment.label}\t{segment.start}\t{segment.end}\n"
+                if fmt == "wav":
+                    filename = f"{utt}_{i:04d}.wav"
+                    nchans = 1 if segment.samples.ndim == 1 else segment.samples.shape[1]
+                    write_wav(str(outdir / filename), segment.samples, nchans=nchans)
+                    index.write(f"{filename}\t{fields}")
+                else:
+                    index.write(f"{shard_num}\t{offset}\t{len(segment.samples)}\t{fields}")
+                    shard.append(segment.samples)
+                    offset += len(segment.samples)
+                    if len(shard) >= shard_size:
+                        write_shard()
+                        shard = []
+                        shard_num += 1
+                        offset = 0
+    if shard != []:
+        write_shard()
@@ -0,0 +1,244 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import Counter
+from functools import partial
+import json
+import os
+from .convert import map_mixes
+from .corpus import split_stem
+
+
+STATS_VERSION = 1
+
+
+class DurationSummary:
+    """
+    Running count, total, sum of squares, minimum and maximum of a set
+    of durations (in frames), which can be merged with another summary
+    """
+    __slots__ = ("count", "total", "sumsq", "min", "max")
+
+    def __init__(self, count=0, total=0, sumsq=0, min=None, max=None):
+        self.count = count
+        self.total = total
+        self.sumsq = sumsq
+        self.min = min
+        self.max = max
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.sumsq += duration * duration
+        if self.min is None or duration < self.min:
+            self.min = duration
+        if self.max is None or duration > self.max:
+            self.max = duration
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.sumsq += other.sumsq
+        for value in (other.min, other.max):
+            if value is None:
+                continue
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def mean(self):
+        if self.count == 0:
+            return None
+        return self.total / self.count
+
+    def variance(self):
+        if self.count == 0:
+            return None
+        mean = self.total / self.count
+        return max(self.sumsq / self.count - mean * mean, 0.0)
+
+    def to_list(self):
+        return [self.count, self.total, self.sumsq, self.min, self.max]
+
+    @classmethod
+    def from_list(cls, values):
+        return cls(*values)
+
+
+class SpeakerStats:
+    """
+    Per-speaker counts of files, words and phones
+    """
+    def __init__(self):
+        self.files = 0
+        self.words = Counter()
+        self.phones = Counter()
+
+    def merge(self, other):
+        self.files += other.files
+        self.words.update(other.words)
+        self.phones.update(other.phones)
+
+    def to_dict(self):
+        return {"files": self.files, "words": dict(self.words), "phones": dict(self.phones)}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.files = data["files"]
+        stats.words = Counter(data["words"])
+        stats.phones = Counter(data["phones"])
+        return stats
+
+
+class CorpusStats:
+    """
+    Counts collected from each .mix file in one pass:
+
+    * `pronunciations`: word -> Counter of pronunciations, from
+      `Mix.get_dictionary_list`
+    * `phones` and `bigrams`: phone unigram and bigram counts over those
+      pronunciations, in utterance order
+    * `durations`: phone -> `DurationSummary` of the phone segments (in
+      frames), from `Mix.get_merged_plosives`
+    * `speakers`: speaker -> `SpeakerStats`
+
+    Stats from different files or processes can be combined with
+    `merge`, and saved to or loaded from JSON.
+    """
+    def __init__(self, merge_plosives=True):
+        self.merge_plosives = merge_plosives
+        self.files = 0
+        self.pronunciations = {}
+        self.phones = Counter()
+        self.bigrams = Counter()
+        self.durations = {}
+        self.speakers = {}
+
+    def _speaker(self, speaker) -> SpeakerStats:
+        if speaker not in self.speakers:
+            self.speakers[speaker] = SpeakerStats()
+        return self.speakers[speaker]
+
+    def add_mix(self, mix, speaker=None):
+        if speaker is None:
+            speaker, _, _ = split_stem(str(mix.path))
+        spkr = self._speaker(speaker)
+        self.files += 1
+        spkr.files += 1
+
+        phones = []
+        for word, pron in mix.get_dictionary_list() or []:
+            if word not in self.pronunciations:
+                self.pronunciations[word] = Counter()
+            self.pronunciations[word][pron] += 1
+            spkr.words[word] += 1
+            phones += [phone for phone in pron.split(" ") if phone != ""]
+        self.phones.update(phones)
+        spkr.phones.update(phones)
+        self.bigrams.update(zip(phones[:-1], phones[1:]))
+
+        if self.merge_plosives:
+            labels = mix.get_merged_plosives(as_frames=True)
+        else:
+            labels = mix.prune_empty_labels(as_frames=True)
+        for start, end, phone in labels:
+            if phone not in self.durations:
+                self.durations[phone] = DurationSummary()
+            self.durations[phone].add(end - start)
+
+    def merge(self, other):
+        """
+        Add the counts of `other` to these; both must have been
+        collected with the same `merge_plosives`, as the phones of
+        their durations differ
+        """
+        if other.merge_plosives != self.merge_plosives:
+            raise ValueError(f"Cannot merge stats collected with merge_plosives={other.merge_plosives} "
+                             f"into stats with merge_plosives={self.merge_plosives}")
+        self.files += other.files
+        for word, prons in other.pronunciations.items():
+            if word not in self.pronunciations:
+                self.pronunciations[word] = Counter()
+            self.pronunciations[word].update(prons)
+        self.phones.update(other.phones)
+        self.bigrams.update(other.bigrams)
+        for phone, summary in other.durations.items():
+            if phone not in self.durations:
+                self.durations[phone] = DurationSummary()
+            self.durations[phone].merge(summary)
+        for speaker, stats in other.speakers.items():
+            self._speaker(speaker).merge(stats)
+        return self
+
+    def variants(self, word) -> Counter:
+        return self.pronunciations.get(word, Counter())
+
+    def to_dict(self):
+        return {
+            "version": STATS_VERSION,
+            "merge_plosives": self.merge_plosives,
+            "files": self.files,
+            "pronunciations": {word: dict(prons) for word, prons in self.pronunciations.items()},
+            "phones": dict(self.phones),
+            "bigrams": [[a, b, count] for (a, b), count in self.bigrams.items()],
+            "durations": {phone: summary.to_list() for phone, summary in self.durations.items()},
+            "speakers": {speaker: stats.to_dict() for speaker, stats in self.speakers.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != STATS_VERSION:
+            raise ValueError(f"Unsupported stats version: {data.get('version')}")
+        stats = cls(merge_plosives=data["merge_plosives"])
+        stats.files = data["files"]
+        stats.pronunciations = {word: Counter(prons) for word, prons in data["pronunciations"].items()}
+        stats.phones = Counter(data["phones"])
+        stats.bigrams = Counter({(a, b): count for a, b, count in data["bigrams"]})
+        stats.durations = {phone: DurationSummary.from_list(values) for phone, values in data["durations"].items()}
+        stats.speakers = {speaker: SpeakerStats.from_dict(values) for speaker, values in data["speakers"].items()}
+        return stats
+
+    def save(self, filename):
+        tmp_path = f"{filename}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as outf:
+            json.dump(self.to_dict(), outf, ensure_ascii=False)
+        os.replace(tmp_path, filename)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, encoding="utf-8") as inpf:
+            return cls.from_dict(json.load(inpf))
+
+
+def mix_stats(mix, merge_plosives=True) -> CorpusStats:
+    """
+    The stats of a single Mix (picklable, for use with `map_mixes`)
+    """
+    stats = CorpusStats(merge_plosives=merge_plosives)
+    stats.add_mix(mix)
+    return stats
+
+
+def collect_stats(paths, jobs=1, cache=None, merge_plosives=True, io_concurrency=0) -> CorpusStats:
+    """
+    Collect `CorpusStats` over the .mix files in `paths`, using `jobs`
+    worker processes, each of which returns the stats of one file to
+    be merged here; `io_concurrency` is passed to `map_mixes`
+    """
+    stats = CorpusStats(merge_plosives=merge_plosives)
+    worker = partial(mix_stats, merge_plosives=merge_plosives)
+    for file_stats in map_mixes(worker, paths, jobs=jobs, cache=cache, io_concurrency=io_concurrency):
+        stats.merge(file_stats)
+    return stats
@@ -0,0 +1,67 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import time
+from waxholm import aio
+from waxholm.aio import amap_mixes, iter_mixes
+from waxholm.cache import MixCache
+from waxholm.convert import map_mixes
+from waxholm.instrument import collect
+from waxholm.tests.test_convert import make_files, path_and_text
+
+
+def test_map_mixes_io_concurrency(tmp_path):
+    paths = make_files(tmp_path, 7)
+    serial = list(map_mixes(path_and_text, paths))
+    assert list(map_mixes(path_and_text, paths, io_concurrency=3)) == serial
+    assert list(map_mixes(path_and_text, paths, jobs=2, io_concurrency=3)) == serial
+
+
+def test_amap_mixes(tmp_path):
+    paths = make_files(tmp_path, 5)
+
+    async def gather():
+        return [result async for result in amap_mixes(path_and_text, paths, concurrency=2)]
+
+    assert asyncio.run(gather()) == list(map_mixes(path_and_text, paths))
+
+
+def test_amap_mixes_calls_in_order(tmp_path, monkeypatch):
+    paths = make_files(tmp_path, 6)
+    read = aio._read
+
+    def slow_read(path, cache=None):
+        # earlier files take longer, so reads finish in reverse order
+        time.sleep(0.02 * (len(paths) - paths.index(path)))
+        return read(path, cache)
+
+    monkeypatch.setattr(aio, "_read", slow_read)
+    called = []
+    results = list(aio.map_mixes_async(lambda mix: called.append(mix.path) or mix.path, paths, concurrency=6))
+    assert called == results == paths
+
+
+def test_iter_mixes_cache(tmp_path):
+    paths = make_files(tmp_path, 4)
+    cache = MixCache(tmp_path / "cache")
+    size = sum((tmp_path / path).stat().st_size for path in paths)
+    with collect() as inst:
+        first = [mix.text for mix in iter_mixes(paths, concurrency=2, cache=cache)]
+    assert inst.counters["bytes_read"] == size
+    with collect() as inst:
+        second = [mix.text for mix in iter_mixes(paths, concurrency=2, cache=cache)]
+    assert [mix.path for mix in iter_mixes(paths, concurrency=2, cache=cache)] == paths
+    assert "bytes_read" not in inst.counters
+    assert first == second
+    assert second[2] == "jag 2 vill åka 17 och 45 ."
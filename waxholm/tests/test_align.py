@@ -0,0 +1,59 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from waxholm import Mix
+from waxholm.align import align_sequences, compare_pronunciations, pronunciation_variants
+from .test_mix import SAMPLE1, SAMPLE_CLOSURE
+
+
+def test_align_sequences():
+    words = "jag vill åka 17 och 45".split()
+    assert align_sequences(words, words) == [(i, i) for i in range(6)]
+    pruned = "jag åka 17 och 45".split()
+    assert align_sequences(words, pruned) == [(0, 0), (2, 1), (3, 2), (4, 3), (5, 4)]
+    inserted = "jag vill nu åka 17 och 45".split()
+    assert align_sequences(words, inserted) == [(0, 0), (1, 1), (2, 3), (3, 4), (4, 5), (5, 6)]
+    assert align_sequences(["a", "b"], ["c"]) == []
+
+
+def test_compare_pronunciations():
+    orig = [("jag", "J A: G"), ("vill", "V I L"), ("åka", "O: K A")]
+    new = [("jag", "J A:"), ("åka", "O: K A")]
+    assert compare_pronunciations(orig, new) == [("jag", "J A: G", "J A:")]
+    assert compare_pronunciations(orig, new, only_changed=False)[1] == ("åka", "O: K A", "O: K A")
+
+
+def test_get_compare_dictionary_does_not_change_mix():
+    mix = Mix(filepath="", stringfile=SAMPLE1)
+    records = mix.fr
+    mix.get_compare_dictionary()
+    assert mix.fr is records
+    assert "orig_fr" not in mix.__dict__
+
+
+def test_get_compare_dictionary_repeated():
+    mix = Mix(filepath="", stringfile=SAMPLE_CLOSURE)
+    records = mix.fr
+    extra = len(mix.view.extra)
+    first = mix.get_compare_dictionary(only_changed=False)
+    for _ in range(2):
+        assert mix.get_compare_dictionary(only_changed=False) == first
+    assert ("kan", "k", "k") in first
+    assert len(mix.view.extra) == extra
+    assert mix.fr is records
+
+
+def test_pronunciation_variants():
+    mixes = [Mix(filepath="", stringfile=SAMPLE1) for _ in range(3)]
+    variants = pronunciation_variants(mixes)
+    assert variants["jag"][("J ˈA: g", "J ˈA:")] == 3
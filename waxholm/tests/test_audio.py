@@ -0,0 +1,68 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import wave
+import numpy as np
+from waxholm.audio import SMPFile, smp_headers, smp_read_sf, smp_to_wav, smp_to_wav_batch
+
+
+def write_smp(path, samples, msb="last"):
+    header = f"file=samp\r\nmsb={msb}\r\nnchans=1\r\n=\r\n".encode("ascii")
+    dtype = "<i2" if msb == "last" else ">i2"
+    with open(path, "wb") as outf:
+        outf.write(header.ljust(1024, b"\x00"))
+        outf.write(np.asarray(samples, dtype=dtype).tobytes())
+
+
+def test_smp_headers(tmp_path):
+    smpfile = tmp_path / "fp2060.1.05.smp"
+    write_smp(smpfile, [0, 1, 2])
+    assert smp_headers(smpfile) == {"file": "samp", "msb": "last", "nchans": "1"}
+
+
+def test_smpfile_matches_soundfile(tmp_path):
+    samples = np.arange(-500, 500, dtype=np.int16) * 7
+    for msb in ["last", "first"]:
+        smpfile = str(tmp_path / f"{msb}.smp")
+        write_smp(smpfile, samples, msb)
+        smp = SMPFile(smpfile)
+        assert len(smp) == 1000
+        assert np.array_equal(smp.read(), smp_read_sf(smpfile)[0])
+        assert np.array_equal(smp.read(100, 200), samples[100:200])
+        assert smp.read().dtype == np.int16
+
+
+def test_smp_to_wav(tmp_path):
+    samples = np.arange(-5000, 5000, dtype=np.int16) * 3
+    for msb in ["last", "first"]:
+        smpfile = str(tmp_path / f"{msb}.smp")
+        wavfile = str(tmp_path / f"{msb}.wav")
+        write_smp(smpfile, samples, msb)
+        smp_to_wav(smpfile, wavfile, block_size=1000)
+        with wave.open(wavfile) as wav:
+            assert wav.getnframes() == len(samples)
+            frames = np.frombuffer(wav.readframes(len(samples)), dtype="<i2")
+        assert np.array_equal(frames, samples)
+
+
+def test_smp_to_wav_batch(tmp_path):
+    pairs = []
+    for i in range(3):
+        smpfile = str(tmp_path / f"{i}.smp")
+        write_smp(smpfile, np.full(100 + i, i, dtype=np.int16), "first")
+        pairs.append((smpfile, str(tmp_path / f"{i}.wav")))
+    smp_to_wav_batch(pairs, block_size=64)
+    for i, (_, wavfile) in enumerate(pairs):
+        with wave.open(wavfile) as wav:
+            assert wav.getnframes() == 100 + i
+            assert set(np.frombuffer(wav.readframes(200), dtype="<i2")) == {i}
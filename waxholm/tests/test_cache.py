@@ -0,0 +1,95 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+from waxholm.cache import MixCache
+from waxholm.tests.test_mix import SAMPLE1
+
+
+def test_cache_roundtrip(tmp_path):
+    mixfile = tmp_path / "fp2060.1.05.smp.mix"
+    mixfile.write_text(SAMPLE1)
+    cache = MixCache(tmp_path / "cache")
+    assert cache.get(mixfile) is None
+    mix = cache.load(mixfile)
+    cached = cache.get(mixfile)
+    assert cached is not None
+    assert cached.text == mix.text
+    assert cached.get_time_pairs() == mix.get_time_pairs()
+    assert cached.fr[0].word == "jag"
+
+
+def test_cache_path_of_hit(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    mixfile = tmp_path / "data" / "fp2060.1.05.smp.mix"
+    mixfile.write_text(SAMPLE1)
+    cache = MixCache(tmp_path / "cache")
+    monkeypatch.chdir(tmp_path)
+    cache.load("data/fp2060.1.05.smp.mix")
+    monkeypatch.chdir(tmp_path / "cache")
+    assert cache.get(str(mixfile)).path == str(mixfile)
+    assert cache.load(mixfile).path == mixfile
+
+
+def test_cache_invalidated(tmp_path):
+    mixfile = tmp_path / "fp2060.1.05.smp.mix"
+    mixfile.write_text(SAMPLE1)
+    cache = MixCache(tmp_path / "cache")
+    cache.load(mixfile)
+    mixfile.write_text(SAMPLE1.replace("jag vill }ka", "jag ska }ka"))
+    os.utime(mixfile, (0, 0))
+    assert cache.get(mixfile) is None
+    assert cache.load(mixfile).text == "jag ska åka 17 och 45 ."
+
+
+def test_cache_eviction(tmp_path):
+    cache = MixCache(tmp_path / "cache")
+    for i in range(3):
+        mixfile = tmp_path / f"fp2060.1.0{i}.smp.mix"
+        mixfile.write_text(SAMPLE1)
+        cache.load(mixfile)
+    entry_size = next((tmp_path / "cache").glob("*.pickle")).stat().st_size
+    cache.max_size = entry_size * 3
+    cache.evict()
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) == 3
+    cache.max_size = entry_size * 2
+    cache.evict()
+    # evicted down to the low-water mark, not just under max_size
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) == 1
+
+
+def test_cache_eviction_amortised(tmp_path):
+    cache = MixCache(tmp_path / "cache")
+    mixfile = tmp_path / "fp2060.1.00.smp.mix"
+    mixfile.write_text(SAMPLE1)
+    cache.load(mixfile)
+    cache.max_size = next((tmp_path / "cache").glob("*.pickle")).stat().st_size * 20
+    scans = []
+    entries = cache._entries
+    cache._entries = lambda: scans.append(1) or entries()
+    for i in range(1, 41):
+        mixfile = tmp_path / f"fp2060.1.{i:02d}.smp.mix"
+        mixfile.write_text(SAMPLE1)
+        cache.load(mixfile)
+    assert len(scans) < 10
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) <= 20
+
+
+def test_cache_stale_entry(tmp_path):
+    mixfile = tmp_path / "fp2060.1.05.smp.mix"
+    mixfile.write_text(SAMPLE1)
+    cache = MixCache(tmp_path / "cache")
+    # a pickle of a class from a module that no longer exists
+    cache._entry_path(os.path.abspath(mixfile)).write_bytes(b"cwaxholm.no_such_module\nMix\n.")
+    assert cache.get(mixfile) is None
+    assert cache.load(mixfile).text == "jag vill åka 17 och 45 ."
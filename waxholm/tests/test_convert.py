@@ -0,0 +1,37 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from waxholm.convert import map_mixes
+from waxholm.tests.test_mix import SAMPLE1
+
+
+def path_and_text(mix):
+    return str(mix.path), mix.text
+
+
+def make_files(root, count):
+    paths = []
+    for i in range(count):
+        path = root / f"fp2060.1.{i:02d}.smp.mix"
+        path.write_text(SAMPLE1.replace("jag vill", f"jag {i} vill"))
+        paths.append(str(path))
+    return paths
+
+
+def test_map_mixes_in_order(tmp_path):
+    paths = make_files(tmp_path, 5)
+    serial = list(map_mixes(path_and_text, paths))
+    assert [x[0] for x in serial] == paths
+    assert serial[3][1] == "jag 3 vill åka 17 och 45 ."
+    parallel = list(map_mixes(path_and_text, paths, jobs=2, chunksize=1))
+    assert parallel == serial
@@ -0,0 +1,122 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import argparse
+import os
+import pytest
+from waxholm import Corpus
+from waxholm.convert import map_corpus
+from waxholm.corpus import add_index_arguments, index_entry, split_stem
+from waxholm.instrument import collect
+from waxholm.tests.test_convert import path_and_text
+from waxholm.tests.test_mix import SAMPLE1
+
+
+def make_corpus(root):
+    for name in ["fp2060/fp2060.1.05.smp.mix", "fp2060/fp2060.2.01.smp.mix", "fp2001/fp2001.1.03.smp.mix"]:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(SAMPLE1)
+
+
+def test_split_stem():
+    assert split_stem("/u/wax/data/scenes/fp2060/fp2060.1.05.smp.mix") == ("fp2060", "1", "05")
+
+
+def test_corpus_index(tmp_path):
+    make_corpus(tmp_path)
+    corpus = Corpus(tmp_path)
+    assert len(corpus) == 3
+    assert (tmp_path / "waxholm-index.json").exists()
+    entry = corpus.entries[0]
+    assert entry.path == "fp2001/fp2001.1.03.smp.mix"
+    assert entry.fr_count == 31
+    assert entry.text == "jag vill åka 17 och 45 ."
+    assert corpus.speakers() == ["fp2001", "fp2060"]
+
+
+def test_index_entry_without_frs(tmp_path):
+    path = tmp_path / "fp2060.1.05.smp.mix"
+    path.write_text(SAMPLE1[:SAMPLE1.index("FR ")])
+    entry = index_entry(tmp_path, path)
+    assert (entry.fr_count, entry.text) == (0, "jag vill åka 17 och 45 .")
+    assert entry.size == path.stat().st_size
+
+
+def test_corpus_index_write_failure(tmp_path, capsys):
+    make_corpus(tmp_path)
+    with collect() as inst:
+        corpus = Corpus(tmp_path, index_path=tmp_path / "missing" / "index.json")
+    assert len(corpus) == 3
+    assert inst.report()["issues"]["index-write"]["count"] == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_corpus_reuses_index(tmp_path):
+    make_corpus(tmp_path)
+    Corpus(tmp_path)
+    (tmp_path / "fp2001" / "fp2001.1.03.smp.mix").unlink()
+    assert len(Corpus(tmp_path)) == 3
+    assert len(Corpus(tmp_path, rebuild=True)) == 2
+
+
+def test_corpus_refresh(tmp_path):
+    make_corpus(tmp_path)
+    corpus = Corpus(tmp_path)
+    path = tmp_path / "fp2060" / "fp2060.1.05.smp.mix"
+    path.write_text(SAMPLE1.replace("jag vill }ka", "jag ska }ka"))
+    os.utime(path, (0, 0))
+    corpus.refresh()
+    texts = [entry.text for entry in corpus]
+    assert "jag ska åka 17 och 45 ." in texts
+
+
+def test_corpus_refresh_option(tmp_path):
+    make_corpus(tmp_path)
+    Corpus(tmp_path)
+    (tmp_path / "fp2001" / "fp2001.1.03.smp.mix").unlink()
+    (tmp_path / "fp2002" / "fp2002.1.01.smp.mix").parent.mkdir()
+    (tmp_path / "fp2002" / "fp2002.1.01.smp.mix").write_text(SAMPLE1)
+    corpus = Corpus(tmp_path, refresh=True)
+    assert corpus.speakers() == ["fp2002", "fp2060"]
+    assert len(Corpus(tmp_path)) == 3
+    parser = argparse.ArgumentParser()
+    add_index_arguments(parser)
+    assert parser.parse_args(["--refresh-index"]).refresh_index
+
+
+def test_corpus_stale_index(tmp_path):
+    make_corpus(tmp_path)
+    corpus = Corpus(tmp_path)
+    (tmp_path / "fp2001" / "fp2001.1.03.smp.mix").unlink()
+    with pytest.raises(FileNotFoundError, match="--refresh-index"):
+        corpus.load(corpus.entries[0])
+    with pytest.raises(FileNotFoundError, match="--refresh-index"):
+        list(corpus.mixes(io_concurrency=2))
+    with pytest.raises(FileNotFoundError, match="--refresh-index"):
+        list(map_corpus(path_and_text, corpus, jobs=2))
+    with pytest.raises(FileNotFoundError) as error:
+        with corpus.reading():
+            open(tmp_path / "fp2060" / "fp2060.1.05.smp")
+    assert "--refresh-index" not in str(error.value)
+
+
+def test_corpus_filter(tmp_path):
+    make_corpus(tmp_path)
+    corpus = Corpus(tmp_path)
+    assert len(corpus.filter(speaker="fp2060")) == 2
+    assert len(corpus.filter(speaker="fp2060", session="2")) == 1
+    assert len(corpus.filter(session=["1", "2"])) == 3
+    entry, mix = next(corpus.filter(speaker="fp2001").mixes())
+    assert entry.speaker == "fp2001"
+    assert len(mix.fr) == 31
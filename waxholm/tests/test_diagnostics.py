@@ -0,0 +1,76 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+from waxholm import Mix
+from waxholm.diagnostics import Diagnostics, configure_logging, logger
+from waxholm.instrument import collect
+from waxholm.tests.test_mix import SAMPLE1
+
+
+class Unprintable:
+    def __str__(self):
+        raise AssertionError("formatted a message that was not needed")
+
+
+def test_rate_limit(caplog):
+    diagnostics = Diagnostics(limit=2, samples=1)
+    with caplog.at_level(logging.WARNING, logger="waxholm"):
+        diagnostics.report("issue", "a.mix", "first %s", ("a",))
+        diagnostics.report("issue", "a.mix", "second %s", ("b",))
+        for _ in range(10):
+            diagnostics.report("issue", "b.mix", "more %s", (Unprintable(),))
+    assert [record.getMessage() for record in caplog.records] == [
+        "first a", "second b", "(further issue messages suppressed)"]
+    assert diagnostics.total("issue") == 12
+    assert diagnostics.to_dict() == {"issue": {"count": 12, "files": 2, "samples": ["first a"]}}
+
+
+def test_merge():
+    first = Diagnostics(limit=0, samples=2)
+    second = Diagnostics(limit=0, samples=2)
+    first.report("issue", "a.mix", "a")
+    second.report("issue", "a.mix", "b")
+    second.report("issue", "b.mix", "c")
+    second.report("other", None, "d")
+    first.merge(second)
+    assert first.counts == {"issue": {"a.mix": 2, "b.mix": 1}, "other": {"": 1}}
+    assert first.samples["issue"] == ["a", "b"]
+    assert first.total() == 4
+
+
+def test_mix_diagnostics():
+    broken = SAMPLE1.replace("\t 0.262 sec", "")
+    with collect() as inst:
+        mix = Mix(filepath="fp2060.1.05.smp.mix", stringfile=broken)
+        mix.prune_empty_silences(verbose=True)
+        mix.get_merged_plosives()
+    issues = inst.report()["issues"]
+    assert issues["missing-seconds"]["files"] == 1
+    assert issues["missing-seconds"]["count"] >= 1
+    assert inst.counters["warnings"] == inst.diagnostics.total()
+
+
+def test_configure_logging(capsys):
+    configure_logging("info")
+    configure_logging()
+    try:
+        assert len(logger.handlers) == 1
+        with collect():
+            mix = Mix(filepath="fp2060.1.05.smp.mix", stringfile=SAMPLE1)
+            mix.merge_plosives(verbose=True)
+            mix.fr
+    finally:
+        logger.handlers.clear()
+        logger.setLevel(logging.NOTSET)
+    assert capsys.readouterr().err.startswith("INFO: Merging ")
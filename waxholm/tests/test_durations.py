@@ -0,0 +1,62 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+from waxholm import Mix
+from waxholm.durations import DurationTable
+from waxholm.tests.test_mix import SAMPLE1
+
+
+def make_table(**kwargs):
+    mixes = [Mix(filepath=f"{i}.mix", stringfile=SAMPLE1) for i in range(3)]
+    return DurationTable.from_mixes(mixes, **kwargs)
+
+
+def test_duration_table():
+    table = make_table()
+    assert len(table) == 90
+    assert table.segment(0) == ("0.mix", 4196, 5638, "J")
+    zero = table.zero_length()
+    assert len(zero) == 6
+    assert table.segment(zero[0]).phone == "G"
+    assert table.counts()[table.phones["J"]] == 3
+
+
+def test_percentiles_match_numpy():
+    table = make_table()
+    percentiles = table.percentiles((10, 50, 90))
+    for phone_id in range(len(table.phones)):
+        durations = table.durations[table.phone_ids == phone_id]
+        if len(durations) == 0:
+            assert np.isnan(percentiles[phone_id]).all()
+        else:
+            assert np.allclose(percentiles[phone_id], np.percentile(durations, [10, 50, 90]))
+
+
+def test_histograms():
+    table = make_table(merge_plosives=True)
+    hist, edges = table.histograms(bins=20)
+    assert hist.shape == (len(table.phones), 20)
+    assert hist.sum() == len(table)
+    assert len(edges) == 21
+    assert len(table.zero_length()) == 3
+
+
+def test_merged_table_matches_labels():
+    mixes = [Mix(filepath=f"{i}.mix", stringfile=SAMPLE1) for i in range(3)]
+    table = DurationTable.from_mixes(mixes, merge_plosives=True)
+    labels = [label for mix in mixes for label in mix.get_merged_plosives(prune_empty=False, as_frames=True)]
+    assert table.starts.tolist() == [x.start for x in labels]
+    assert table.ends.tolist() == [x.end for x in labels]
+    assert table.phones.decode(table.phone_ids) == [x.label for x in labels]
+    assert table.utterance_ids.tolist() == [i for i in range(3) for _ in range(len(labels) // 3)]
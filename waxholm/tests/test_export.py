@@ -0,0 +1,56 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+from waxholm import Mix
+from waxholm.export import ShardedDataset, export_dataset
+from waxholm.tests.test_audio import write_smp
+from waxholm.tests.test_mix import SAMPLE1
+
+
+def test_export_dataset(tmp_path):
+    mixes = []
+    for utt in range(5):
+        samples = (np.arange(37000) % 1000 + utt).astype(np.int16)
+        write_smp(tmp_path / f"fp2060.1.0{utt}.smp", samples)
+        mixfile = tmp_path / f"fp2060.1.0{utt}.smp.mix"
+        mixfile.write_text(SAMPLE1)
+        mixes.append(Mix(mixfile))
+    export_dataset(mixes, tmp_path / "out", shard_size=2, audio=True)
+    assert len(list((tmp_path / "out").glob("shard-*"))) == 3
+
+    dataset = ShardedDataset(tmp_path / "out")
+    assert len(dataset) == 5
+    utt = dataset[3]
+    mix = mixes[3]
+    assert utt.utterance == "fp2060.1.03"
+    assert (utt.speaker, utt.session) == ("fp2060", "1")
+    assert utt.text == mix.text
+    assert utt.phonemes == mix.get_phoneme_string()
+    labels = mix.get_merged_plosives(as_frames=True)
+    assert utt.phone_times.tolist() == [[x[0], x[1]] for x in labels]
+    assert dataset.phones.decode(utt.phone_ids) == [x[2] for x in labels]
+    assert dataset.words.decode(utt.word_ids)[0] == "jag"
+    assert utt.word_times[0].tolist() == [4196, 8341]
+    assert utt.samples[:, 0][:3].tolist() == [3, 4, 5]
+    assert dataset[-1].utterance == "fp2060.1.04"
+
+
+def test_export_dataset_empty_audio(tmp_path):
+    write_smp(tmp_path / "fp2060.1.05.smp", [])
+    mixfile = tmp_path / "fp2060.1.05.smp.mix"
+    mixfile.write_text(SAMPLE1)
+    export_dataset([Mix(mixfile)], tmp_path / "out", audio=True)
+    utt = ShardedDataset(tmp_path / "out")[0]
+    assert utt.samples.shape == (0, 1)
+    assert utt.utterance == "fp2060.1.05"
@@ -19,96 +19,96 @@ from waxholm.mix import merge_frs
 def test_fr_begin1():
     line = "FR       4481	 #sm	>pm #sm	>w XsmackX	 0.280 sec"
     fr = FR(line)
-    assert 'type' in fr.__dict__
+    assert hasattr(fr, 'type')
     assert fr.type == "B"
-    assert 'phone' in fr.__dict__
+    assert hasattr(fr, 'phone')
     assert fr.phone == "sm"
-    assert 'frame' in fr.__dict__
+    assert hasattr(fr, 'frame')
     assert fr.frame == "4481"
-    assert 'word' in fr.__dict__
+    assert hasattr(fr, 'word')
     assert fr.word == "XsmackX"
-    assert 'phone_type' in fr.__dict__
+    assert hasattr(fr, 'phone_type')
     assert fr.phone_type == "#"
-    assert 'pm_type' in fr.__dict__
+    assert hasattr(fr, 'pm_type')
     assert fr.pm_type == "#"
-    assert 'pm' in fr.__dict__
+    assert hasattr(fr, 'pm')
     assert fr.pm == "sm"
-    assert 'seconds' in fr.__dict__
+    assert hasattr(fr, 'seconds')
     assert fr.seconds == "0.280"
 
 
 def test_fr_begin2():
     line = "FR       6671	 #I	>pm #I	>w ikv{ll	 0.417 sec"
     fr = FR(line)
-    assert 'type' in fr.__dict__
+    assert hasattr(fr, 'type')
     assert fr.type == "B"
-    assert 'phone' in fr.__dict__
+    assert hasattr(fr, 'phone')
     assert fr.phone == "I"
-    assert 'frame' in fr.__dict__
+    assert hasattr(fr, 'frame')
     assert fr.frame == "6671"
-    assert 'word' in fr.__dict__
+    assert hasattr(fr, 'word')
     assert fr.word == "ikväll"
-    assert 'phone_type' in fr.__dict__
+    assert hasattr(fr, 'phone_type')
     assert fr.phone_type == "#"
-    assert 'pm_type' in fr.__dict__
+    assert hasattr(fr, 'pm_type')
     assert fr.pm_type == "#"
-    assert 'pm' in fr.__dict__
+    assert hasattr(fr, 'pm')
     assert fr.pm == "I"
-    assert 'seconds' in fr.__dict__
+    assert hasattr(fr, 'seconds')
     assert fr.seconds == "0.417"
 
 
 def test_fr_inner1():
     line = "FR      10256	 $'[	>pm $'[	 0.641 sec"
     fr = FR(line)
-    assert 'type' in fr.__dict__
+    assert hasattr(fr, 'type')
     assert fr.type == "I"
-    assert 'phone' in fr.__dict__
+    assert hasattr(fr, 'phone')
     assert fr.phone == "'Ä"
-    assert 'frame' in fr.__dict__
+    assert hasattr(fr, 'frame')
     assert fr.frame == "10256"
-    assert 'word' not in fr.__dict__
-    assert 'phone_type' in fr.__dict__
+    assert not hasattr(fr, 'word')
+    assert hasattr(fr, 'phone_type')
     assert fr.phone_type == "$"
-    assert 'pm_type' in fr.__dict__
+    assert hasattr(fr, 'pm_type')
     assert fr.pm_type == "$"
-    assert 'pm' in fr.__dict__
+    assert hasattr(fr, 'pm')
     assert fr.pm == "'Ä"
-    assert 'seconds' in fr.__dict__
+    assert hasattr(fr, 'seconds')
     assert fr.seconds == "0.641"
 
 
 def test_fr_end1():
     line = "FR      15241	 OK	 0.952 sec"
     fr = FR(line)
-    assert 'type' in fr.__dict__
+    assert hasattr(fr, 'type')
     assert fr.type == "E"
-    assert 'phone' not in fr.__dict__
-    assert 'frame' in fr.__dict__
+    assert not hasattr(fr, 'phone')
+    assert hasattr(fr, 'frame')
     assert fr.frame == "15241"
-    assert 'word' not in fr.__dict__
-    assert 'phone_type' not in fr.__dict__
-    assert 'pm_type' not in fr.__dict__
-    assert 'pm' not in fr.__dict__
-    assert 'seconds' in fr.__dict__
+    assert not hasattr(fr, 'word')
+    assert not hasattr(fr, 'phone_type')
+    assert not hasattr(fr, 'pm_type')
+    assert not hasattr(fr, 'pm')
+    assert hasattr(fr, 'seconds')
     assert fr.seconds == "0.952"
 
 
 def test_fr_broken_inner1():
     line = "FR      34326	 $v	 2.145 sec"
     fr = FR(line)
-    assert 'type' in fr.__dict__
+    assert hasattr(fr, 'type')
     assert fr.type == "I"
-    assert 'phone' in fr.__dict__
+    assert hasattr(fr, 'phone')
     assert fr.phone == "v"
-    assert 'frame' in fr.__dict__
+    assert hasattr(fr, 'frame')
     assert fr.frame == "34326"
-    assert 'word' not in fr.__dict__
-    assert 'phone_type' in fr.__dict__
+    assert not hasattr(fr, 'word')
+    assert hasattr(fr, 'phone_type')
     assert fr.phone_type == "$"
-    assert 'pm_type' not in fr.__dict__
-    assert 'pm' not in fr.__dict__
-    assert 'seconds' in fr.__dict__
+    assert not hasattr(fr, 'pm_type')
+    assert not hasattr(fr, 'pm')
+    assert hasattr(fr, 'seconds')
     assert fr.seconds == "2.145"
 
 
@@ -121,3 +121,38 @@ def test_merge_frs():
     fr2 = FR(text="FR       8341	 #V	>pm #V	>w vill	 0.521 sec")
     merge = merge_frs(fr1, fr2)
     assert merge is None
+
+
+def test_fr_pm_dot_and_word_dot():
+    line = "FR      16602\t #.\t>pm. #.\t>w. .\t 1.038 sec"
+    fr = FR(line)
+    assert fr.type == "B"
+    assert fr.pm == "."
+    assert fr.pm_type == "#"
+    assert fr.word == "."
+    assert fr.pseudoword is False
+
+
+def test_fr_kludged():
+    line = "FR      21506\t #ha\t>pm #ha\t>w skratt\t 1.344 sec"
+    fr = FR(line)
+    assert fr.word == "XskrattX"
+    assert fr.pseudoword is False
+
+
+def test_fr_pseudowords():
+    fr = FR("FR      29141\t #kl\t>pm #kl\t> XklickX\t 1.821 sec")
+    assert fr.type == "B"
+    assert fr.word == "XklickX"
+    assert fr.pseudoword is True
+    fr = FR("FR      29141\t $#pa\tXinandX\t 1.821 sec")
+    assert fr.phone_type == "$#"
+    assert fr.phone == "pa"
+    assert fr.word == "XinandX"
+    assert fr.pseudoword is True
+
+
+def test_fr_problems():
+    fr = FR("FR      36001\t PROBLEMS\t 2.250 sec")
+    assert fr.type == "E"
+    assert fr.seconds == "2.250"
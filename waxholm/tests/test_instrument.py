@@ -0,0 +1,82 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+from waxholm import instrument
+from waxholm.cache import MixCache
+from waxholm.convert import map_mixes
+from waxholm.instrument import Instrument, collect
+from waxholm.tests.test_convert import make_files, path_and_text
+from waxholm.tests.test_mix import SAMPLE1
+
+
+def test_instrument():
+    inst = Instrument()
+    with inst.stage("parse"):
+        pass
+    with inst.stage("parse"):
+        pass
+    inst.count("files")
+    inst.count("bytes_read", 100)
+    other = Instrument()
+    other.count("files", 2)
+    with other.stage("write"):
+        pass
+    inst.merge(other)
+    report = inst.report()
+    assert report["stages"]["parse"]["calls"] == 2
+    assert report["stages"]["write"]["calls"] == 1
+    assert report["counters"]["files"] == 3
+    assert report["counters"]["bytes_read"] == 100
+    assert report["counters"]["warnings"] == 0
+
+
+def test_collect():
+    with collect() as inst:
+        instrument.count("files")
+        instrument.diagnose("test", "a.mix", "test warning")
+    assert inst.counters == {"files": 1, "warnings": 1}
+    assert inst.report()["issues"]["test"]["count"] == 1
+    assert instrument.get_instrument() is not inst
+
+
+def test_map_mixes_counts(tmp_path):
+    paths = make_files(tmp_path, 4)
+    size = sum((tmp_path / path).stat().st_size for path in paths)
+    fr_lines = sum(1 for line in SAMPLE1.split("\n") if line.startswith("FR "))
+    for jobs in [1, 2]:
+        with collect() as inst:
+            list(map_mixes(path_and_text, paths, jobs=jobs, chunksize=1))
+        assert inst.counters["files"] == 4
+        assert inst.counters["fr_lines"] == 4 * fr_lines
+        assert inst.counters["bytes_read"] == size
+        assert inst.stages["load"][0] == 4
+    cache = MixCache(tmp_path / "cache")
+    list(map_mixes(path_and_text, paths, cache=cache))
+    for jobs, io_concurrency in [(1, 0), (2, 0), (1, 2)]:
+        with collect() as inst:
+            list(map_mixes(path_and_text, paths, jobs=jobs, cache=cache, io_concurrency=io_concurrency))
+        assert inst.counters["files"] == 4
+        assert inst.counters["fr_lines"] == 4 * fr_lines
+        assert inst.counters["cache_hits"] == 4
+        assert "bytes_read" not in inst.counters
+
+
+def test_save(tmp_path):
+    inst = Instrument()
+    inst.count("files")
+    inst.save(tmp_path / "report.json", script="test")
+    with open(tmp_path / "report.json") as inpf:
+        data = json.load(inpf)
+    assert data["script"] == "test"
+    assert data["counters"]["files"] == 1
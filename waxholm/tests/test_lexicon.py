@@ -0,0 +1,58 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+from waxholm.lexicon import LexiconBuilder
+
+
+def test_lexicon_builder_counts(tmp_path):
+    file1 = tmp_path / "a.mix"
+    file2 = tmp_path / "b.mix"
+    file1.write_text("a")
+    file2.write_text("b")
+    lexicon = LexiconBuilder()
+    lexicon.update(file1, [("jag", "J ˈA: G+"), ("vill", "V ˈI L+")])
+    lexicon.update(file2, [("jag", "J ˈA: G+"), ("jag", "J ˈA:")])
+    assert lexicon.pronunciations("jag") == {"J ˈA: G+": 2, "J ˈA:": 1}
+    lexicon.update(file2, [("vill", "V ˈI L")])
+    assert lexicon.pronunciations("jag") == {"J ˈA: G+": 1}
+    lexicon.retain([file2])
+    assert "jag" not in lexicon.counts
+    assert lexicon.pronunciations("vill") == {"V ˈI L": 1}
+
+
+def test_lexicon_builder_state(tmp_path):
+    mixfile = tmp_path / "a.mix"
+    mixfile.write_text("a")
+    state = tmp_path / "lexicon.json"
+    lexicon = LexiconBuilder(state, options={"numbers": False})
+    lexicon.update(mixfile, [("jag", "J ˈA: G+")])
+    lexicon.save()
+
+    reloaded = LexiconBuilder(state, options={"numbers": False})
+    assert reloaded.is_current(mixfile)
+    assert reloaded.pronunciations("jag") == {"J ˈA: G+": 1}
+    assert LexiconBuilder(state, options={"numbers": True}).counts == {}
+
+    mixfile.write_text("changed")
+    os.utime(mixfile, (0, 0))
+    assert not reloaded.is_current(mixfile)
+
+
+def test_lexicon_builder_write(tmp_path):
+    mixfile = tmp_path / "a.mix"
+    mixfile.write_text("a")
+    lexicon = LexiconBuilder()
+    lexicon.update(mixfile, [("vill", "V ˈI L+"), ("jag", "J ˈA: G+"), ("XX", "")])
+    lexicon.write(tmp_path / "lexicon.dict", junk=["XX\t\n"])
+    assert (tmp_path / "lexicon.dict").read_text() == "jag\tJ A: G\nvill\tV I L\n"
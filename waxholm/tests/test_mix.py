@@ -11,7 +11,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from itertools import islice
 from waxholm import Mix
+from waxholm.mix import iter_frs, iter_mix, iter_records
+from waxholm.phones import get_inventory
 
 
 SAMPLE1 = """\
@@ -63,6 +66,12 @@ FR      35570	 #.	>pm #.	>w .	 2.223 sec
 FR      36001	 OK	 2.250 sec
 """
 
+# SAMPLE1 with "och" replaced by "kan", so that a word starts with a
+# closure, and merging it with its burst creates a new record
+SAMPLE_CLOSURE = SAMPLE1.replace(
+    "FR      21827\t #']\t>pm #']\t>w och\t 1.364 sec\nFR      23007\t $K\t>pm $K\t",
+    "FR      23007\t #K\t>pm #K\t>w kan\t")
+
 
 def test_mix_read():
     mix = Mix(filepath="", stringfile=SAMPLE1)
@@ -138,3 +147,108 @@ def test_get_compare_dictionary():
     mix = Mix(filepath="", stringfile=SAMPLE1)
     pdict = mix.get_compare_dictionary(only_changed=True)
     assert len(pdict) == 1
+
+
+def test_get_durations():
+    mix = Mix(filepath="", stringfile=SAMPLE1)
+    durations = mix.get_durations(as_frames=True)
+    assert len(durations) == 30
+    assert durations[0] == 5638 - 4196
+    assert (durations == 0).sum() == 2
+
+
+def test_get_time_array():
+    mix = Mix(filepath="", stringfile=SAMPLE1)
+    pairs = mix.get_time_array(as_frames=True)
+    assert pairs.shape == (30, 2)
+    assert tuple(pairs[0]) == (4196, 5638)
+
+
+def test_prune_empty_segments():
+    mix = Mix(filepath="", stringfile=SAMPLE1)
+    assert len(mix.get_time_pairs()) == 30
+    mix.prune_empty_segments()
+    assert len(mix.fr) == 29
+    assert len(mix.get_time_pairs()) == 28
+    assert (mix.get_durations(as_frames=True) == 0).sum() == 0
+
+
+def test_prune_empty_labels():
+    mix = Mix(filepath="", stringfile=SAMPLE1)
+    labels = mix.prune_empty_labels(as_frames=True)
+    assert len(labels) == 28
+    assert (8341, 8341, "G") not in labels
+
+
+def test_get_merged_plosives_pruned():
+    mix = Mix(filepath="", stringfile=SAMPLE1)
+    merged = mix.get_merged_plosives()
+    assert len(merged) == 23
+    assert merged[6] == (0.792, 0.873, "k")
+
+
+def test_get_merged_plosive_arrays():
+    mix = Mix(filepath="", stringfile=SAMPLE1)
+    for prune_empty in [True, False]:
+        for as_frames in [True, False]:
+            labels = mix.get_merged_plosives(prune_empty=prune_empty, as_frames=as_frames)
+            times, ids = mix.get_merged_plosive_arrays(prune_empty=prune_empty, as_frames=as_frames)
+            assert times.tolist() == [[x.start, x.end] for x in labels]
+            assert get_inventory().decode(ids.tolist()) == [x.label for x in labels]
+    mix.merge_plosives()
+    times, ids = mix.get_merged_plosive_arrays(as_frames=True)
+    assert times.tolist() == [[x.start, x.end] for x in mix.get_merged_plosives(as_frames=True)]
+
+
+def test_iter_frs_stops_early():
+    lines = iter(SAMPLE1.split("\n"))
+    frs = list(islice(iter_frs(lines), 2))
+    assert [fr.frame for fr in frs] == ["4196", "5638"]
+    assert next(lines).startswith("FR       8341")
+
+
+def test_iter_records_header():
+    header = {}
+    for kind, value in iter_records(SAMPLE1.split("\n")):
+        if kind == "fr":
+            break
+        header[kind] = value
+    assert header["text"] == "jag vill åka 17 och 45 ."
+    assert header["labels"].endswith("F\\42TtIF'EMv.")
+
+
+def test_iter_mix(tmp_path):
+    mixfile = tmp_path / "fp2060.1.05.smp.mix"
+    mixfile.write_text(SAMPLE1)
+    mixes = list(iter_mix([mixfile]))
+    assert len(mixes[0].fr) == len(list(iter_frs(mixfile)))
+
+
+def test_header_only():
+    full = Mix(filepath="", stringfile=SAMPLE1)
+    mix = Mix(filepath="", stringfile=SAMPLE1, header_only=True)
+    assert mix.fr == []
+    assert (mix.text, mix.phoneme, mix.labels) == (full.text, full.phoneme, full.labels)
+    assert mix.filepath == "/u/wax/data/scenes/fp2060/fp2060.1.05.smp"
+
+
+def test_transformations_share_records():
+    mix = Mix(filepath="", stringfile=SAMPLE1)
+    records = mix.fr
+    mix.merge_plosives()
+    mix.prune_empty_segments()
+    assert mix.orig_fr is records
+    assert len(mix.orig_view) == 31
+    assert len(mix.fr) == 25
+    assert all(any(fr is orig for orig in records) or fr.has_word() for fr in mix.fr)
+    assert mix.get_time_pairs(as_frames=True)[0] == (4196, 5638)
+
+
+def test_merge_does_not_change_view():
+    mix = Mix(filepath="", stringfile=SAMPLE_CLOSURE)
+    view = mix.view
+    merged = mix._merge_plosives(view)
+    mix._merge_plosives(view)
+    assert view.extra == []
+    assert len(merged.extra) == 1
+    assert (merged[14].get_word(), merged[14].get_phone()) == ("kan", "k")
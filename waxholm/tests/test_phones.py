@@ -0,0 +1,78 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+from waxholm.phones import IPA_MAPPING, PhoneInventory, PhoneMapper, merge_indices
+from waxholm.utils import map_to_ipa
+
+
+def reference_map_to_ipa(phone_list, non_speech=False):
+    output = []
+    for phone in phone_list:
+        accent = ''
+        if len(phone) < 1:
+            continue
+        if phone[0] in "ˈ`ˌ":
+            accent = phone[0]
+            phone = phone[1:]
+        if phone in IPA_MAPPING:
+            output.append(accent + IPA_MAPPING[phone])
+        elif phone in [".", ","]:
+            output.append(phone)
+        elif non_speech:
+            output.append(f"<{phone}>")
+    return output
+
+
+def test_phone_inventory():
+    inventory = PhoneInventory(["A", "B"])
+    assert list(inventory.encode(["B", "C", "A"])) == [1, 2, 0]
+    assert inventory.decode([2, 0]) == ["C", "A"]
+    assert "C" in inventory
+
+
+def test_map_to_ipa():
+    assert map_to_ipa(["ˈA:", "sm", "", "."]) == ["ˈɑː", "."]
+    assert map_to_ipa(["ˈA:", "sm", "", "."], non_speech=True) == ["ˈɑː", "<sm>", "."]
+
+
+def test_mapper_matches_reference():
+    phones = list(IPA_MAPPING) + ["ˈA:", "`E:", "ˌI", ".", ",", "", "sm", "pa", "ˈ", "x"]
+    rng = random.Random(0)
+    for non_speech in [False, True]:
+        mapper = PhoneMapper(non_speech=non_speech)
+        prons = [[rng.choice(phones) for _ in range(rng.randint(1, 8))] for _ in range(500)]
+        expected = [reference_map_to_ipa(pron, non_speech) for pron in prons]
+        assert [mapper.map(pron) for pron in prons] == expected
+        assert mapper.map_many(prons) == expected
+        assert list(mapper.map_pronunciation(" ".join(prons[0]))) == expected[0]
+
+
+def test_mapper_other_alphabet():
+    mapper = PhoneMapper(mapping={"A": "a", "SJ": "S"})
+    assert mapper.map(["SJ", "ˈA", "B"]) == ["S", "ˈa"]
+
+
+def test_merge_indices():
+    inventory = PhoneInventory(["A", "K", "k", "T", "t"])
+    ids = inventory.encode(["K", "k", "A", "T", "t", "K", "k", "A", "k"])
+    bursts = inventory.bursts()
+    assert bursts.tolist() == [-1, 2, -1, 4, -1]
+    first, last = merge_indices(ids, bursts)
+    assert first.tolist() == [0, 2, 3, 5, 7]
+    assert last.tolist() == [1, 2, 4, 6, 7]
+    # pairs are not merged across utterances, and the last segment of
+    # each is only kept as part of a pair
+    first, last = merge_indices(ids, bursts, offsets=[0, 3, 3, 6, 9])
+    assert first.tolist() == [0, 3, 6, 7]
+    assert last.tolist() == [1, 4, 6, 7]
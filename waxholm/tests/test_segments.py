@@ -0,0 +1,55 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+from waxholm import Mix
+from waxholm.segments import export_segments, iter_segments
+from waxholm.tests.test_audio import write_smp
+from waxholm.tests.test_mix import SAMPLE1
+
+
+def make_utterance(root):
+    samples = (np.arange(37000) % 1000).astype(np.int16)
+    write_smp(root / "fp2060.1.05.smp", samples)
+    mixfile = root / "fp2060.1.05.smp.mix"
+    mixfile.write_text(SAMPLE1)
+    return Mix(mixfile), samples
+
+
+def test_iter_segments_words(tmp_path):
+    mix, samples = make_utterance(tmp_path)
+    segments = list(iter_segments(mix))
+    assert segments[0].label == "jag"
+    assert (segments[0].start, segments[0].end) == (4196, 8341)
+    assert np.array_equal(segments[0].samples, samples[4196:8341])
+    assert segments[-1].label == "45"
+
+
+def test_iter_segments_phones(tmp_path):
+    mix, samples = make_utterance(tmp_path)
+    segments = list(iter_segments(mix, level="phone"))
+    assert [x.label for x in segments[:3]] == ["J", "ˈA:", "V"]
+    assert segments[6].label == "k"
+    assert (segments[6].start, segments[6].end) == (12676, 13975)
+
+
+def test_export_segments(tmp_path):
+    mix, samples = make_utterance(tmp_path)
+    export_segments([mix], tmp_path / "npy", fmt="npy", shard_size=4)
+    index = (tmp_path / "npy" / "segments.tsv").read_text().strip().split("\n")
+    assert len(index) == 7
+    shard, offset, length = [int(x) for x in index[5].split("\t")[:3]]
+    data = np.load(tmp_path / "npy" / f"shard-{shard:05d}.npy", mmap_mode="r")
+    assert np.array_equal(data[offset:offset + length], samples[21827:24044])
+    export_segments([mix], tmp_path / "wav")
+    assert (tmp_path / "wav" / "fp2060.1.05_0000.wav").exists()
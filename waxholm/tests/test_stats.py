@@ -0,0 +1,55 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+from waxholm import Mix
+from waxholm.stats import CorpusStats, collect_stats
+from waxholm.tests.test_convert import make_files
+from waxholm.tests.test_mix import SAMPLE1
+
+
+def test_corpus_stats():
+    stats = CorpusStats()
+    stats.add_mix(Mix(filepath="fp2060.1.05.smp.mix", stringfile=SAMPLE1))
+    assert stats.files == 1
+    assert stats.variants("jag") == {"J ˈA: G g": 1}
+    assert stats.phones["J"] == 1
+    assert stats.bigrams[("J", "ˈA:")] == 1
+    assert stats.durations["J"].count == 1
+    assert stats.durations["J"].total == 5638 - 4196
+    assert stats.speakers["fp2060"].words["jag"] == 1
+
+
+def test_collect_stats_merge_and_save(tmp_path):
+    paths = make_files(tmp_path, 4)
+    serial = collect_stats(paths)
+    parallel = collect_stats(paths, jobs=2)
+    assert serial.to_dict() == parallel.to_dict()
+    assert collect_stats(paths, io_concurrency=3).to_dict() == serial.to_dict()
+    assert serial.files == 4
+    assert serial.speakers["fp2060"].files == 4
+    serial.save(tmp_path / "stats.json")
+    loaded = CorpusStats.load(tmp_path / "stats.json")
+    assert loaded.to_dict() == serial.to_dict()
+    merged = CorpusStats().merge(loaded).merge(loaded)
+    assert merged.durations["J"].count == 2 * serial.durations["J"].count
+
+
+def test_merge_requires_same_plosive_setting(tmp_path):
+    paths = make_files(tmp_path, 2)
+    merged = collect_stats(paths)
+    separate = collect_stats(paths, merge_plosives=False)
+    separate.save(tmp_path / "stats.json")
+    with pytest.raises(ValueError):
+        merged.merge(CorpusStats.load(tmp_path / "stats.json"))
+    assert merged.files == 2
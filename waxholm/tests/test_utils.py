@@ -0,0 +1,51 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+from waxholm.utils import (
+    PronunciationCleaner,
+    clean_pronunciation,
+    clean_pron_set,
+    clean_silences_mfa,
+    fix_duration_markers,
+    replace_glottal_closures,
+    strip_accents,
+)
+
+
+def test_replace_glottal_closures():
+    assert replace_glottal_closures("A K k A") == "A K A"
+    assert replace_glottal_closures("T 2t A") == "2T A"
+    # adjacent pairs share a space, so only the first is merged
+    assert replace_glottal_closures("K k K k") == "K K k"
+
+
+def test_clean_pronunciation():
+    assert clean_pronunciation("p: ˈA: G+ g L+ p:") == "A: G L"
+    assert clean_pronunciation("p:") == "SIL"
+    assert clean_pronunciation("A p: sm B b", non_phones=True) == "A B"
+    assert clean_pronunciation("ˈA: K k", clean_accents=False) == "ˈA: K"
+    assert clean_pron_set(["A: K k", "A: K+ k"]) == {"A: K"}
+
+
+def test_cleaner_matches_steps():
+    phones = ["p:", "ˈA:", "A:+", ":+", "K", "k", "T", "t", "2T", "2t", "D", "2d",
+              "P", "p", "sm", "v", "", "L+", "'E"]
+    rng = random.Random(0)
+    for non_phones in [False, True]:
+        cleaner = PronunciationCleaner(non_phones=non_phones)
+        for _ in range(2000):
+            pron = " ".join(rng.choice(phones) for _ in range(rng.randint(1, 8)))
+            text = strip_accents(fix_duration_markers(pron))
+            text = replace_glottal_closures(clean_silences_mfa(text, non_phones))
+            assert cleaner(pron) == text, pron
@@ -0,0 +1,51 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+from waxholm import Mix
+from waxholm.corpus import Corpus
+from waxholm.vocab import Vocabulary
+from .test_mix import SAMPLE1
+
+
+def test_vocabulary_roundtrip(tmp_path):
+    vocab = Vocabulary(["a", "b"])
+    assert vocab["a"] == 2
+    ids = vocab.encode(["b", "c", "a"])
+    assert ids.dtype == np.int32
+    assert list(ids) == [3, 1, 2]
+    assert vocab.decode(ids) == ["b", "<unk>", "a"]
+    vocab.save(tmp_path / "vocab.json")
+    assert Vocabulary.load(tmp_path / "vocab.json") == vocab
+    with pytest.raises(KeyError):
+        Vocabulary(specials=[]).index("a")
+
+
+def test_mix_encode_labels():
+    mix = Mix(filepath="", stringfile=SAMPLE1)
+    vocab = Vocabulary()
+    times, ids = mix.encode_phone_labels(vocab, as_frames=True, add=True)
+    labels = mix.get_merged_plosives(as_frames=True)
+    assert times.tolist() == [[x[0], x[1]] for x in labels]
+    assert vocab.decode(ids) == [x[2] for x in labels]
+    words = Vocabulary()
+    word_ids = mix.encode_words(words, add=True)
+    assert words.decode(word_ids) == [x[0] for x in mix.get_dictionary_list()]
+
+
+def test_corpus_vocabularies(tmp_path):
+    (tmp_path / "fp2060.1.05.smp.mix").write_text(SAMPLE1)
+    phones, words = Corpus(tmp_path).build_vocabularies()
+    assert "jag" in words
+    assert "ˈA:" in phones
@@ -11,7 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from functools import lru_cache
 from typing import List
+from .phones import ACCENTS, IPA_MAPPING, SILS, get_mapper
 
 
 X_TAGS = {
@@ -85,45 +87,38 @@ def fix_duration_markers(input: str) -> str:
     return input.strip()
 
 
-SILS = {
-    "K": "k",
-    "G": "g",
-    "T": "t",
-    "D": "d",
-    "2T": "2t",
-    "2D": "2d",
-    "P": "p",
-    "B": "b"
-}
-
-
 def is_glottal_closure(cur, next):
     return cur in SILS and next == SILS[cur]
 
 
+# " closure burst " -> " merged ", in the order the merges are applied
+CLOSURE_MERGES = [(f" {x} {SILS[x]} ", f" {x} ") for x in SILS]
+for _retro in ["D", "T"]:
+    CLOSURE_MERGES.append((f" 2{_retro} {_retro.lower()} ", f" 2{_retro} "))
+    CLOSURE_MERGES.append((f" {_retro} 2{_retro.lower()} ", f" 2{_retro} "))
+
+
 def replace_glottal_closures(input):
     input = f" {input} "
-    LOCAL_SILS = {f" {x} {SILS[x]} ": f" {x} " for x in SILS}
-    for retro in ["D", "T"]:
-        LOCAL_SILS[f" 2{retro} {retro.lower()} "] = f" 2{retro} "
-        LOCAL_SILS[f" {retro} 2{retro.lower()} "] = f" 2{retro} "
-    for sil in LOCAL_SILS:
+    for sil, merged in CLOSURE_MERGES:
         if sil in input:
-            input = input.replace(sil, LOCAL_SILS[sil])
-            input = f" {input.strip()} "
+            input = f" {input.replace(sil, merged).strip()} "
     return input.strip()
 
 
+_STRIP_ACCENTS = str.maketrans("", "", ACCENTS)
+
+
 def strip_accents(text):
-    for accent in "ˈ`ˌ":
-        text = text.replace(accent, "")
-    return text
+    return text.translate(_STRIP_ACCENTS)
 
 
-def clean_silences_mfa(pron:str, non_phones=False) -> str:
-    if pron == "p:":
-        return "SIL"
-    split = pron.split(" ")
+NON_PHONES = ["v", "kl", "SIL", "pa", "sm", "Kl", "Pa"]
+
+
+def _clean_silence_tokens(split: List[str], non_phones=False) -> List[str]:
+    if split == ["p:"]:
+        return ["SIL"]
     start = 0
     end = len(split) - 1
     if split[start] == "p:":
@@ -131,27 +126,59 @@ def clean_silences_mfa(pron:str, non_phones=False) -> str:
     if split[end] == "p:":
         end -= 1
     split = ["SIL" if x == "p:" else x for x in split]
-    NON_PHONES = ["v", "kl", "SIL", "pa", "sm", "Kl", "Pa"]
     if non_phones:
         split = [x for x in split if x not in NON_PHONES]
-    return " ".join(split[start:end+1])
+    return split[start:end+1]
+
+
+def clean_silences_mfa(pron:str, non_phones=False) -> str:
+    return " ".join(_clean_silence_tokens(pron.split(" "), non_phones))
+
+
+class PronunciationCleaner:
+    """
+    The steps of `clean_pronunciation`, fixed once for a set of option
+    flags. Results are memoized, as the same pronunciations recur
+    throughout the corpus.
+    """
+    def __init__(self, non_phones=False, clean_accents=True, clean_silences=True, cache_size=65536):
+        self.non_phones = non_phones
+        self.clean_accents = clean_accents
+        self.clean_silences = clean_silences
+        self.clean = lru_cache(maxsize=cache_size)(self._clean)
+
+    def _clean(self, text: str) -> str:
+        text = fix_duration_markers(text)
+        if self.clean_accents:
+            text = text.translate(_STRIP_ACCENTS)
+        if self.clean_silences:
+            text = " ".join(_clean_silence_tokens(text.split(" "), self.non_phones))
+        return replace_glottal_closures(text)
+
+    def __call__(self, text: str) -> str:
+        return self.clean(text)
+
+
+_CLEANERS = {}
+
+
+def get_cleaner(non_phones=False, clean_accents=True, clean_silences=True) -> PronunciationCleaner:
+    """
+    The shared `PronunciationCleaner` for these options
+    """
+    key = (non_phones, clean_accents, clean_silences)
+    if key not in _CLEANERS:
+        _CLEANERS[key] = PronunciationCleaner(*key)
+    return _CLEANERS[key]
 
 
 def clean_pronunciation(text, non_phones=False, clean_accents=True, clean_silences=True):
-    text = fix_duration_markers(text)
-    if clean_accents:
-        text = strip_accents(text)
-    if clean_silences:
-        text = clean_silences_mfa(text, non_phones)
-    text = replace_glottal_closures(text)
-    return text
+    return get_cleaner(non_phones, clean_accents, clean_silences)(text)
 
 
 def clean_pron_set(prons, non_phones=False):
-    output = set()
-    for pron in prons:
-        output.add(clean_pronunciation(pron, non_phones))
-    return output
+    cleaner = get_cleaner(non_phones)
+    return {cleaner(pron) for pron in prons}
 
 
 def is_x_word(text: str) -> bool:
@@ -165,69 +192,5 @@ def cond_lc(text: str) -> str:
         return text.lower()
 
 
-IPA_MAPPING = {
-    "2D": "ɖ",
-    "2L": "ɭ",
-    "2N": "ɳ",
-    "2S": "ʂ",
-    "2T": "ʈ",
-    "A": "a",
-    "A:": "ɑː",
-    "B": "b",
-    "D": "d",
-    "E": "e",
-    "E0": "ə",
-    "E:": "eː",
-    "F": "f",
-    "G": "ɡ",
-    "H": "h",
-    "I": "ɪ",
-    "I:": "iː",
-    "J": "j",
-    "K": "k",
-    "L": "l",
-    "M": "m",
-    "N": "n",
-    "NG": "ŋ",
-    "O": "ʊ",
-    "O:": "uː",
-    "P": "p",
-    "R": "r",
-    "S": "s",
-    "SJ": "ɧ",
-    "T": "t",
-    "TJ": "ɕ",
-    "U": "ɵ",
-    "U:": "ʉː",
-    "V": "v",
-    "Y": "ʏ",
-    "Y:": "yː",
-    "Ä": "ɛ",
-    "Ä3": "æː",
-    "Ä4": "æ",
-    "Ä:": "ɛː",
-    "Ö": "œ",
-    "Ö3": "œ̞ː",
-    "Ö4": "œ̞",
-    "Ö:": "øː",
-    "Å": "ɔ",
-    "Å:": "oː"
-}
-
-
 def map_to_ipa(phone_list: List[str], non_speech=False) -> List[str]:
-    output = []
-    for phone in phone_list:
-        accent = ''
-        if len(phone) < 1:
-            continue
-        if phone[0] in "ˈ`ˌ":
-            accent = phone[0]
-            phone = phone[1:]
-        if phone in IPA_MAPPING:
-            output.append(accent + IPA_MAPPING[phone])
-        elif phone in [".", ","]:
-            output.append(phone)
-        elif non_speech:
-            output.append(f"<{phone}>")
-    return output
+    return get_mapper(non_speech=non_speech).map(phone_list)
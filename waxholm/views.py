@@ -0,0 +1,129 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import numpy as np
+from .instrument import diagnose
+
+
+class FRView:
+    """
+    A sequence of FR records derived from a `base` list without copying
+    it, or any of its records. `index` picks, for each entry, either a
+    base record or (from `len(base)` on) one of the `extra` records
+    created by merging; `source` gives the base record that each entry
+    takes its frame and time from, so that timings can be looked up in
+    a table built once over `base`.
+
+    Views are never changed in place: each operation returns a new view,
+    so earlier views (such as the original) remain usable.
+    """
+    def __init__(self, base, extra=None, index=None, source=None):
+        self.base = base
+        self.extra = extra if extra is not None else []
+        self.index = index
+        self.source = source if source is not None else index
+
+    @property
+    def is_base(self):
+        return self.index is None
+
+    def _indices(self):
+        if self.index is None:
+            return np.arange(len(self.base), dtype=np.int64)
+        return self.index
+
+    def _sources(self):
+        if self.source is None:
+            return np.arange(len(self.base), dtype=np.int64)
+        return self.source
+
+    def __len__(self):
+        if self.index is None:
+            return len(self.base)
+        return len(self.index)
+
+    def _record(self, i):
+        if i < len(self.base):
+            return self.base[i]
+        return self.extra[i - len(self.base)]
+
+    def __getitem__(self, pos):
+        if self.index is None:
+            return self.base[pos]
+        return self._record(int(self.index[pos]))
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def tolist(self):
+        """
+        The records of the view, as a list (the base list itself, for
+        an unchanged view)
+        """
+        if self.index is None:
+            return self.base
+        if self.extra == []:
+            base = self.base
+            return [base[i] for i in self.index.tolist()]
+        return [self._record(i) for i in self.index.tolist()]
+
+    def select(self, mask):
+        """
+        A view of the entries where `mask` is True
+        """
+        mask = np.asarray(mask, dtype=bool)
+        return FRView(self.base, self.extra, self._indices()[mask], self._sources()[mask])
+
+    def drop(self, positions):
+        mask = np.ones(len(self), dtype=bool)
+        mask[list(positions)] = False
+        return self.select(mask)
+
+    def merge(self, merge_func, verbose=False, path=None):
+        """
+        A view in which each pair of adjacent records for which
+        `merge_func` returns a record (e.g., `merge_frs`) is replaced
+        by that record, which takes the time of the second of the pair.
+        With `verbose`, each merge is logged at INFO level, as from `path`.
+        """
+        frs = self.tolist()
+        if frs == []:
+            return self
+        indices = self._indices().tolist()
+        sources = self._sources().tolist()
+        extra = list(self.extra)
+        out_index = []
+        out_source = []
+        i = 0
+        while i < len(frs) - 1:
+            merged = merge_func(frs[i], frs[i + 1])
+            if merged is not None:
+                if verbose:
+                    diagnose("merged", path, "Merging %s and %s", frs[i], frs[i + 1], level=logging.INFO)
+                if merged is frs[i + 1]:
+                    out_index.append(indices[i + 1])
+                else:
+                    extra.append(merged)
+                    out_index.append(len(self.base) + len(extra) - 1)
+                out_source.append(sources[i + 1])
+                i += 1
+            else:
+                out_index.append(indices[i])
+                out_source.append(sources[i])
+            i += 1
+        out_index.append(indices[-1])
+        out_source.append(sources[-1])
+        return FRView(self.base, extra,
+                      np.array(out_index, dtype=np.int64),
+                      np.array(out_source, dtype=np.int64))
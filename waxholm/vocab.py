@@ -0,0 +1,122 @@
+# Copyright (c) 2023, Jim O'Regan for Språkbanken Tal
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import List
+import json
+import os
+import numpy as np
+
+
+VOCAB_VERSION = 1
+PAD = "<pad>"
+UNK = "<unk>"
+
+
+class Vocabulary:
+    """
+    Mapping between symbols (phones or words) and integer IDs, shared
+    across the corpus so that label sequences can be stored and fed to
+    training as arrays. The `specials` come first, so `<pad>` is 0 and
+    `<unk>` (used for unknown symbols) is 1 by default.
+    """
+    def __init__(self, symbols=None, specials=(PAD, UNK)):
+        self.specials = list(specials)
+        self.symbols = []
+        self.ids = {}
+        for symbol in self.specials:
+            self.add(symbol)
+        if symbols is not None:
+            for symbol in symbols:
+                self.add(symbol)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.ids
+
+    def __getitem__(self, symbol) -> int:
+        return self.ids[symbol]
+
+    def __eq__(self, other):
+        return isinstance(other, Vocabulary) and self.symbols == other.symbols \
+            and self.specials == other.specials
+
+    @property
+    def unk_id(self):
+        return self.ids.get(UNK)
+
+    def add(self, symbol: str) -> int:
+        symbol_id = self.ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.ids[symbol] = symbol_id
+            self.symbols.append(symbol)
+        return symbol_id
+
+    def index(self, symbol: str, add=False) -> int:
+        """
+        The ID of `symbol`; if it is unknown, it is added if `add` is
+        set, otherwise the ID of `<unk>` is returned (KeyError if there
+        is no `<unk>`)
+        """
+        symbol_id = self.ids.get(symbol)
+        if symbol_id is not None:
+            return symbol_id
+        if add:
+            return self.add(symbol)
+        if self.unk_id is None:
+            raise KeyError(symbol)
+        return self.unk_id
+
+    def encode(self, symbols: List[str], add=False) -> np.ndarray:
+        return np.fromiter((self.index(symbol, add) for symbol in symbols),
+                           dtype=np.int32, count=len(symbols))
+
+    def decode(self, ids) -> List[str]:
+        return [self.symbols[symbol_id] for symbol_id in ids]
+
+    def to_dict(self):
+        return {
+            "version": VOCAB_VERSION,
+            "specials": self.specials,
+            "symbols": self.symbols[len(self.specials):]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != VOCAB_VERSION:
+            raise ValueError(f"Unsupported vocabulary version: {data.get('version')}")
+        return cls(data["symbols"], specials=data["specials"])
+
+    def save(self, filename):
+        tmp_path = f"{filename}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as outf:
+            json.dump(self.to_dict(), outf, ensure_ascii=False)
+        os.replace(tmp_path, filename)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, encoding="utf-8") as inpf:
+            return cls.from_dict(json.load(inpf))
+
+
+def encode_labels(labels, vocab: Vocabulary, add=False, as_frames=False):
+    """
+    Split (start, end, label) tuples into an array of (start, end)
+    times, of shape (n, 2), and an array of label IDs
+    """
+    dtype = np.int32 if as_frames else np.float64
+    times = np.array([(label[0], label[1]) for label in labels], dtype=dtype).reshape(-1, 2)
+    ids = vocab.encode([label[2] for label in labels], add=add)
+    return times, ids